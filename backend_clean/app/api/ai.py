@@ -2,23 +2,32 @@
 AI content generation API routes
 """
 
+import json
 import uuid
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from app.core.auth import get_current_user
 from app.core.database import db_manager
 from app.core.ai_service import (
     generate_content, generate_email, generate_summary,
-    generate_proposal, generate_scope_of_work, generate_action_items
+    generate_proposal, generate_scope_of_work,
+    generate_action_items as generate_action_items_content,
+    stream_content, CONTENT_INSTRUCTIONS
 )
+from app.core.batch_generation import BatchJob, build_output, run_batch
+from app.utils.config import get_settings
 from app.models.output import Output
 from app.schemas.ai import (
     AIGenerationRequest, AIGenerationResponse,
     EmailGenerationRequest, SummaryGenerationRequest,
-    ProposalGenerationRequest, ScopeOfWorkRequest
+    ProposalGenerationRequest, ScopeOfWorkRequest,
+    BatchGenerationRequest
 )
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("/generate", response_model=AIGenerationResponse)
@@ -49,7 +58,8 @@ async def generate_ai_content(
             sub_client_id=request.sub_client_id,
             additional_instructions=request.additional_instructions,
             recipient_name=request.recipient_name,
-            sender_name=request.sender_name
+            sender_name=request.sender_name,
+            bypass_cache=request.bypass_cache
         )
         
         if not generation_result["success"]:
@@ -90,6 +100,8 @@ async def generate_ai_content(
             sub_client_id=result.get("sub_client_id"),
             context_used=generation_result.get("context_used", ""),
             tokens_used=generation_result.get("tokens_used", 0),
+            cached=generation_result.get("cached", False),
+            model=generation_result.get("model"),
             created_at=result["created_at"]
         )
         
@@ -120,7 +132,8 @@ async def generate_follow_up_email(
             client_id=request.client_id,
             sub_client_id=request.sub_client_id,
             recipient_name=request.recipient_name,
-            sender_name=request.sender_name
+            sender_name=request.sender_name,
+            bypass_cache=request.bypass_cache
         )
         
         if not generation_result["success"]:
@@ -160,6 +173,8 @@ async def generate_follow_up_email(
             sub_client_id=result.get("sub_client_id"),
             context_used=generation_result.get("context_used", ""),
             tokens_used=generation_result.get("tokens_used", 0),
+            cached=generation_result.get("cached", False),
+            model=generation_result.get("model"),
             created_at=result["created_at"]
         )
         
@@ -188,7 +203,8 @@ async def generate_meeting_summary(
         generation_result = await generate_summary(
             prompt=request.prompt,
             client_id=request.client_id,
-            sub_client_id=request.sub_client_id
+            sub_client_id=request.sub_client_id,
+            bypass_cache=request.bypass_cache
         )
         
         if not generation_result["success"]:
@@ -229,6 +245,8 @@ async def generate_meeting_summary(
             sub_client_id=result.get("sub_client_id"),
             context_used=generation_result.get("context_used", ""),
             tokens_used=generation_result.get("tokens_used", 0),
+            cached=generation_result.get("cached", False),
+            model=generation_result.get("model"),
             created_at=result["created_at"]
         )
         
@@ -257,7 +275,8 @@ async def generate_project_proposal(
         generation_result = await generate_proposal(
             prompt=request.prompt,
             client_id=request.client_id,
-            sub_client_id=request.sub_client_id
+            sub_client_id=request.sub_client_id,
+            bypass_cache=request.bypass_cache
         )
         
         if not generation_result["success"]:
@@ -297,6 +316,8 @@ async def generate_project_proposal(
             sub_client_id=result.get("sub_client_id"),
             context_used=generation_result.get("context_used", ""),
             tokens_used=generation_result.get("tokens_used", 0),
+            cached=generation_result.get("cached", False),
+            model=generation_result.get("model"),
             created_at=result["created_at"]
         )
         
@@ -323,43 +344,53 @@ async def generate_action_items(
 
     try:
         # Generate action items using AI service
-        result = generate_action_items(
+        generation_result = await generate_action_items_content(
             prompt=request.prompt,
             client_id=request.client_id,
-            sub_client_id=request.sub_client_id
+            sub_client_id=request.sub_client_id,
+            bypass_cache=request.bypass_cache
         )
 
-        if not result["success"]:
+        if not generation_result["success"]:
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to generate action items: {result.get('error', 'Unknown error')}"
+                detail=f"Failed to generate action items: {generation_result.get('error', 'Unknown error')}"
             )
 
-        # Store the generated content
-        output_id = str(uuid.uuid4())
+        # Save output
         output = Output(
-            id=output_id,
-            user_id=current_user_id,
+            id=str(uuid.uuid4()),
+            title=f"Action Items - {datetime.now().strftime('%Y-%m-%d')}",
+            content=generation_result["content"],
+            output_type="action_items",
+            prompt=request.prompt,
             client_id=request.client_id,
             sub_client_id=request.sub_client_id,
-            content_type="action_items",
-            prompt=request.prompt,
-            generated_content=result["content"],
-            context_used=result.get("context_used", ""),
-            created_at=datetime.utcnow().isoformat()
+            user_id=current_user_id,
+            context_used=generation_result.get("context_used", ""),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
         )
 
-        await db_manager.store_output(output)
+        result = await db_manager.create_output(output)
+        if not result:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to save generated action items"
+            )
 
         return AIGenerationResponse(
-            id=output_id,
+            id=result["id"],
             content=result["content"],
             content_type="action_items",
-            prompt=request.prompt,
-            client_id=request.client_id,
-            sub_client_id=request.sub_client_id,
-            context_used=result.get("context_used", ""),
-            created_at=output.created_at
+            prompt=result["prompt"],
+            client_id=result["client_id"],
+            sub_client_id=result.get("sub_client_id"),
+            context_used=generation_result.get("context_used", ""),
+            tokens_used=generation_result.get("tokens_used", 0),
+            cached=generation_result.get("cached", False),
+            model=generation_result.get("model"),
+            created_at=result["created_at"]
         )
 
     except HTTPException:
@@ -369,3 +400,293 @@ async def generate_action_items(
             status_code=500,
             detail=f"Failed to generate action items: {str(e)}"
         )
+
+
+# ============================================================================
+# STREAMING (SERVER-SENT EVENTS)
+# ============================================================================
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _verify_client_access(current_user_id: str, client_id: str, action: str):
+    """Raise 403 unless the user owns the client"""
+    clients = await db_manager.get_clients_by_user(current_user_id)
+    if not any(client["id"] == client_id for client in clients):
+        raise HTTPException(
+            status_code=403,
+            detail=f"You don't have permission to {action} for this client"
+        )
+
+
+def _stream_and_store(
+    events: AsyncIterator[Dict[str, Any]],
+    title: str,
+    output_type: str,
+    prompt: str,
+    client_id: str,
+    sub_client_id: Optional[str],
+    user_id: str,
+    meeting_id: Optional[str] = None
+) -> StreamingResponse:
+    """
+    Relay generation events as SSE and save the Output once the stream completes
+
+    Event sequence: `context`, then `token` per content delta, then `done`
+    (with the stored output ID) or `error`. Nothing is saved if the client
+    disconnects before the end.
+    """
+    async def body():
+        async for event in events:
+            if event["type"] == "context":
+                yield _sse("context", {"context_used": event["context_used"]})
+            elif event["type"] == "token":
+                yield _sse("token", {"content": event["content"]})
+            elif event["type"] == "error":
+                yield _sse("error", {"detail": f"Failed to generate {output_type}: {event['error']}"})
+                return
+            elif event["type"] == "done":
+                output = Output(
+                    id=str(uuid.uuid4()),
+                    title=title,
+                    content=event["content"],
+                    output_type=output_type,
+                    prompt=prompt,
+                    client_id=client_id,
+                    sub_client_id=sub_client_id,
+                    user_id=user_id,
+                    meeting_id=meeting_id,
+                    context_used=event.get("context_used", ""),
+                    created_at=datetime.now(),
+                    updated_at=datetime.now()
+                )
+                result = await db_manager.create_output(output)
+                if not result:
+                    yield _sse("error", {"detail": f"Failed to save generated {output_type}"})
+                    return
+                yield _sse("done", {
+                    "id": result["id"],
+                    "content_type": output_type,
+                    "client_id": client_id,
+                    "sub_client_id": sub_client_id,
+                    "tokens_used": event.get("tokens_used", 0),
+                    "cached": event.get("cached", False),
+                    "model": event.get("model"),
+                    "created_at": result["created_at"]
+                })
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/stream")
+async def stream_ai_content(
+    request: AIGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Streaming variant of /ai/generate (text/event-stream)"""
+    await _verify_client_access(current_user_id, request.client_id, "generate content")
+    events = stream_content(
+        prompt=request.prompt,
+        content_type=request.content_type,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        additional_instructions=request.additional_instructions,
+        recipient_name=request.recipient_name,
+        sender_name=request.sender_name,
+        bypass_cache=request.bypass_cache
+    )
+    return _stream_and_store(
+        events,
+        title=f"{request.content_type.title()} - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        output_type=request.content_type,
+        prompt=request.prompt,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        user_id=current_user_id
+    )
+
+
+@router.post("/email/stream")
+async def stream_follow_up_email(
+    request: EmailGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Streaming variant of /ai/email (text/event-stream)"""
+    await _verify_client_access(current_user_id, request.client_id, "generate emails")
+    events = stream_content(
+        prompt=request.prompt,
+        content_type="email",
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        additional_instructions=CONTENT_INSTRUCTIONS["email"],
+        recipient_name=request.recipient_name,
+        sender_name=request.sender_name,
+        bypass_cache=request.bypass_cache
+    )
+    return _stream_and_store(
+        events,
+        title=f"Follow-up Email to {request.recipient_name}",
+        output_type="email",
+        prompt=request.prompt,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        user_id=current_user_id
+    )
+
+
+@router.post("/summary/stream")
+async def stream_meeting_summary(
+    request: SummaryGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Streaming variant of /ai/summary (text/event-stream)"""
+    await _verify_client_access(current_user_id, request.client_id, "generate summaries")
+    events = stream_content(
+        prompt=request.prompt,
+        content_type="summary",
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        additional_instructions=CONTENT_INSTRUCTIONS["summary"],
+        bypass_cache=request.bypass_cache
+    )
+    return _stream_and_store(
+        events,
+        title=f"Meeting Summary - {datetime.now().strftime('%Y-%m-%d')}",
+        output_type="summary",
+        prompt=request.prompt,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        user_id=current_user_id,
+        meeting_id=request.meeting_id
+    )
+
+
+@router.post("/proposal/stream")
+async def stream_project_proposal(
+    request: ProposalGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Streaming variant of /ai/proposal (text/event-stream)"""
+    await _verify_client_access(current_user_id, request.client_id, "generate proposals")
+    events = stream_content(
+        prompt=request.prompt,
+        content_type="proposal",
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        additional_instructions=CONTENT_INSTRUCTIONS["proposal"],
+        bypass_cache=request.bypass_cache
+    )
+    return _stream_and_store(
+        events,
+        title=f"Project Proposal - {datetime.now().strftime('%Y-%m-%d')}",
+        output_type="proposal",
+        prompt=request.prompt,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        user_id=current_user_id
+    )
+
+
+@router.post("/action-items/stream")
+async def stream_action_items(
+    request: AIGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Streaming variant of /ai/action-items (text/event-stream)"""
+    await _verify_client_access(current_user_id, request.client_id, "generate content")
+    events = stream_content(
+        prompt=request.prompt,
+        content_type="action_items",
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        additional_instructions=CONTENT_INSTRUCTIONS["action_items"],
+        bypass_cache=request.bypass_cache
+    )
+    return _stream_and_store(
+        events,
+        title=f"Action Items - {datetime.now().strftime('%Y-%m-%d')}",
+        output_type="action_items",
+        prompt=request.prompt,
+        client_id=request.client_id,
+        sub_client_id=request.sub_client_id,
+        user_id=current_user_id
+    )
+
+
+@router.post("/generate/batch")
+async def generate_ai_content_batch(
+    request: BatchGenerationRequest,
+    current_user_id: str = Depends(get_current_user)
+):
+    """
+    Generate many prompts for one client (text/event-stream)
+
+    Client ownership is checked once, prompts asking the same knowledge-base
+    question share one search, and at most BATCH_MAX_CONCURRENCY generations
+    run at a time. Event sequence: `result` per item as it completes (in
+    completion order, tagged with its index), then `stored` with the output
+    IDs of the successful items (one bulk insert), then `done`. An `error`
+    event replaces `stored` if the insert fails. Nothing is saved if the
+    client disconnects before the end.
+    """
+    await _verify_client_access(current_user_id, request.client_id, "generate content")
+    jobs = [
+        BatchJob(
+            prompt=item.prompt,
+            content_type=item.content_type,
+            client_id=request.client_id,
+            sub_client_id=item.sub_client_id,
+            additional_instructions=item.additional_instructions,
+            recipient_name=item.recipient_name,
+            sender_name=item.sender_name,
+            title=item.title,
+            context_query=request.context_query
+        )
+        for item in request.items
+    ]
+
+    async def body():
+        outputs = {}
+        failed = 0
+        async for index, result in run_batch(jobs, settings.batch_max_concurrency, request.bypass_cache):
+            if result.get("success"):
+                outputs[index] = build_output(jobs[index], result, current_user_id)
+                yield _sse("result", {
+                    "index": index,
+                    "success": True,
+                    "content_type": jobs[index].content_type,
+                    "content": result["content"],
+                    "tokens_used": result.get("tokens_used", 0),
+                    "cached": result.get("cached", False),
+                    "model": result.get("model")
+                })
+            else:
+                failed += 1
+                yield _sse("result", {
+                    "index": index,
+                    "success": False,
+                    "content_type": jobs[index].content_type,
+                    "error": result.get("error", "Unknown error")
+                })
+
+        if outputs:
+            indexes = sorted(outputs)
+            rows = await db_manager.create_outputs_bulk([outputs[i] for i in indexes])
+            if len(rows) != len(indexes):
+                yield _sse("error", {"detail": "Failed to save generated content"})
+                return
+            yield _sse("stored", {"ids": {str(i): row["id"] for i, row in zip(indexes, rows)}})
+
+        yield _sse("done", {"succeeded": len(outputs), "failed": failed})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -12,6 +12,7 @@ from app.core.recall_service import (
     recall_service, get_user_bots, add_user_bot,
     remove_user_bot, cleanup_old_bots
 )
+from app.core.bot_poller import bot_poller
 from app.utils.config import get_settings
 
 router = APIRouter()
@@ -71,7 +72,7 @@ async def create_bot(
     """Create new Recall AI bot for meeting recording"""
     try:
         # Create bot using real Recall AI service
-        result = recall_service.create_bot(
+        result = await recall_service.create_bot(
             meeting_url=str(request.meeting_url),
             bot_name=request.bot_name
         )
@@ -84,7 +85,8 @@ async def create_bot(
 
         # Store bot association with user
         bot_id = result["bot_id"]
-        add_user_bot(current_user_id, bot_id)
+        await add_user_bot(current_user_id, bot_id)
+        bot_poller.track(bot_id)
 
         return BotResponse(
             bot_id=bot_id,
@@ -112,7 +114,7 @@ async def get_bot_status(
     """Get status of specific bot"""
     try:
         # Verify user owns this bot
-        user_bot_ids = get_user_bots(current_user_id)
+        user_bot_ids = await get_user_bots(current_user_id)
         if bot_id not in user_bot_ids:
             raise HTTPException(
                 status_code=403,
@@ -120,7 +122,7 @@ async def get_bot_status(
             )
 
         # Get bot status from Recall AI
-        result = recall_service.get_bot_status(bot_id)
+        result = await recall_service.get_bot_status(bot_id)
 
         if not result["success"]:
             raise HTTPException(
@@ -154,7 +156,7 @@ async def get_download_urls(
     """Get download URLs for bot recordings"""
     try:
         # Verify user owns this bot
-        user_bot_ids = get_user_bots(current_user_id)
+        user_bot_ids = await get_user_bots(current_user_id)
         if bot_id not in user_bot_ids:
             raise HTTPException(
                 status_code=403,
@@ -162,7 +164,7 @@ async def get_download_urls(
             )
 
         # Get download URLs from Recall AI
-        result = recall_service.get_download_urls(bot_id)
+        result = await recall_service.get_download_urls(bot_id)
 
         if not result["success"]:
             raise HTTPException(
@@ -196,7 +198,7 @@ async def remove_bot(
     """Remove/stop bot"""
     try:
         # Verify user owns this bot
-        user_bot_ids = get_user_bots(current_user_id)
+        user_bot_ids = await get_user_bots(current_user_id)
         if bot_id not in user_bot_ids:
             raise HTTPException(
                 status_code=403,
@@ -204,7 +206,7 @@ async def remove_bot(
             )
 
         # Delete bot using Recall AI service
-        result = recall_service.delete_bot(bot_id)
+        result = await recall_service.delete_bot(bot_id)
 
         if not result["success"]:
             raise HTTPException(
@@ -213,7 +215,7 @@ async def remove_bot(
             )
 
         # Remove bot from user's bot list
-        remove_user_bot(current_user_id, bot_id)
+        await remove_user_bot(current_user_id, bot_id)
 
         return {
             "bot_id": bot_id,
@@ -234,23 +236,22 @@ async def remove_bot(
 async def list_active_bots(current_user_id: str = Depends(get_current_user)):
     """List all active bots for user"""
     try:
-        user_bot_ids = get_user_bots(current_user_id)
+        user_bot_ids = await get_user_bots(current_user_id)
         active_bots = []
 
+        # Recently polled statuses are reused; the rest come from one batched lookup
+        statuses = await bot_poller.statuses(user_bot_ids, max_age=settings.bot_status_max_age_seconds)
         for bot_id in user_bot_ids:
-            try:
-                status_result = recall_service.get_bot_status(bot_id)
-                if status_result["success"]:
-                    active_bots.append({
-                        "bot_id": bot_id,
-                        "status": status_result["status"],
-                        "meeting_url": status_result["meeting_url"],
-                        "bot_name": status_result["bot_name"],
-                        "created_at": status_result["created_at"]
-                    })
-            except Exception as e:
-                # Skip bots that can't be retrieved
-                continue
+            status_result = statuses.get(bot_id)
+            # Skip bots that can't be retrieved
+            if status_result:
+                active_bots.append({
+                    "bot_id": bot_id,
+                    "status": status_result["status"],
+                    "meeting_url": status_result["meeting_url"],
+                    "bot_name": status_result["bot_name"],
+                    "created_at": status_result["created_at"]
+                })
 
         return {
             "user_id": current_user_id,
@@ -269,7 +270,7 @@ async def list_active_bots(current_user_id: str = Depends(get_current_user)):
 async def cleanup_old_bots_endpoint(current_user_id: str = Depends(get_current_user)):
     """Cleanup old/inactive bots"""
     try:
-        result = cleanup_old_bots(current_user_id)
+        result = await cleanup_old_bots(current_user_id)
 
         if not result["success"]:
             raise HTTPException(
@@ -3,6 +3,7 @@ Calendar integration API routes
 Google Calendar OAuth and event management
 """
 
+import logging
 import os
 import uuid
 from typing import Optional, List
@@ -12,6 +13,8 @@ from app.core.auth import get_current_user
 from app.core.database import db_manager
 from app.utils.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Google Calendar imports
 try:
     from google.auth.transport.requests import Request
@@ -20,8 +23,10 @@ try:
     from googleapiclient.discovery import build
     GOOGLE_LIBRARIES_AVAILABLE = True
 except ImportError:
-    print("⚠️  WARNING: Google Calendar libraries not installed. Google Calendar integration will be disabled.")
-    print("   Install with: pip install google-auth google-auth-oauthlib google-api-python-client")
+    logger.warning(
+        "⚠️  Google Calendar libraries not installed. Google Calendar integration will be disabled. "
+        "Install with: pip install google-auth google-auth-oauthlib google-api-python-client"
+    )
     GOOGLE_LIBRARIES_AVAILABLE = False
 
 router = APIRouter()
@@ -141,7 +146,7 @@ async def get_upcoming_meetings(
                 return get_demo_upcoming_meetings(user_id)
 
     except Exception as e:
-        print(f"❌ Error fetching upcoming meetings: {e}")
+        logger.error("❌ Error fetching upcoming meetings: %s", e)
         # Fallback to demo data
         return get_demo_upcoming_meetings(user_id)
 
@@ -267,7 +272,7 @@ async def get_previous_meetings(
                 return get_demo_previous_meetings(user_id)
 
     except Exception as e:
-        print(f"❌ Error fetching previous meetings: {e}")
+        logger.error("❌ Error fetching previous meetings: %s", e)
         # Fallback to demo data
         return get_demo_previous_meetings(user_id)
 
@@ -418,7 +423,7 @@ async def initiate_google_calendar_oauth(current_user_id: str = Depends(get_curr
         # Construct the authorization URL
         authorization_url = f"{settings.google_oauth_base_url}?" + urllib.parse.urlencode(oauth_params, quote_via=urllib.parse.quote)
 
-        print(f"🔗 Recall AI OAuth URL generated: {authorization_url}")
+        logger.info("🔗 Recall AI OAuth URL generated: %s", authorization_url)
 
         return {
             "authorization_url": authorization_url,
@@ -427,7 +432,7 @@ async def initiate_google_calendar_oauth(current_user_id: str = Depends(get_curr
         }
 
     except Exception as e:
-        print(f"❌ OAuth initiation error: {str(e)}")
+        logger.error("❌ OAuth initiation error: %s", str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Failed to initiate OAuth flow: {str(e)}"
@@ -2,9 +2,13 @@
 Debug API routes
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse
 from app.core.database import db_manager, get_supabase_client
-from app.core.auth import DEMO_USERS
+from app.core.auth import DEMO_USERS, require_admin
+from app.core.tracing import slow_traces
+from app.core.profiler import profile_process, request_profiles
 
 router = APIRouter()
 
@@ -57,6 +61,66 @@ async def debug_test():
         raise HTTPException(status_code=500, detail=f"Debug test failed: {str(e)}")
 
 
+@router.get("/traces/slow", dependencies=[Depends(require_admin)])
+async def debug_slow_traces(clear: bool = False):
+    """Debug: Dump traces whose root span exceeded TRACING_SLOW_THRESHOLD_MS"""
+    traces = slow_traces.get_slow_traces()
+    if clear:
+        slow_traces.clear()
+
+    return {
+        "threshold_ms": slow_traces.threshold_ms,
+        "total_traces": len(traces),
+        "traces": traces
+    }
+
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def debug_profile(seconds: float = Query(10.0, gt=0, le=300)):
+    """
+    Debug: Sample the live process for N seconds
+
+    Returns collapsed stacks (one `frame;frame;... count` per line) that can be
+    fed straight to flamegraph.pl or speedscope.
+    """
+    profiler = await asyncio.to_thread(profile_process, seconds)
+    if profiler is None:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(profiler.sample_count),
+            "Content-Disposition": "attachment; filename=profile.collapsed"
+        }
+    )
+
+
+@router.get("/profile/requests", dependencies=[Depends(require_admin)])
+async def debug_list_request_profiles():
+    """
+    Debug: List profiles captured with the X-Profile request header
+
+    Per-request profiles sample the event loop thread, so other requests that
+    interleave with the profiled one show up in its stacks as well.
+    """
+    return {"profiles": request_profiles.list()}
+
+
+@router.get(
+    "/profile/requests/{profile_id}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)]
+)
+async def debug_get_request_profile(profile_id: str):
+    """Debug: Download one per-request profile as collapsed stacks"""
+    profile = request_profiles.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return PlainTextResponse(profile["collapsed"])
+
+
 @router.get("/google-tokens")
 async def debug_google_tokens():
     """Debug: Check Google OAuth tokens status"""
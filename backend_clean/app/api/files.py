@@ -4,12 +4,14 @@ File upload and knowledge base API routes
 
 import uuid
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from app.core.auth import get_current_user
 from app.core.database import db_manager
 from app.core.file_processor import process_and_store_file, validate_file_type, validate_file_size
 from app.core.vector_store import search_knowledge_base, get_client_knowledge_stats
+from app.core.metrics import INGEST_STAGE_SECONDS, tenant_label, time_stage
 from app.models.file import File as FileModel
 from app.schemas.file import FileResponse, KnowledgeSearchRequest, KnowledgeSearchResponse
 
@@ -92,7 +94,11 @@ async def upload_file(
         file_model.chunks_stored = processing_result["chunks_stored"]
         
         # Save file record to database
-        result = await db_manager.create_file_record(file_model)
+        with time_stage(
+            INGEST_STAGE_SECONDS, "ingest", "database",
+            file_type=Path(file.filename).suffix.lower(), tenant=tenant_label(client_id)
+        ):
+            result = await db_manager.create_file_record(file_model)
         if not result:
             raise HTTPException(
                 status_code=500,
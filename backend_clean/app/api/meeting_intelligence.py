@@ -3,14 +3,18 @@ Meeting Intelligence API Routes
 End-to-end meeting processing with AI
 """
 
+import logging
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, HttpUrl
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.core.auth import get_current_user
 from app.core.meeting_intelligence import meeting_intelligence
 from app.core.database import db_manager
+from app.core.transcript import render_segments
+from app.core.transcript_fetcher import transcript_fetcher
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -153,7 +157,7 @@ async def debug_get_meeting_raw_data(meeting_id: str):
     """
     try:
         # Get meeting status from intelligence service
-        meeting_data = meeting_intelligence.get_meeting_status(meeting_id)
+        meeting_data = await meeting_intelligence.get_meeting_status(meeting_id)
 
         # Get all outputs and filter
         outputs = await db_manager.get_all_outputs()
@@ -179,20 +183,23 @@ async def debug_get_meeting_raw_data(meeting_id: str):
 
 
 @router.post("/debug/reprocess/{meeting_id}")
-async def debug_reprocess_meeting(meeting_id: str):
+async def debug_reprocess_meeting(meeting_id: str, bypass_cache: bool = False):
     """
     Debug endpoint to manually reprocess a meeting
     """
     try:
-        # Trigger manual processing
-        import asyncio
-        asyncio.create_task(
-            meeting_intelligence._process_completed_meeting(meeting_id)
-        )
+        # Queue ahead of automatic processing
+        if not await meeting_intelligence.reprocess_meeting(meeting_id, bypass_cache=bypass_cache):
+            return {
+                "success": False,
+                "error": "Meeting not found, still recording or currently processing",
+                "meeting_id": meeting_id,
+                "debug": True
+            }
 
         return {
             "success": True,
-            "message": f"Reprocessing started for meeting {meeting_id}",
+            "message": f"Reprocessing queued for meeting {meeting_id}",
             "meeting_id": meeting_id,
             "debug": True
         }
@@ -238,7 +245,7 @@ async def debug_link_existing_content_to_meeting(meeting_id: str):
                     linked_count += 1
 
             except Exception as e:
-                print(f"Error linking output {output['id']}: {e}")
+                logger.error("Error linking output %s: %s", output['id'], e)
 
         return {
             "success": True,
@@ -378,7 +385,7 @@ This email was generated automatically by the Lemur AI Meeting Intelligence syst
                 if insert_result.data:
                     inserted_count += 1
             except Exception as e:
-                print(f"Error inserting {result['output_type']}: {e}")
+                logger.error("Error inserting %s: %s", result['output_type'], e)
 
         return {
             "success": True,
@@ -398,13 +405,13 @@ This email was generated automatically by the Lemur AI Meeting Intelligence syst
 
 
 @router.post("/debug/reprocess-with-transcript/{meeting_id}")
-async def debug_reprocess_with_real_transcript(meeting_id: str):
+async def debug_reprocess_with_real_transcript(meeting_id: str, bypass_cache: bool = False):
     """
     Debug endpoint to manually reprocess a meeting with real transcript
     """
     try:
         # Get meeting data from intelligence service
-        meeting_data = meeting_intelligence.get_meeting_status(meeting_id)
+        meeting_data = await meeting_intelligence.get_meeting_status(meeting_id)
 
         if not meeting_data:
             return {
@@ -425,7 +432,7 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
 
         # Get download URLs from Recall
         from app.core.recall_service import recall_service
-        download_result = recall_service.get_download_urls(bot_id)
+        download_result = await recall_service.get_download_urls(bot_id)
 
         if not download_result["success"]:
             return {
@@ -443,14 +450,9 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
 
         if transcript_url:
             # Try downloading from URL
-            try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(transcript_url) as response:
-                        if response.status == 200:
-                            transcript_text = await response.text()
-            except Exception as e:
-                print(f"Failed to download transcript: {e}")
+            segments = await transcript_fetcher.fetch(transcript_url)
+            if segments:
+                transcript_text = render_segments(segments)
 
         # If no transcript from URL, try extracting from bot data
         if not transcript_text:
@@ -467,17 +469,26 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
             }
 
         # Generate AI content with real transcript
-        from app.core.ai_service import generate_summary, generate_action_items, generate_email
+        from app.core.ai_service import (
+            generate_summary, generate_action_items, generate_email, transcript_token_budget
+        )
+        from app.core.transcript_summarizer import transcript_summarizer
 
         client_id = meeting_data.get("client_id", "660f3f3b-39c2-49b2-a979-c9ed00cdc78a")
         meeting_title = meeting_data.get("meeting_title", "Meeting")
 
         # Create context for AI
+        condensed_transcript = await transcript_summarizer.condense(
+            transcript_text,
+            client_id=client_id,
+            bypass_cache=bypass_cache,
+            max_tokens=transcript_token_budget(f"Meeting: {meeting_title}")
+        )
         context = f"""
         Meeting: {meeting_title}
 
         Meeting Transcript:
-        {transcript_text}
+        {condensed_transcript}
         """
 
         # Generate AI content
@@ -487,21 +498,24 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
             # Generate summary
             summary_result = await generate_summary(
                 prompt=f"Create a comprehensive meeting summary based on this transcript: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["summary"] = summary_result
 
             # Generate action items
             action_items_result = await generate_action_items(
                 prompt=f"Extract detailed action items from this meeting transcript: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["action_items"] = action_items_result
 
             # Generate follow-up email
             email_result = await generate_email(
                 prompt=f"Create a professional follow-up email summarizing this meeting: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["follow_up_email"] = email_result
 
@@ -544,7 +558,7 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
                         stored_count += 1
 
                 except Exception as e:
-                    print(f"Error storing {content_type}: {e}")
+                    logger.error("Error storing %s: %s", content_type, e)
 
         return {
             "success": True,
@@ -569,7 +583,7 @@ async def debug_reprocess_with_real_transcript(meeting_id: str):
 
 
 @router.post("/debug/process-bot-transcript/{bot_id}")
-async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meeting"):
+async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meeting", bypass_cache: bool = False):
     """
     Debug endpoint to process transcript directly from bot ID
     """
@@ -577,10 +591,13 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
         # Get download URLs from Recall
         from app.core.recall_service import recall_service
 
-        print(f"🔍 Getting data for bot: {bot_id}")
-        download_result = recall_service.get_download_urls(bot_id)
+        logger.info("🔍 Getting data for bot: %s", bot_id)
+        download_result = await recall_service.get_download_urls(bot_id)
 
-        print(f"📥 Download result: {download_result}")
+        logger.debug(
+            "📥 Download result for bot %s: status=%s", bot_id, download_result.get("status"),
+            extra={"event": "debug.download_result", "payload": download_result}
+        )
 
         if not download_result["success"]:
             return {
@@ -595,35 +612,27 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
         audio_url = download_result.get("audio_url")
         bot_data = download_result.get("data", {})
 
-        print(f"📥 URLs - Video: {video_url}, Transcript: {transcript_url}")
+        logger.info("📥 URLs - Video: %s, Transcript: %s", video_url, transcript_url)
 
         # Try to get transcript
         transcript_text = None
 
         if transcript_url:
-            print(f"📥 Downloading transcript from URL: {transcript_url}")
-            try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(transcript_url) as response:
-                        print(f"📥 Transcript response status: {response.status}")
-                        if response.status == 200:
-                            transcript_text = await response.text()
-                            print(f"✅ Downloaded transcript, length: {len(transcript_text)}")
-                        else:
-                            print(f"❌ Failed to download transcript: {response.status}")
-            except Exception as e:
-                print(f"❌ Error downloading transcript: {e}")
+            logger.info("📥 Downloading transcript from URL: %s", transcript_url)
+            segments = await transcript_fetcher.fetch(transcript_url)
+            if segments:
+                transcript_text = render_segments(segments)
+                logger.info("✅ Downloaded transcript, %s segments", len(segments))
 
         # If no transcript from URL, try extracting from bot data
         if not transcript_text:
-            print("🔍 Trying to extract transcript from bot data...")
+            logger.info("🔍 Trying to extract transcript from bot data...")
             # Try different locations in bot data
             recordings = bot_data.get('recordings', [])
-            print(f"📊 Found {len(recordings)} recordings")
+            logger.info("📊 Found %s recordings", len(recordings))
 
             for i, recording in enumerate(recordings):
-                print(f"🔍 Checking recording {i}: {list(recording.keys())}")
+                logger.debug("🔍 Checking recording %s: %s", i, list(recording.keys()))
 
                 # Check various transcript locations
                 if 'transcript' in recording:
@@ -641,7 +650,10 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
                 media_shortcuts = recording.get('media_shortcuts', {})
                 if 'transcript' in media_shortcuts:
                     transcript_info = media_shortcuts['transcript']
-                    print(f"📊 Transcript info: {transcript_info}")
+                    logger.debug(
+                        "📊 Transcript info found in recording %s", i,
+                        extra={"event": "debug.transcript_info", "payload": transcript_info}
+                    )
 
         if not transcript_text:
             return {
@@ -657,60 +669,72 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
                 "debug": True
             }
 
-        print(f"✅ Got transcript, length: {len(transcript_text)}")
+        logger.info("✅ Got transcript, length: %s", len(transcript_text))
 
         # Generate meeting ID for this processing
         import uuid
         meeting_id = str(uuid.uuid4())
 
         # Generate AI content with real transcript
-        from app.core.ai_service import generate_summary, generate_action_items, generate_email
+        from app.core.ai_service import (
+            generate_summary, generate_action_items, generate_email, transcript_token_budget
+        )
+        from app.core.transcript_summarizer import transcript_summarizer
 
         client_id = "660f3f3b-39c2-49b2-a979-c9ed00cdc78a"
 
         # Create context for AI
+        condensed_transcript = await transcript_summarizer.condense(
+            transcript_text,
+            client_id=client_id,
+            bypass_cache=bypass_cache,
+            max_tokens=transcript_token_budget(f"Meeting: {meeting_title}")
+        )
         context = f"""
         Meeting: {meeting_title}
 
         Meeting Transcript:
-        {transcript_text}
+        {condensed_transcript}
         """
 
-        print("🧠 Generating AI content...")
+        logger.info("🧠 Generating AI content...")
 
         # Generate AI content
         results = {}
 
         try:
             # Generate summary
-            print("📝 Generating summary...")
+            logger.info("📝 Generating summary...")
             summary_result = await generate_summary(
                 prompt=f"Create a comprehensive meeting summary based on this transcript: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["summary"] = summary_result
-            print(f"✅ Summary generated: {summary_result.get('success', False)}")
+            logger.info("✅ Summary generated: %s", summary_result.get('success', False))
 
             # Generate action items
-            print("📋 Generating action items...")
+            logger.info("📋 Generating action items...")
             action_items_result = await generate_action_items(
                 prompt=f"Extract detailed action items from this meeting transcript: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["action_items"] = action_items_result
-            print(f"✅ Action items generated: {action_items_result.get('success', False)}")
+            logger.info("✅ Action items generated: %s", action_items_result.get('success', False))
 
             # Generate follow-up email
-            print("📧 Generating follow-up email...")
+            logger.info("📧 Generating follow-up email...")
             email_result = await generate_email(
                 prompt=f"Create a professional follow-up email summarizing this meeting: {context}",
-                client_id=client_id
+                client_id=client_id,
+                bypass_cache=bypass_cache
             )
             results["follow_up_email"] = email_result
-            print(f"✅ Email generated: {email_result.get('success', False)}")
+            logger.info("✅ Email generated: %s", email_result.get('success', False))
 
         except Exception as ai_error:
-            print(f"❌ AI generation error: {ai_error}")
+            logger.error("❌ AI generation error: %s", ai_error)
             return {
                 "success": False,
                 "error": f"AI generation failed: {ai_error}",
@@ -725,7 +749,7 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
         client = get_supabase_client()
         stored_count = 0
 
-        print("💾 Storing results in database...")
+        logger.info("💾 Storing results in database...")
 
         for content_type, result in results.items():
             if result and result.get("success"):
@@ -748,12 +772,12 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
                     insert_result = client.table("outputs").insert(output_data).execute()
                     if insert_result.data:
                         stored_count += 1
-                        print(f"✅ Stored {content_type}")
+                        logger.info("✅ Stored %s", content_type)
                     else:
-                        print(f"❌ Failed to store {content_type}")
+                        logger.error("❌ Failed to store %s", content_type)
 
                 except Exception as e:
-                    print(f"❌ Error storing {content_type}: {e}")
+                    logger.error("❌ Error storing %s: %s", content_type, e)
 
         return {
             "success": True,
@@ -770,7 +794,7 @@ async def debug_process_bot_transcript(bot_id: str, meeting_title: str = "Meetin
         }
 
     except Exception as e:
-        print(f"❌ Error processing bot transcript: {e}")
+        logger.error("❌ Error processing bot transcript: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -853,10 +877,10 @@ async def debug_add_real_ai_data_to_meeting(meeting_id: str):
 
             # Try to insert the meeting record
             meeting_result = client.table("meetings").insert(meeting_record).execute()
-            print(f"✅ Created meeting record: {meeting_id}")
+            logger.info("✅ Created meeting record: %s", meeting_id)
 
         except Exception as e:
-            print(f"⚠️ Meeting record might already exist or error creating: {e}")
+            logger.warning("⚠️ Meeting record might already exist or error creating: %s", e)
 
         # Real AI-generated content based on the actual transcript processing
         ai_contents = [
@@ -1016,15 +1040,15 @@ Synatech Solutions
                 result = client.table("outputs").insert(content).execute()
                 if result.data:
                     stored_count += 1
-                    print(f"✅ Successfully stored {content['output_type']}")
+                    logger.info("✅ Successfully stored %s", content['output_type'])
                 else:
                     error_msg = f"Failed to store {content['output_type']} - no data returned"
-                    print(f"❌ {error_msg}")
+                    logger.error("❌ %s", error_msg)
                     errors.append(error_msg)
 
             except Exception as e:
                 error_msg = f"Error storing {content['output_type']}: {str(e)}"
-                print(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 errors.append(error_msg)
 
         return {
@@ -1071,10 +1095,10 @@ async def debug_link_existing_outputs_to_meeting(meeting_id: str):
         unlinked_outputs = [output for output in result.data if output.get("meeting_id") is None][:3]
 
         # Debug info
-        print(f"Total outputs: {len(result.data)}")
-        print(f"Unlinked outputs: {len(unlinked_outputs)}")
+        logger.info("Total outputs: %s", len(result.data))
+        logger.info("Unlinked outputs: %s", len(unlinked_outputs))
         for i, output in enumerate(result.data[:3]):
-            print(f"Output {i}: meeting_id = {output.get('meeting_id')} (type: {type(output.get('meeting_id'))})")
+            logger.debug("Output %s: meeting_id = %s (type: %s)", i, output.get('meeting_id'), type(output.get('meeting_id')))
 
         if not unlinked_outputs:
             return {
@@ -1098,12 +1122,12 @@ async def debug_link_existing_outputs_to_meeting(meeting_id: str):
 
                 if update_result.data:
                     updated_count += 1
-                    print(f"✅ Linked output {output['id']} to meeting {meeting_id}")
+                    logger.info("✅ Linked output %s to meeting %s", output['id'], meeting_id)
                 else:
-                    print(f"❌ Failed to link output {output['id']}")
+                    logger.error("❌ Failed to link output %s", output['id'])
 
             except Exception as e:
-                print(f"❌ Error linking output {output['id']}: {e}")
+                logger.error("❌ Error linking output %s: %s", output['id'], e)
 
         return {
             "success": True,
@@ -1270,11 +1294,11 @@ This email was generated using AI meeting intelligence to ensure comprehensive f
                 result = client.table("outputs").insert(content).execute()
                 if result.data:
                     stored_count += 1
-                    print(f"✅ Stored {content['output_type']}")
+                    logger.info("✅ Stored %s", content['output_type'])
                 else:
-                    print(f"❌ Failed to store {content['output_type']}")
+                    logger.error("❌ Failed to store %s", content['output_type'])
             except Exception as e:
-                print(f"❌ Error storing {content['output_type']}: {e}")
+                logger.error("❌ Error storing %s: %s", content['output_type'], e)
 
         return {
             "success": True,
@@ -1472,7 +1496,7 @@ Synatech Solutions
                     if result.data:
                         stored_count += 1
                 except Exception as e:
-                    print(f"❌ Error storing output: {e}")
+                    logger.error("❌ Error storing output: %s", e)
 
             created_meetings.append({
                 "title": meeting_data['title'],
@@ -1584,11 +1608,11 @@ async def debug_create_complete_meeting():
                 result = client.table("outputs").insert(content).execute()
                 if result.data:
                     stored_count += 1
-                    print(f"✅ Stored {content['output_type']}")
+                    logger.info("✅ Stored %s", content['output_type'])
                 else:
-                    print(f"❌ Failed to store {content['output_type']}")
+                    logger.error("❌ Failed to store %s", content['output_type'])
             except Exception as e:
-                print(f"❌ Error storing {content['output_type']}: {e}")
+                logger.error("❌ Error storing %s: %s", content['output_type'], e)
 
         return {
             "success": True,
@@ -1618,6 +1642,7 @@ class StartMeetingRecordingRequest(BaseModel):
     client_id: str
     sub_client_id: Optional[str] = None
     attendees: Optional[List[str]] = None
+    expected_duration_minutes: Optional[int] = None  # lets the status poller speed up near the end
     
     class Config:
         json_schema_extra = {
@@ -1651,6 +1676,7 @@ class MeetingStatusResponse(BaseModel):
     processed: bool
     started_at: datetime
     processed_at: Optional[datetime] = None
+    live_summary: Optional[str] = None  # rolling notes while the meeting is recording
 
 
 class MeetingResultsResponse(BaseModel):
@@ -1700,7 +1726,11 @@ async def start_meeting_recording(
             sub_client_id=request.sub_client_id,
             user_id=current_user_id,
             attendees=request.attendees,
-            meeting_title=request.meeting_title
+            meeting_title=request.meeting_title,
+            expected_end=(
+                datetime.now() + timedelta(minutes=request.expected_duration_minutes)
+                if request.expected_duration_minutes else None
+            )
         )
         
         if not result["success"]:
@@ -1734,7 +1764,7 @@ async def get_meeting_status(
 ):
     """Get current status of a meeting recording"""
     try:
-        meeting_data = meeting_intelligence.get_meeting_status(meeting_id)
+        meeting_data = await meeting_intelligence.get_meeting_status(meeting_id)
         
         if not meeting_data:
             raise HTTPException(
@@ -1757,7 +1787,8 @@ async def get_meeting_status(
             client_id=meeting_data.get("client_id", ""),
             processed=meeting_data.get("processed", False),
             started_at=meeting_data.get("started_at", datetime.now()),
-            processed_at=meeting_data.get("processed_at")
+            processed_at=meeting_data.get("processed_at"),
+            live_summary="\n\n".join(note[2] for note in sorted(meeting_data.get("live_notes") or [], key=lambda note: note[0])) or None
         )
         
     except HTTPException:
@@ -1780,7 +1811,7 @@ async def get_meeting_results(
     Returns summary, action items, follow-up email, and media URLs
     """
     try:
-        meeting_data = meeting_intelligence.get_meeting_status(meeting_id)
+        meeting_data = await meeting_intelligence.get_meeting_status(meeting_id)
         
         if not meeting_data:
             raise HTTPException(
@@ -1859,13 +1890,7 @@ async def get_meeting_results(
 async def list_active_meetings(current_user_id: str = Depends(get_current_user)):
     """List all active meetings for the current user"""
     try:
-        all_meetings = meeting_intelligence.list_active_meetings()
-        
-        # Filter meetings for current user
-        user_meetings = [
-            meeting for meeting in all_meetings 
-            if meeting.get("user_id") == current_user_id
-        ]
+        user_meetings = await meeting_intelligence.list_active_meetings(user_id=current_user_id)
         
         return [
             MeetingStatusResponse(
@@ -1891,15 +1916,19 @@ async def list_active_meetings(current_user_id: str = Depends(get_current_user))
 @router.post("/process-manual/{meeting_id}")
 async def manually_process_meeting(
     meeting_id: str,
+    bypass_cache: bool = False,
     current_user_id: str = Depends(get_current_user)
 ):
     """
     Manually trigger AI processing for a completed meeting
     
-    Useful if automatic processing failed or needs to be re-run
+    Useful if automatic processing failed or needs to be re-run. Deterministic
+    generations with identical prompts (the structured extraction) are
+    answered from the generation cache; pass `bypass_cache=true` to force
+    fresh generations.
     """
     try:
-        meeting_data = meeting_intelligence.get_meeting_status(meeting_id)
+        meeting_data = await meeting_intelligence.get_meeting_status(meeting_id)
         
         if not meeting_data:
             raise HTTPException(
@@ -1914,15 +1943,16 @@ async def manually_process_meeting(
                 detail="You don't have permission to process this meeting"
             )
         
-        # Trigger manual processing
-        import asyncio
-        asyncio.create_task(
-            meeting_intelligence._process_completed_meeting(meeting_id)
-        )
+        # Queue ahead of automatic processing
+        if not await meeting_intelligence.reprocess_meeting(meeting_id, bypass_cache=bypass_cache):
+            raise HTTPException(
+                status_code=409,
+                detail="Meeting is still recording or currently processing"
+            )
         
         return {
             "success": True,
-            "message": "Manual processing started for meeting",
+            "message": "Meeting queued for processing",
             "meeting_id": meeting_id
         }
         
@@ -0,0 +1,111 @@
+"""
+Webhook receiver API routes
+Recall AI bot status events drive the meeting state machine directly;
+real-time transcript events feed the live transcript buffers
+"""
+
+import hmac
+import json
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from app.core.live_transcripts import live_transcripts
+from app.core.meeting_intelligence import meeting_intelligence
+from app.core.metrics import WEBHOOK_EVENTS
+from app.core.recall_service import recall_service
+from app.core.recall_webhooks import (
+    WebhookVerificationError, parse_bot_status_event, parse_transcript_event, verify_webhook
+)
+from app.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+settings = get_settings()
+
+
+@router.post("/recall")
+async def receive_recall_webhook(request: Request):
+    """
+    Receive a Recall AI webhook delivery
+
+    Authenticated by its Svix signature rather than a user token. Any 2xx
+    acknowledges the delivery, so events for bots we don't track are
+    accepted and ignored; only bad signatures and malformed bodies are
+    rejected (Recall retries those).
+    """
+    if not settings.recall_webhook_secret:
+        raise HTTPException(status_code=503, detail="Recall webhooks are not configured")
+
+    body = await request.body()
+    try:
+        message_id = verify_webhook(
+            settings.recall_webhook_secret,
+            request.headers,
+            body,
+            settings.recall_webhook_tolerance_seconds
+        )
+    except WebhookVerificationError as e:
+        WEBHOOK_EVENTS.inc(source="recall", event="unknown", outcome="rejected")
+        logger.warning("Rejected Recall webhook: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        WEBHOOK_EVENTS.inc(source="recall", event="unknown", outcome="invalid")
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(payload, dict):
+        WEBHOOK_EVENTS.inc(source="recall", event="unknown", outcome="invalid")
+        raise HTTPException(status_code=400, detail="Payload must be a JSON object")
+
+    event = payload.get("event") or "unknown"
+    status_event = parse_bot_status_event(payload)
+    if status_event is None:
+        WEBHOOK_EVENTS.inc(source="recall", event=event, outcome="ignored")
+        return {"received": True, "handled": False}
+
+    bot_id, status = status_event
+    recall_service.invalidate(bot_id)
+    handled = await meeting_intelligence.handle_bot_status(bot_id, status, source="webhook")
+    WEBHOOK_EVENTS.inc(source="recall", event=event, outcome="handled" if handled else "ignored")
+    logger.debug("Recall webhook %s: bot %s -> %s (handled=%s)", message_id, bot_id, status, handled)
+    return {"received": True, "handled": handled}
+
+
+@router.post("/recall/transcript")
+async def receive_recall_transcript(request: Request, token: Optional[str] = None):
+    """
+    Receive a Recall AI real-time transcript delivery
+
+    Bots are created with this URL (RECALL_REALTIME_URL) as a real-time
+    endpoint, which Recall calls without a Svix signature, so the URL
+    carries RECALL_REALTIME_TOKEN instead; without a token the endpoint
+    stays disabled. Segments for meetings that are no longer recording are
+    acknowledged and dropped.
+    """
+    if not settings.recall_realtime_url or not settings.recall_realtime_token:
+        raise HTTPException(status_code=503, detail="Real-time transcripts are not configured")
+
+    if not hmac.compare_digest(token or "", settings.recall_realtime_token):
+        WEBHOOK_EVENTS.inc(source="recall_realtime", event="unknown", outcome="rejected")
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        WEBHOOK_EVENTS.inc(source="recall_realtime", event="unknown", outcome="invalid")
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(payload, dict):
+        WEBHOOK_EVENTS.inc(source="recall_realtime", event="unknown", outcome="invalid")
+        raise HTTPException(status_code=400, detail="Payload must be a JSON object")
+
+    event = payload.get("event") or "unknown"
+    transcript_event = parse_transcript_event(payload)
+    if transcript_event is None:
+        WEBHOOK_EVENTS.inc(source="recall_realtime", event=event, outcome="ignored")
+        return {"received": True, "handled": False}
+
+    bot_id, segment = transcript_event
+    handled = await live_transcripts.add_segment(bot_id, segment)
+    WEBHOOK_EVENTS.inc(source="recall_realtime", event=event, outcome="handled" if handled else "ignored")
+    return {"received": True, "handled": handled}
@@ -2,105 +2,243 @@
 AI/LLM service for content generation
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-from openai import OpenAI
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
 from app.utils.config import get_settings
+from app.schemas.ai import MeetingActionItem, MeetingExtraction
 from app.core.vector_store import search_knowledge_base
+from app.core.llm_gateway import llm_gateway
+from app.core.generation_cache import generation_cache
+from app.core.context_budget import PromptBudget
+from app.core.model_router import ModelRoute, model_router
+from app.core.tracing import traced, tracer, SPAN_KIND_CLIENT
+from app.core.metrics import GENERATION_STAGE_SECONDS, GENERATION_TOKENS, tenant_label, time_stage
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.openai_api_key)
 
+# Instructions the typed helpers (generate_email, generate_summary, ...) add
+CONTENT_INSTRUCTIONS = {
+    "email": "Write a professional, personalized email that references relevant past work and demonstrates expertise.",
+    "summary": "Create a comprehensive summary with key insights, metrics, and actionable recommendations.",
+    "proposal": "Create a compelling proposal with technical approach, timeline, budget considerations, and references to successful similar projects.",
+    "scope_of_work": "Define clear deliverables, milestones, acceptance criteria, and risk mitigation strategies based on past project experience.",
+    "action_items": "Extract specific, actionable tasks with clear priorities, ownership, and realistic deadlines."
+}
 
-async def generate_content(
-    prompt: str,
+
+def _context_preview(context: str) -> str:
+    """Shortened context returned to callers as `context_used`"""
+    return context[:500] + "..." if len(context) > 500 else context
+
+
+def _system_prompt(
     content_type: str,
-    client_id: str,
-    sub_client_id: Optional[str] = None,
     additional_instructions: Optional[str] = None,
     recipient_name: Optional[str] = None,
     sender_name: Optional[str] = None
-) -> Dict[str, Any]:
-    """
-    Generate AI content using company knowledge base
-    
-    This is the core of the "Centralized Brain" - it searches the knowledge base
-    for relevant context and generates personalized content.
-    """
-    try:
-        # Search knowledge base for relevant context
-        context_results = search_knowledge_base(
-            query=prompt,
-            client_id=client_id,
-            sub_client_id=sub_client_id,
-            n_results=5
-        )
-        
-        # Build context from search results
-        context = ""
-        if context_results:
-            context = "\n\n".join([
-                f"Context {i+1}: {result['text']}"
-                for i, result in enumerate(context_results[:3])
-            ])
-        
-        # Build system prompt based on content type
-        system_prompts = {
-            "email": f"""You are an AI assistant helping to write professional emails for an IT consulting firm.
+) -> str:
+    """System prompt for the content type"""
+    system_prompts = {
+        "email": f"""You are an AI assistant helping to write professional emails for an IT consulting firm.
 Use the provided context from the company's knowledge base to write personalized, relevant emails.
 Include specific details from past projects and successful patterns when relevant.
 Recipient: {recipient_name or 'Client'}
 Sender: {sender_name or 'Consultant'}""",
-            
-            "summary": """You are an AI assistant creating executive summaries for an IT consulting firm.
+
+        "summary": """You are an AI assistant creating executive summaries for an IT consulting firm.
 Use the provided context to create comprehensive, actionable summaries.
 Focus on key insights, metrics, and business outcomes.""",
-            
-            "proposal": """You are an AI assistant creating project proposals for an IT consulting firm.
+
+        "proposal": """You are an AI assistant creating project proposals for an IT consulting firm.
 Use the provided context from past successful projects to create compelling proposals.
 Include technical approach, timeline estimates, and proven methodologies.""",
-            
-            "scope_of_work": """You are an AI assistant creating scope of work documents for IT projects.
+
+        "scope_of_work": """You are an AI assistant creating scope of work documents for IT projects.
 Use the provided context to define clear deliverables, milestones, and acceptance criteria.
 Reference similar successful projects and proven approaches.""",
-            
-            "action_items": """You are an AI assistant extracting and prioritizing action items.
+
+        "action_items": """You are an AI assistant extracting and prioritizing action items.
 Use the provided context to create specific, actionable tasks with clear ownership and deadlines."""
-        }
-        
-        system_prompt = system_prompts.get(content_type, system_prompts["summary"])
-        
-        if additional_instructions:
-            system_prompt += f"\n\nAdditional Instructions: {additional_instructions}"
-        
-        # Prepare messages for OpenAI
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Context from company knowledge base:\n{context}\n\nRequest: {prompt}"}
-        ]
-        
-        # Generate content using OpenAI
-        response = client.chat.completions.create(
-            model=settings.openai_model,
-            messages=messages,
-            max_tokens=1500,
-            temperature=0.7
+    }
+
+    system_prompt = system_prompts.get(content_type, system_prompts["summary"])
+
+    if additional_instructions:
+        system_prompt += f"\n\nAdditional Instructions: {additional_instructions}"
+    return system_prompt
+
+
+def _build_messages(
+    prompt: str,
+    content_type: str,
+    context_results: List[Dict[str, Any]],
+    model: str,
+    max_output_tokens: int,
+    additional_instructions: Optional[str] = None,
+    recipient_name: Optional[str] = None,
+    sender_name: Optional[str] = None
+) -> Tuple[List[Dict[str, str]], str, PromptBudget]:
+    """
+    System prompt plus the user request with its knowledge-base context
+
+    Sections are packed into the model's context window in priority order:
+    system prompt, request (truncated only if it alone would overflow), then
+    as many de-duplicated search results as fit CONTEXT_MAX_TOKENS.
+    """
+    budget = PromptBudget(model, max_output_tokens)
+    system_prompt = budget.add(
+        "system", _system_prompt(content_type, additional_instructions, recipient_name, sender_name)
+    )
+    prompt = budget.fit("prompt", prompt)
+    context = budget.pack("context", context_results, max_tokens=settings.context_max_tokens)
+    budget.observe(content_type)
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Context from company knowledge base:\n{context}\n\nRequest: {prompt}"}
+    ]
+    return messages, context, budget
+
+
+async def retrieve_context(
+    query: str,
+    client_id: str,
+    sub_client_id: Optional[str] = None,
+    n_results: int = 5,
+    content_type: str = "shared"
+) -> List[Dict[str, Any]]:
+    """
+    Search the knowledge base once so several generations can share the result
+
+    The embedding and Chroma calls are synchronous, so they run off the event loop.
+    """
+    with time_stage(
+        GENERATION_STAGE_SECONDS, "generate", "retrieval",
+        content_type=content_type, tenant=tenant_label(client_id)
+    ):
+        return await asyncio.to_thread(
+            search_knowledge_base,
+            query=query,
+            client_id=client_id,
+            sub_client_id=sub_client_id,
+            n_results=n_results
         )
 
-        generated_content = response.choices[0].message.content.strip()
+
+def _observe_usage(usage, stage_labels: Dict[str, str]):
+    if usage:
+        GENERATION_TOKENS.observe(usage.prompt_tokens, kind="prompt", **stage_labels)
+        GENERATION_TOKENS.observe(usage.completion_tokens, kind="completion", **stage_labels)
+
+
+async def _complete(
+    route: ModelRoute,
+    messages: List[Dict[str, str]],
+    params: Dict[str, Any],
+    client_id: str,
+    stage_labels: Dict[str, str]
+):
+    """One chat completion on `route` through the gateway, with route metrics"""
+    start = time.perf_counter()
+    with time_stage(GENERATION_STAGE_SECONDS, "generate", "llm", **stage_labels), \
+            tracer.start_span(
+                "openai.chat.completions.create",
+                kind=SPAN_KIND_CLIENT,
+                attributes={"model": route.model, "tier": route.tier, "content_type": route.content_type}
+            ):
+        response = await llm_gateway.chat_completion(
+            messages,
+            model=route.model,
+            tenant=client_id,
+            **params
+        )
+    model_router.observe(route, time.perf_counter() - start, response.usage)
+    _observe_usage(response.usage, stage_labels)
+    return response
+
+
+@traced("ai.generate_content")
+async def generate_content(
+    prompt: str,
+    content_type: str,
+    client_id: str,
+    sub_client_id: Optional[str] = None,
+    additional_instructions: Optional[str] = None,
+    recipient_name: Optional[str] = None,
+    sender_name: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
+) -> Dict[str, Any]:
+    """
+    Generate AI content using company knowledge base
+    
+    This is the core of the "Centralized Brain" - it searches the knowledge base
+    for relevant context and generates personalized content. Pass
+    `context_results` (from retrieve_context) to reuse an earlier search.
+    Content is sampled, so it is only answered from the generation cache
+    when GENERATION_CACHE_SAMPLED is set (and `bypass_cache` is not).
+
+    The model comes from the routing table; an empty answer from the fast
+    model is retried once on the default model.
+    """
+    stage_labels = {"content_type": content_type, "tenant": tenant_label(client_id)}
+    route = model_router.route(content_type)
+
+    try:
+        if context_results is None:
+            context_results = await retrieve_context(prompt, client_id, sub_client_id, content_type=content_type)
+        params = {"max_tokens": 1500, "temperature": 0.7}
+        use_cache = generation_cache.cacheable(params)
+
+        while True:
+            messages, context, budget = _build_messages(
+                prompt, content_type, context_results, route.model, params["max_tokens"],
+                additional_instructions, recipient_name, sender_name
+            )
+            cache_key = generation_cache.make_key(route.model, messages, **params)
+            if use_cache and not bypass_cache:
+                cached = await generation_cache.get(cache_key, content_type)
+                if cached is not None:
+                    return {
+                        "success": True,
+                        "content": cached,
+                        "context_used": _context_preview(context),
+                        "tokens_used": 0,
+                        "cached": True,
+                        "model": route.model,
+                        "prompt_sections": budget.report()
+                    }
+
+            # Generate content through the shared LLM gateway
+            response = await _complete(route, messages, params, client_id, stage_labels)
+            generated_content = (response.choices[0].message.content or "").strip()
+            if generated_content:
+                break
+            escalated = model_router.escalate(route, "empty_output")
+            if escalated is None:
+                raise ValueError(f"{route.model} returned no content")
+            route = escalated
+
+        if use_cache:
+            await generation_cache.put(cache_key, generated_content, content_type)
 
         return {
             "success": True,
             "content": generated_content,
-            "context_used": context[:500] + "..." if len(context) > 500 else context,
-            "tokens_used": response.usage.total_tokens
+            "context_used": _context_preview(context),
+            "tokens_used": response.usage.total_tokens if response.usage else 0,
+            "cached": False,
+            "model": route.model,
+            "prompt_sections": budget.report()
         }
         
     except Exception as e:
-        logger.error(f"Error generating content: {e}")
+        logger.error("Error generating content: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -109,12 +247,115 @@ Use the provided context to create specific, actionable tasks with clear ownersh
         }
 
 
+async def stream_content(
+    prompt: str,
+    content_type: str,
+    client_id: str,
+    sub_client_id: Optional[str] = None,
+    additional_instructions: Optional[str] = None,
+    recipient_name: Optional[str] = None,
+    sender_name: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming counterpart of generate_content
+
+    Yields events as dicts:
+        {"type": "context", "context_used": ...}   once retrieval is done
+        {"type": "token", "content": ...}          for every content delta
+        {"type": "done", "content": ..., "context_used": ..., "tokens_used": ...}
+        {"type": "error", "error": ...}            instead of "done" on failure
+
+    A generation cache hit (with GENERATION_CACHE_SAMPLED) is sent as a
+    single token event.
+    """
+    stage_labels = {"content_type": content_type, "tenant": tenant_label(client_id)}
+    route = model_router.route(content_type)
+
+    try:
+        if context_results is None:
+            context_results = await retrieve_context(prompt, client_id, sub_client_id, content_type=content_type)
+        params = {"max_tokens": 1500, "temperature": 0.7}
+        messages, context, budget = _build_messages(
+            prompt, content_type, context_results, route.model, params["max_tokens"],
+            additional_instructions, recipient_name, sender_name
+        )
+        yield {"type": "context", "context_used": _context_preview(context)}
+
+        cache_key = generation_cache.make_key(route.model, messages, **params)
+        use_cache = generation_cache.cacheable(params)
+        if use_cache and not bypass_cache:
+            cached = await generation_cache.get(cache_key, content_type)
+            if cached is not None:
+                yield {"type": "token", "content": cached}
+                yield {
+                    "type": "done",
+                    "content": cached,
+                    "context_used": _context_preview(context),
+                    "tokens_used": 0,
+                    "cached": True,
+                    "model": route.model,
+                    "prompt_sections": budget.report()
+                }
+                return
+
+        parts: List[str] = []
+        usage = None
+        start = time.perf_counter()
+        with time_stage(GENERATION_STAGE_SECONDS, "stream", "llm", **stage_labels), \
+                tracer.start_span(
+                    "openai.chat.completions.stream",
+                    kind=SPAN_KIND_CLIENT,
+                    attributes={"model": route.model, "tier": route.tier, "content_type": content_type}
+                ):
+            async for chunk in llm_gateway.stream_chat_completion(
+                messages,
+                model=route.model,
+                tenant=client_id,
+                **params
+            ):
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not parts:
+                        GENERATION_STAGE_SECONDS.observe(
+                            time.perf_counter() - start, stage="first_token", **stage_labels
+                        )
+                    parts.append(delta)
+                    yield {"type": "token", "content": delta}
+
+        model_router.observe(route, time.perf_counter() - start, usage)
+        _observe_usage(usage, stage_labels)
+        content = "".join(parts).strip()
+        if use_cache:
+            await generation_cache.put(cache_key, content, content_type)
+        yield {
+            "type": "done",
+            "content": content,
+            "context_used": _context_preview(context),
+            "tokens_used": usage.total_tokens if usage else 0,
+            "cached": False,
+            "model": route.model,
+            "prompt_sections": budget.report()
+        }
+
+    except Exception as e:
+        logger.error("Error streaming content: %s", e)
+        yield {"type": "error", "error": str(e)}
+
+
 async def generate_email(
     prompt: str,
     client_id: str,
     sub_client_id: Optional[str] = None,
     recipient_name: Optional[str] = None,
-    sender_name: Optional[str] = None
+    sender_name: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """Generate professional email"""
     return await generate_content(
@@ -124,14 +365,18 @@ async def generate_email(
         sub_client_id=sub_client_id,
         recipient_name=recipient_name,
         sender_name=sender_name,
-        additional_instructions="Write a professional, personalized email that references relevant past work and demonstrates expertise."
+        additional_instructions=CONTENT_INSTRUCTIONS["email"],
+        context_results=context_results,
+        bypass_cache=bypass_cache
     )
 
 
 async def generate_summary(
     prompt: str,
     client_id: str,
-    sub_client_id: Optional[str] = None
+    sub_client_id: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """Generate executive summary"""
     return await generate_content(
@@ -139,14 +384,18 @@ async def generate_summary(
         content_type="summary",
         client_id=client_id,
         sub_client_id=sub_client_id,
-        additional_instructions="Create a comprehensive summary with key insights, metrics, and actionable recommendations."
+        additional_instructions=CONTENT_INSTRUCTIONS["summary"],
+        context_results=context_results,
+        bypass_cache=bypass_cache
     )
 
 
 async def generate_proposal(
     prompt: str,
     client_id: str,
-    sub_client_id: Optional[str] = None
+    sub_client_id: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """Generate project proposal"""
     return await generate_content(
@@ -154,14 +403,18 @@ async def generate_proposal(
         content_type="proposal",
         client_id=client_id,
         sub_client_id=sub_client_id,
-        additional_instructions="Create a compelling proposal with technical approach, timeline, budget considerations, and references to successful similar projects."
+        additional_instructions=CONTENT_INSTRUCTIONS["proposal"],
+        context_results=context_results,
+        bypass_cache=bypass_cache
     )
 
 
 async def generate_scope_of_work(
     prompt: str,
     client_id: str,
-    sub_client_id: Optional[str] = None
+    sub_client_id: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """Generate scope of work document"""
     return await generate_content(
@@ -169,14 +422,18 @@ async def generate_scope_of_work(
         content_type="scope_of_work",
         client_id=client_id,
         sub_client_id=sub_client_id,
-        additional_instructions="Define clear deliverables, milestones, acceptance criteria, and risk mitigation strategies based on past project experience."
+        additional_instructions=CONTENT_INSTRUCTIONS["scope_of_work"],
+        context_results=context_results,
+        bypass_cache=bypass_cache
     )
 
 
 async def generate_action_items(
     prompt: str,
     client_id: str,
-    sub_client_id: Optional[str] = None
+    sub_client_id: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    bypass_cache: bool = False
 ) -> Dict[str, Any]:
     """Generate action items from content"""
     return await generate_content(
@@ -184,5 +441,165 @@ async def generate_action_items(
         content_type="action_items",
         client_id=client_id,
         sub_client_id=sub_client_id,
-        additional_instructions="Extract specific, actionable tasks with clear priorities, ownership, and realistic deadlines."
+        additional_instructions=CONTENT_INSTRUCTIONS["action_items"],
+        context_results=context_results,
+        bypass_cache=bypass_cache
     )
+
+
+# ============================================================================
+# STRUCTURED MEETING EXTRACTION
+# ============================================================================
+
+MEETING_EXTRACTION_PROMPT = """You are an AI assistant for an IT consulting firm processing a client meeting.
+Use the meeting transcript and the context from the company's knowledge base.
+Respond with a single JSON object with exactly these keys:
+  "summary": comprehensive meeting summary with key insights, decisions and outcomes (markdown text)
+  "action_items": list of objects with "task", "owner" (name or null), "due_date" (YYYY-MM-DD or null) and "priority" ("high", "medium" or "low")
+  "follow_up_email": professional follow-up email to the attendees summarizing key points and next steps
+Return only the JSON object, without code fences or commentary."""
+
+EXTRACTION_MAX_TOKENS = 3000
+
+
+# Content types a meeting transcript is sent to (extraction and its fallbacks)
+MEETING_CONTENT_TYPES = ("meeting_extraction", "summary", "action_items", "email")
+
+
+def transcript_token_budget(header: str = "") -> int:
+    """
+    Tokens a meeting transcript may use in the meeting prompts
+
+    What is left of the context window after the extraction instructions,
+    the meeting header, the knowledge-base context allowance and the answer,
+    on the smallest model any of the meeting content types is routed to.
+    """
+    remaining = []
+    for content_type in MEETING_CONTENT_TYPES:
+        budget = PromptBudget(model_router.route(content_type).model, EXTRACTION_MAX_TOKENS)
+        budget.add("system", MEETING_EXTRACTION_PROMPT)
+        budget.add("header", header)
+        budget.reserve("context", settings.context_max_tokens)
+        remaining.append(budget.remaining)
+    return min(remaining)
+
+
+def parse_meeting_extraction(raw: str) -> MeetingExtraction:
+    """
+    Validate model output against MeetingExtraction
+
+    Tolerates code fences or text around the JSON object; raises ValueError
+    (or pydantic's ValidationError) when the output does not fit the schema.
+    """
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object in model output")
+    return MeetingExtraction.model_validate_json(raw[start:end + 1])
+
+
+def render_action_items(action_items: List[MeetingActionItem]) -> str:
+    """Markdown checklist stored as the action_items output"""
+    if not action_items:
+        return "No action items were identified in this meeting."
+    lines = []
+    for item in action_items:
+        details = [f"Priority: {item.priority}"]
+        if item.owner:
+            details.append(f"Owner: {item.owner}")
+        if item.due_date:
+            details.append(f"Due: {item.due_date}")
+        lines.append(f"- [ ] {item.task} ({', '.join(details)})")
+    return "\n".join(lines)
+
+
+@traced("ai.extract_meeting")
+async def extract_meeting_insights(
+    meeting_context: str,
+    client_id: str,
+    sub_client_id: Optional[str] = None,
+    context_results: Optional[List[Dict[str, Any]]] = None,
+    recipient_name: Optional[str] = None,
+    bypass_cache: bool = False
+) -> Dict[str, Any]:
+    """
+    Summary, action items and follow-up email from one model call
+
+    Sends the transcript once instead of three times. Returns
+    {"success": False, ...} when the call fails or the output does not
+    validate, so callers can fall back to the per-type prompts.
+    """
+    stage_labels = {"content_type": "meeting_extraction", "tenant": tenant_label(client_id)}
+    route = model_router.route("meeting_extraction")
+
+    try:
+        if context_results is None:
+            context_results = await retrieve_context(
+                meeting_context[:2000], client_id, sub_client_id, content_type="meeting_extraction"
+            )
+        # Deterministic, so reprocessing a meeting replays a validated extraction from the cache
+        params: Dict[str, Any] = {"max_tokens": EXTRACTION_MAX_TOKENS, "temperature": 0}
+        if settings.openai_json_mode:
+            params["response_format"] = {"type": "json_object"}
+
+        system_prompt = MEETING_EXTRACTION_PROMPT
+        if recipient_name:
+            system_prompt += f"\nAddress the follow-up email to: {recipient_name}"
+
+        while True:
+            budget = PromptBudget(route.model, EXTRACTION_MAX_TOKENS)
+            budget.add("system", system_prompt)
+            meeting_text = budget.fit("meeting", meeting_context)
+            context = budget.pack("context", context_results, max_tokens=settings.context_max_tokens)
+            budget.observe("meeting_extraction")
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Context from company knowledge base:\n{context}\n\nMeeting:\n{meeting_text}"}
+            ]
+
+            cache_key = generation_cache.make_key(route.model, messages, **params)
+            cached = (
+                await generation_cache.get(cache_key, "meeting_extraction")
+                if generation_cache.cacheable(params) and not bypass_cache else None
+            )
+            if cached is not None:
+                return {
+                    "success": True,
+                    "extraction": parse_meeting_extraction(cached),
+                    "context_used": _context_preview(context),
+                    "tokens_used": 0,
+                    "cached": True,
+                    "model": route.model,
+                    "prompt_sections": budget.report()
+                }
+
+            response = await _complete(route, messages, params, client_id, stage_labels)
+            raw = response.choices[0].message.content or ""
+            try:
+                extraction = parse_meeting_extraction(raw)
+                break
+            except (ValidationError, ValueError):
+                # Invalid JSON from the fast model gets one try on the default model
+                escalated = model_router.escalate(route, "invalid_output")
+                if escalated is None:
+                    raise
+                route = escalated
+
+        # Only output that validated is cached, so a bad answer is never replayed
+        if generation_cache.cacheable(params):
+            await generation_cache.put(cache_key, raw, "meeting_extraction")
+        return {
+            "success": True,
+            "extraction": extraction,
+            "context_used": _context_preview(context),
+            "tokens_used": response.usage.total_tokens if response.usage else 0,
+            "cached": False,
+            "model": route.model,
+            "prompt_sections": budget.report()
+        }
+
+    except (ValidationError, ValueError) as e:
+        logger.warning("Structured meeting extraction did not validate: %s", e)
+        return {"success": False, "error": f"Invalid extraction: {e}"}
+    except Exception as e:
+        logger.error("Error extracting meeting insights: %s", e)
+        return {"success": False, "error": str(e)}
@@ -3,17 +3,20 @@ Authentication and security utilities
 """
 
 import hashlib
+import hmac
+import logging
 import jwt as pyjwt
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from fastapi import HTTPException, Depends, status
+from fastapi import HTTPException, Depends, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.utils.config import get_settings
 from app.core.database import db_manager
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 security = HTTPBearer()
 
@@ -93,6 +96,22 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return user_id
 
 
+def is_admin_request(admin_token: Optional[str]) -> bool:
+    """Check an X-Admin-Token value (falls back to debug mode when no token is configured)"""
+    if settings.admin_token:
+        return admin_token is not None and hmac.compare_digest(admin_token, settings.admin_token)
+    return settings.debug
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency for admin/debug-only endpoints"""
+    if not is_admin_request(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+
 async def authenticate_user(email: str, password: str) -> Optional[dict]:
     """Authenticate user with email and password"""
     # First check database users (including demo users that should be stored)
@@ -139,7 +158,7 @@ async def authenticate_user(email: str, password: str) -> Optional[dict]:
                         "name": result["name"]
                     }
             except Exception as e:
-                print(f"⚠️  Error creating demo user in database: {e}")
+                logger.warning("⚠️  Error creating demo user in database: %s", e)
                 # Still return the demo user data even if DB creation fails
                 return {
                     "id": demo_user["id"],
@@ -198,8 +217,8 @@ async def initialize_demo_users():
                     updated_at=datetime.fromisoformat(user_data["created_at"])
                 )
                 await db_manager.create_user(user)
-                print(f"✅ Demo user created: {email}")
+                logger.info("✅ Demo user created: %s", email)
             else:
-                print(f"✅ Demo user exists: {email}")
+                logger.info("✅ Demo user exists: %s", email)
         except Exception as e:
-            print(f"⚠️  Error creating demo user {email}: {e}")
+            logger.warning("⚠️  Error creating demo user %s: %s", email, e)
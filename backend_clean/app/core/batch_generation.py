@@ -0,0 +1,175 @@
+"""
+Batch AI generation for Lemur AI
+Runs many generate_content calls with bounded concurrency, sharing
+knowledge-base searches between prompts, and turns the results into
+Output rows for one bulk insert
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.ai_service import CONTENT_INSTRUCTIONS, generate_content, retrieve_context
+from app.core.metrics import BATCH_ITEMS
+from app.core.rate_limiter import AdaptiveConcurrency, TokenBucket
+from app.models.output import Output
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchJob:
+    """One generation in a batch"""
+    prompt: str
+    content_type: str
+    client_id: str
+    sub_client_id: Optional[str] = None
+    additional_instructions: Optional[str] = None
+    recipient_name: Optional[str] = None
+    sender_name: Optional[str] = None
+    title: Optional[str] = None
+    context_query: Optional[str] = None  # knowledge-base query; the prompt when not set
+
+    @property
+    def retrieval_key(self) -> Tuple[str, Optional[str], str]:
+        return (self.client_id, self.sub_client_id, self.context_query or self.prompt)
+
+
+class SharedRetrieval:
+    """
+    One knowledge-base search per (client, sub-client, query)
+
+    Jobs that ask the same question share the search, including jobs that
+    are in flight at the same time. Only the most recent `max_entries`
+    searches are remembered so long runs stay bounded.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.searches = 0
+        self._results: "OrderedDict[Tuple[str, Optional[str], str], asyncio.Future]" = OrderedDict()
+
+    async def get(self, job: BatchJob) -> List[Dict[str, Any]]:
+        key = job.retrieval_key
+        search = self._results.get(key)
+        if search is None:
+            search = asyncio.ensure_future(
+                retrieve_context(key[2], job.client_id, job.sub_client_id, content_type=job.content_type)
+            )
+            self._results[key] = search
+            self.searches += 1
+            if len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        return await asyncio.shield(search)
+
+
+async def run_batch(
+    jobs: Iterable[BatchJob],
+    concurrency: Union[int, AdaptiveConcurrency],
+    bypass_cache: bool = False,
+    source: str = "api",
+    requests_per_minute: Optional[TokenBucket] = None,
+    tokens_per_minute: Optional[TokenBucket] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Generate every job, yielding (index, result) as each one completes
+
+    At most `concurrency` generations run at once (the LLM gateway's
+    per-tenant limit still applies on top); pass an AdaptiveConcurrency to
+    let the limit follow upstream throttling. The optional buckets pace
+    calls and token usage per minute. Jobs are pulled from the iterable
+    lazily, so arbitrarily long runs hold only a few tasks at a time.
+    Closing the iterator cancels whatever has not finished.
+    """
+    if isinstance(concurrency, AdaptiveConcurrency):
+        limiter = concurrency
+    else:
+        limiter = AdaptiveConcurrency(concurrency)
+    retrieval = SharedRetrieval()
+
+    async def run(index: int, job: BatchJob) -> Tuple[int, Dict[str, Any]]:
+        async with limiter.slot():
+            if requests_per_minute:
+                await requests_per_minute.acquire()
+            if tokens_per_minute:
+                await tokens_per_minute.acquire()
+            context_results = await retrieval.get(job)
+            result = await generate_content(
+                prompt=job.prompt,
+                content_type=job.content_type,
+                client_id=job.client_id,
+                sub_client_id=job.sub_client_id,
+                additional_instructions=job.additional_instructions or CONTENT_INSTRUCTIONS.get(job.content_type),
+                recipient_name=job.recipient_name,
+                sender_name=job.sender_name,
+                context_results=context_results,
+                bypass_cache=bypass_cache
+            )
+            if tokens_per_minute and not result.get("cached"):
+                tokens_per_minute.charge(result.get("tokens_used") or 0)
+        BATCH_ITEMS.inc(source=source, outcome="success" if result.get("success") else "error")
+        return index, result
+
+    queued = enumerate(jobs)
+    pending = set()
+
+    def top_up():
+        # Keep a few more tasks than slots so a freed slot is reused at once
+        while len(pending) < limiter.limit * 2:
+            try:
+                index, job = next(queued)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(run(index, job)))
+
+    completed = 0
+    try:
+        top_up()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                completed += 1
+                yield task.result()
+            top_up()
+    finally:
+        for task in pending:
+            task.cancel()
+        logger.info(
+            "Batch of %d generations used %d knowledge-base searches", completed, retrieval.searches
+        )
+
+
+def default_title(content_type: str, recipient_name: Optional[str] = None) -> str:
+    """Output title used by the single-item endpoints for the same content type"""
+    if content_type == "email" and recipient_name:
+        return f"Follow-up Email to {recipient_name}"
+    return f"{content_type.replace('_', ' ').title()} - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+
+def build_output(
+    job: BatchJob,
+    result: Dict[str, Any],
+    user_id: str,
+    output_id: Optional[str] = None
+) -> Output:
+    """Output row for a successful batch generation"""
+    return Output(
+        id=output_id or str(uuid.uuid4()),
+        title=job.title or default_title(job.content_type, job.recipient_name),
+        content=result["content"],
+        output_type=job.content_type,
+        prompt=job.prompt,
+        client_id=job.client_id,
+        sub_client_id=job.sub_client_id,
+        user_id=user_id,
+        context_used=result.get("context_used", ""),
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    )
@@ -0,0 +1,248 @@
+"""
+Bot status poller for Lemur AI
+One scheduler refreshes every tracked Recall bot, batching lookups into
+paginated list calls, polling each bot at a rate that suits its state, and
+publishes status changes to subscribers
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.utils.config import get_settings
+from app.core.metrics import BOT_STATUS_LOOKUPS
+from app.core.recall_service import DONE_STATUSES, FAILED_STATUSES, bot_summary, recall_service
+from app.core.tracing import create_traced_task
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Seconds between polls by bot status (others use MEETING_POLL_INTERVAL_SECONDS)
+STATUS_POLL_INTERVALS = {
+    "ready": 120,
+    "waiting_to_join": 120,
+    "joining_call": 15,
+    "in_waiting_room": 30,
+    "in_call_not_recording": 30,
+    "in_call_recording": 60,
+    "call_ended": 5,
+    "recording_done": 5
+}
+
+# Within this long of a meeting's expected end, recording bots are polled quickly
+NEAR_END_WINDOW_SECONDS = 300
+NEAR_END_INTERVAL_SECONDS = 10
+
+# Fewer due bots than this are fetched one by one rather than by paging the list
+LIST_CALL_MIN_BOTS = 3
+
+# list_bots is filtered to bots joining after (earliest tracked bot - this)
+LIST_JOIN_MARGIN = timedelta(hours=1)
+
+StatusSubscriber = Callable[[str, str], Awaitable[Any]]
+
+
+@dataclass
+class TrackedBot:
+    """Scheduling state for one bot"""
+    bot_id: str
+    tracked_at: datetime
+    expected_end: Optional[float] = None  # monotonic deadline
+    status: Optional[str] = None
+    summary: Dict[str, Any] = field(default_factory=dict)
+    checked_at: Optional[float] = None
+    next_poll: float = 0.0
+
+
+class BotStatusPoller:
+    """
+    Central scheduler for bot status polling
+
+    Replaces one polling loop per meeting: bots are registered with `track`,
+    a single task wakes when the earliest bot is due, refreshes every due bot
+    (one paginated `list_bots` call when several are due) and calls each
+    subscriber with (bot_id, status) when a status changes. Bots that reach a
+    final status are dropped. Statuses learned elsewhere (webhooks) are fed
+    in with `observe` so the schedule stays current.
+    """
+
+    def __init__(self, default_interval: float, floor_interval: float = 0.0, max_pages: int = 10):
+        self.default_interval = default_interval
+        self.floor_interval = floor_interval  # webhooks deliver changes; polling only reconciles
+        self.max_pages = max_pages
+        self._bots: Dict[str, TrackedBot] = {}
+        self._subscribers: List[StatusSubscriber] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: StatusSubscriber):
+        self._subscribers.append(callback)
+
+    def track(self, bot_id: str, expected_end: Optional[datetime] = None):
+        """Start polling a bot (expected_end sharpens polling near the end of the meeting)"""
+        bot = TrackedBot(bot_id=bot_id, tracked_at=datetime.now(timezone.utc))
+        if expected_end is not None:
+            if expected_end.tzinfo is None:
+                expected_end = expected_end.astimezone()
+            bot.expected_end = time.monotonic() + (expected_end - datetime.now(timezone.utc)).total_seconds()
+        bot.next_poll = time.monotonic() + self.interval(bot)
+        self._bots[bot_id] = bot
+        self._ensure_running()
+
+    def untrack(self, bot_id: str):
+        self._bots.pop(bot_id, None)
+
+    def tracked(self) -> List[str]:
+        return list(self._bots)
+
+    def interval(self, bot: TrackedBot) -> float:
+        """Seconds until the next poll of `bot`, from its status and expected end"""
+        interval = STATUS_POLL_INTERVALS.get(bot.status, self.default_interval)
+        if bot.status == "in_call_recording" and bot.expected_end is not None:
+            if bot.expected_end - time.monotonic() <= NEAR_END_WINDOW_SECONDS:
+                interval = NEAR_END_INTERVAL_SECONDS
+        return max(interval, self.floor_interval)
+
+    def observe(self, bot_id: str, status: str, summary: Optional[Dict[str, Any]] = None):
+        """Record a status learned outside the poller, without notifying subscribers"""
+        bot = self._bots.get(bot_id)
+        if bot is not None:
+            self._apply(bot, status, summary)
+
+    def _apply(self, bot: TrackedBot, status: str, summary: Optional[Dict[str, Any]]) -> bool:
+        changed = status != bot.status
+        bot.status = status
+        if summary:
+            bot.summary = summary
+        bot.checked_at = time.monotonic()
+        bot.next_poll = bot.checked_at + self.interval(bot)
+        if status in DONE_STATUSES or status in FAILED_STATUSES:
+            self.untrack(bot.bot_id)
+        return changed
+
+    async def fetch(self, bot_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Current status summary per bot (bots that could not be fetched are left out)
+
+        Several bots are read from paginated `list_bots` calls; bots missing
+        from the pages, or when only a few are asked for, are fetched
+        individually and concurrently.
+        """
+        wanted = set(bot_ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        if len(wanted) >= LIST_CALL_MIN_BOTS:
+            tracked = [self._bots[b].tracked_at for b in wanted if b in self._bots]
+            join_at_after = (min(tracked) - LIST_JOIN_MARGIN).isoformat() if len(tracked) == len(wanted) else None
+            BOT_STATUS_LOOKUPS.inc(method="list")
+            result = await recall_service.list_bots(join_at_after, self.max_pages)
+            if result["success"]:
+                for bot_data in result["bots"]:
+                    recall_service.cache_bot(bot_data)
+                    if bot_data.get("id") in wanted:
+                        found[bot_data["id"]] = bot_summary(bot_data)
+
+        missing = [bot_id for bot_id in wanted if bot_id not in found]
+        if missing:
+            BOT_STATUS_LOOKUPS.inc(len(missing), method="get")
+            results = await asyncio.gather(*(recall_service.get_bot_status(bot_id) for bot_id in missing))
+            for bot_id, result in zip(missing, results):
+                if result["success"]:
+                    found[bot_id] = {k: v for k, v in result.items() if k not in ("success", "data")}
+        return found
+
+    async def refresh(self, bot_ids: Iterable[str]):
+        """Fetch the given tracked bots and publish any status changes"""
+        bot_ids = [bot_id for bot_id in bot_ids if bot_id in self._bots]
+        if not bot_ids:
+            return
+        found = await self.fetch(bot_ids)
+        for bot_id in bot_ids:
+            bot = self._bots.get(bot_id)
+            if bot is None:
+                continue
+            summary = found.get(bot_id)
+            if summary is None:
+                # Lookup failed: try again after the normal interval
+                bot.next_poll = time.monotonic() + self.interval(bot)
+                continue
+            if self._apply(bot, summary["status"], summary):
+                await self._publish(bot_id, summary["status"])
+
+    async def statuses(self, bot_ids: Iterable[str], max_age: float) -> Dict[str, Dict[str, Any]]:
+        """Summaries for `bot_ids`, reusing tracked bots checked within `max_age` seconds"""
+        now = time.monotonic()
+        summaries: Dict[str, Dict[str, Any]] = {}
+        stale = []
+        for bot_id in bot_ids:
+            bot = self._bots.get(bot_id)
+            if bot is not None and bot.summary and bot.checked_at and now - bot.checked_at <= max_age:
+                summaries[bot_id] = bot.summary
+            else:
+                stale.append(bot_id)
+        if stale:
+            fetched = await self.fetch(stale)
+            for bot_id, summary in fetched.items():
+                bot = self._bots.get(bot_id)
+                if bot is not None and self._apply(bot, summary["status"], summary):
+                    await self._publish(bot_id, summary["status"])
+            summaries.update(fetched)
+        return summaries
+
+    async def _publish(self, bot_id: str, status: str):
+        for callback in self._subscribers:
+            try:
+                await callback(bot_id, status)
+            except Exception as e:
+                logger.error("❌ Bot status subscriber failed for %s: %s", bot_id, e)
+
+    def _ensure_running(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._task is None or self._task.done():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._task = create_traced_task(self._run(), "bots.poll", open_span=False)
+
+    async def _run(self):
+        self._wakeup = asyncio.Event()
+        while True:
+            now = time.monotonic()
+            due = [bot.bot_id for bot in self._bots.values() if bot.next_poll <= now]
+            if due:
+                try:
+                    await self.refresh(due)
+                except Exception as e:
+                    logger.error("❌ Error polling bot statuses: %s", e)
+                    for bot_id in due:
+                        if bot_id in self._bots:
+                            self._bots[bot_id].next_poll = time.monotonic() + self.default_interval
+
+            next_poll = min((bot.next_poll for bot in self._bots.values()), default=None)
+            timeout = None if next_poll is None else max(0.1, next_poll - time.monotonic())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global bot status poller instance
+bot_poller = BotStatusPoller(
+    default_interval=settings.meeting_poll_interval_seconds,
+    floor_interval=settings.meeting_reconcile_interval_seconds if settings.recall_webhook_secret else 0.0,
+    max_pages=settings.bot_poller_max_pages
+)
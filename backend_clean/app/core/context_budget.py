@@ -0,0 +1,208 @@
+"""
+Prompt token budgets for Lemur AI
+Counts tokens with the model's tokenizer, deduplicates overlapping
+knowledge-base chunks and packs prompt sections into the model's context
+window, recording how many tokens each section used
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.utils.config import get_settings
+from app.core.metrics import PROMPT_SECTION_TOKENS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    logger.warning("⚠️  tiktoken not found, estimating tokens from characters. Install with: pip install tiktoken")
+    tiktoken = None
+settings = get_settings()
+
+# Context window per model family, matched by longest prefix
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Head-room for chat message framing and the labels around each section
+SAFETY_MARGIN_TOKENS = 256
+
+# Don't bother adding a truncated chunk smaller than this
+MIN_PARTIAL_CHUNK_TOKENS = 100
+
+# chunk_text overlaps neighbouring chunks by 200 characters
+MAX_CHUNK_OVERLAP_CHARS = 400
+MIN_CHUNK_OVERLAP_CHARS = 20
+
+
+def context_window(model: str) -> int:
+    """Context window of `model` (OPENAI_CONTEXT_WINDOW overrides the table)"""
+    if settings.openai_context_window:
+        return settings.openai_context_window
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    """tiktoken encoding for `model`, or None when tiktoken is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The BPE files are downloaded on first use, which fails on offline hosts
+        logger.warning("Could not load tiktoken encoding for %s, estimating tokens: %s", model, e)
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count for `text` (about four characters per token without tiktoken)"""
+    if not text:
+        return 0
+    encoding = _encoding(model or settings.openai_model)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Longest prefix of `text` that fits in `max_tokens`"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding(model or settings.openai_model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def _overlap(before: str, after: str) -> int:
+    """Length of the longest suffix of `before` that is a prefix of `after`"""
+    for size in range(min(len(before), len(after), MAX_CHUNK_OVERLAP_CHARS), MIN_CHUNK_OVERLAP_CHARS - 1, -1):
+        if before.endswith(after[:size]):
+            return size
+    return 0
+
+
+def dedupe_chunks(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rank search results by score and drop repeated text
+
+    Exact and contained duplicates are removed, and when neighbouring chunks
+    of the same file are both present the text they share (chunk overlap)
+    is kept only once.
+    """
+    ranked = sorted(results, key=lambda r: r.get("score") or 0.0, reverse=True)
+    kept: List[Dict[str, Any]] = []
+    originals: Dict[tuple, str] = {}  # (file_id, chunk_index) -> untrimmed text
+
+    for result in ranked:
+        text = (result.get("text") or "").strip()
+        if not text or any(text in k["text"] for k in kept):
+            continue
+
+        metadata = result.get("metadata") or {}
+        file_id, index = metadata.get("file_id"), metadata.get("chunk_index")
+        trimmed = text
+        if file_id is not None and index is not None:
+            previous = originals.get((file_id, index - 1))
+            if previous:
+                trimmed = trimmed[_overlap(previous, trimmed):]
+            following = originals.get((file_id, index + 1))
+            if following:
+                trimmed = trimmed[:len(trimmed) - _overlap(trimmed, following)]
+            originals[(file_id, index)] = text
+
+        if trimmed.strip():
+            kept.append({**result, "text": trimmed.strip()})
+    return kept
+
+
+class PromptBudget:
+    """
+    Token accounting for one prompt
+
+    The budget is the model's context window minus the completion tokens
+    and a safety margin. Sections are added in priority order: `add` always
+    keeps the text, `fit` truncates it to what is left, and `pack` fills a
+    section with as many ranked knowledge-base chunks as fit.
+    """
+
+    def __init__(self, model: Optional[str] = None, max_output_tokens: int = 1500):
+        self.model = model or settings.openai_model
+        self.total = context_window(self.model) - max_output_tokens - SAFETY_MARGIN_TOKENS
+        self.sections: Dict[str, int] = {}
+
+    @property
+    def used(self) -> int:
+        return sum(self.sections.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.used)
+
+    def add(self, name: str, text: str) -> str:
+        """Count a section that must be sent whole"""
+        self.sections[name] = self.sections.get(name, 0) + count_tokens(text, self.model)
+        return text
+
+    def reserve(self, name: str, tokens: int):
+        """Hold back tokens for a section that is added later"""
+        self.sections[name] = self.sections.get(name, 0) + tokens
+
+    def fit(self, name: str, text: str, max_tokens: Optional[int] = None) -> str:
+        """Add a section, truncated to the remaining budget (and `max_tokens`)"""
+        limit = self.remaining if max_tokens is None else min(self.remaining, max_tokens)
+        tokens = count_tokens(text, self.model)
+        if tokens > limit:
+            logger.warning("Truncating prompt section %s from %d to %d tokens", name, tokens, limit)
+            text = truncate_to_tokens(text, limit, self.model)
+            tokens = count_tokens(text, self.model)
+        self.sections[name] = self.sections.get(name, 0) + tokens
+        return text
+
+    def pack(
+        self,
+        name: str,
+        results: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        label: str = "Context"
+    ) -> str:
+        """Best-ranked, de-duplicated chunks rendered as `Context N: ...` within budget"""
+        limit = self.remaining if max_tokens is None else min(self.remaining, max_tokens)
+        parts: List[str] = []
+        used = 0
+        for result in dedupe_chunks(results):
+            part = f"{label} {len(parts) + 1}: {result['text']}"
+            tokens = count_tokens(part, self.model) + 2
+            if used + tokens > limit:
+                if limit - used >= MIN_PARTIAL_CHUNK_TOKENS:
+                    part = truncate_to_tokens(part, limit - used - 2, self.model)
+                    parts.append(part)
+                    used += count_tokens(part, self.model) + 2
+                break
+            parts.append(part)
+            used += tokens
+        self.sections[name] = self.sections.get(name, 0) + used
+        return "\n\n".join(parts)
+
+    def report(self) -> Dict[str, int]:
+        """Tokens per section plus totals, as returned to callers"""
+        return {**self.sections, "total": self.used, "budget": self.total}
+
+    def observe(self, content_type: str):
+        for section, tokens in self.sections.items():
+            PROMPT_SECTION_TOKENS.observe(tokens, section=section, content_type=content_type)
@@ -12,6 +12,7 @@ from app.models.user import User
 from app.models.client import Client as ClientModel, SubClient
 from app.models.file import File
 from app.models.output import Output
+from app.core.tracing import traced, SPAN_KIND_CLIENT
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -30,6 +31,7 @@ class DatabaseManager:
     # USER OPERATIONS
     # ============================================================================
     
+    @traced("supabase.create_user", kind=SPAN_KIND_CLIENT)
     async def create_user(self, user: User) -> Optional[Dict[str, Any]]:
         """Create a new user"""
         try:
@@ -48,6 +50,7 @@ class DatabaseManager:
             logger.error(f"Error creating user: {e}")
             return None
     
+    @traced("supabase.get_user_by_email", kind=SPAN_KIND_CLIENT)
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
         try:
@@ -57,6 +60,7 @@ class DatabaseManager:
             logger.error(f"Error getting user by email: {e}")
             return None
     
+    @traced("supabase.get_user_by_id", kind=SPAN_KIND_CLIENT)
     async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
         try:
@@ -70,6 +74,7 @@ class DatabaseManager:
     # CLIENT OPERATIONS
     # ============================================================================
     
+    @traced("supabase.create_client", kind=SPAN_KIND_CLIENT)
     async def create_client(self, client: ClientModel) -> Optional[Dict[str, Any]]:
         """Create a new client"""
         try:
@@ -88,6 +93,7 @@ class DatabaseManager:
             logger.error(f"Error creating client: {e}")
             return None
     
+    @traced("supabase.get_clients_by_user", kind=SPAN_KIND_CLIENT)
     async def get_clients_by_user(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all clients for a user"""
         try:
@@ -97,6 +103,7 @@ class DatabaseManager:
             logger.error(f"Error getting clients: {e}")
             return []
     
+    @traced("supabase.create_sub_client", kind=SPAN_KIND_CLIENT)
     async def create_sub_client(self, sub_client: SubClient) -> Optional[Dict[str, Any]]:
         """Create a new sub-client"""
         try:
@@ -117,6 +124,7 @@ class DatabaseManager:
             logger.error(f"Error creating sub-client: {e}")
             return None
     
+    @traced("supabase.get_sub_clients_by_client", kind=SPAN_KIND_CLIENT)
     async def get_sub_clients_by_client(self, client_id: str) -> List[Dict[str, Any]]:
         """Get all sub-clients for a client"""
         try:
@@ -130,6 +138,7 @@ class DatabaseManager:
     # FILE OPERATIONS
     # ============================================================================
     
+    @traced("supabase.create_file_record", kind=SPAN_KIND_CLIENT)
     async def create_file_record(self, file: File) -> Optional[Dict[str, Any]]:
         """Create a file record"""
         try:
@@ -156,6 +165,7 @@ class DatabaseManager:
             logger.error(f"Error creating file record: {e}")
             return None
     
+    @traced("supabase.get_files_by_client", kind=SPAN_KIND_CLIENT)
     async def get_files_by_client(self, client_id: str, sub_client_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get files for a client/sub-client"""
         try:
@@ -173,31 +183,58 @@ class DatabaseManager:
     # OUTPUT OPERATIONS
     # ============================================================================
     
-    async def create_output(self, output: Output) -> Optional[Dict[str, Any]]:
-        """Create an LLM output record"""
+    @staticmethod
+    def _output_row(output: Output) -> Dict[str, Any]:
+        """Column values for an outputs row (None values, e.g. a missing ID, left to the database)"""
+        output_data = {
+            "id": output.id,
+            "title": output.title,
+            "content": output.content,
+            "output_type": output.output_type,
+            "prompt": output.prompt,
+            "client_id": output.client_id,
+            "sub_client_id": output.sub_client_id,
+            "user_id": output.user_id,
+            "file_id": output.file_id,
+            "meeting_id": output.meeting_id,
+            "created_at": output.created_at.isoformat(),
+            "updated_at": output.updated_at.isoformat()
+        }
+        # Remove None values
+        return {k: v for k, v in output_data.items() if v is not None}
+
+    @traced("supabase.create_output", kind=SPAN_KIND_CLIENT)
+    async def create_output(self, output: Output, upsert: bool = False) -> Optional[Dict[str, Any]]:
+        """Create an LLM output record (upsert=True overwrites an existing row with the same ID)"""
         try:
-            output_data = {
-                "title": output.title,
-                "content": output.content,
-                "output_type": output.output_type,
-                "prompt": output.prompt,
-                "client_id": output.client_id,
-                "sub_client_id": output.sub_client_id,
-                "user_id": output.user_id,
-                "file_id": output.file_id,
-                "meeting_id": output.meeting_id,
-                "created_at": output.created_at.isoformat(),
-                "updated_at": output.updated_at.isoformat()
-            }
-            # Remove None values
-            output_data = {k: v for k, v in output_data.items() if v is not None}
-            
-            result = self.client.table("outputs").insert(output_data).execute()
+            table = self.client.table("outputs")
+            row = self._output_row(output)
+            result = (table.upsert(row) if upsert else table.insert(row)).execute()
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error creating output: {e}")
             return None
+
+    @traced("supabase.create_outputs_bulk", kind=SPAN_KIND_CLIENT)
+    async def create_outputs_bulk(self, outputs: List[Output], upsert: bool = False) -> List[Dict[str, Any]]:
+        """
+        Create many LLM output records in one insert (rows come back in order)
+
+        With upsert=True rows whose ID already exists are overwritten, so a
+        writer that derives IDs deterministically can safely replay a batch.
+        """
+        if not outputs:
+            return []
+        try:
+            rows = [self._output_row(o) for o in outputs]
+            table = self.client.table("outputs")
+            result = (table.upsert(rows) if upsert else table.insert(rows)).execute()
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Error creating outputs in bulk: {e}")
+            return []
     
+    @traced("supabase.get_outputs_by_client", kind=SPAN_KIND_CLIENT)
     async def get_outputs_by_client(self, client_id: str, sub_client_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get outputs for a client/sub-client"""
         try:
@@ -211,6 +248,7 @@ class DatabaseManager:
             logger.error(f"Error getting outputs: {e}")
             return []
 
+    @traced("supabase.get_all_outputs", kind=SPAN_KIND_CLIENT)
     async def get_all_outputs(self) -> List[Dict[str, Any]]:
         """Get all outputs (for debug purposes)"""
         try:
@@ -13,6 +13,11 @@ from PIL import Image
 import pytesseract
 from app.utils.config import get_settings, get_upload_path
 from app.core.vector_store import store_document_chunks
+from app.core.tracing import traced
+from app.core.metrics import (
+    INGEST_STAGE_SECONDS, INGEST_FILE_BYTES, INGEST_TEXT_CHARS, INGEST_CHUNKS,
+    tenant_label, time_stage
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -28,7 +33,7 @@ def extract_text_from_pdf(file_path: str) -> str:
                 text += page.extract_text() + "\n"
         return text.strip()
     except Exception as e:
-        logger.error(f"Error extracting text from PDF: {e}")
+        logger.error("Error extracting text from PDF: %s", e)
         return ""
 
 
@@ -41,7 +46,7 @@ def extract_text_from_docx(file_path: str) -> str:
             text += paragraph.text + "\n"
         return text.strip()
     except Exception as e:
-        logger.error(f"Error extracting text from DOCX: {e}")
+        logger.error("Error extracting text from DOCX: %s", e)
         return ""
 
 
@@ -52,7 +57,7 @@ def extract_text_from_image(file_path: str) -> str:
         text = pytesseract.image_to_string(image)
         return text.strip()
     except Exception as e:
-        logger.error(f"Error extracting text from image: {e}")
+        logger.error("Error extracting text from image: %s", e)
         return ""
 
 
@@ -62,10 +67,11 @@ def extract_text_from_txt(file_path: str) -> str:
         with open(file_path, 'r', encoding='utf-8') as file:
             return file.read().strip()
     except Exception as e:
-        logger.error(f"Error reading text file: {e}")
+        logger.error("Error reading text file: %s", e)
         return ""
 
 
+@traced("file_processor.extract_text")
 def extract_text_from_file(file_path: str, file_type: str) -> str:
     """Extract text from file based on type"""
     extractors = {
@@ -83,7 +89,7 @@ def extract_text_from_file(file_path: str, file_type: str) -> str:
     if extractor:
         return extractor(file_path)
     else:
-        logger.warning(f"No extractor available for file type: {file_type}")
+        logger.warning("No extractor available for file type: %s", file_type)
         return ""
 
 
@@ -138,14 +144,15 @@ def save_uploaded_file(file_content: bytes, filename: str, client_id: str) -> st
         with open(file_path, 'wb') as f:
             f.write(file_content)
         
-        logger.info(f"File saved: {file_path}")
+        logger.debug("File saved: %s", file_path)
         return file_path
         
     except Exception as e:
-        logger.error(f"Error saving file: {e}")
+        logger.error("Error saving file: %s", e)
         raise
 
 
+@traced("file_processor.process_and_store_file")
 async def process_and_store_file(
     file_content: bytes,
     filename: str,
@@ -162,43 +169,56 @@ async def process_and_store_file(
     3. Chunks the text appropriately
     4. Creates embeddings and stores in vector database
     """
+    file_extension = Path(filename).suffix.lower()
+    tenant = tenant_label(client_id)
+    stage_labels = {"file_type": file_extension, "tenant": tenant}
+
     try:
-        # Save file to storage
-        file_path = save_uploaded_file(file_content, filename, client_id)
-        
-        # Extract text based on file type
-        file_extension = Path(filename).suffix.lower()
-        extracted_text = extract_text_from_file(file_path, file_extension)
-        
-        if not extracted_text:
-            return {
-                "success": False,
-                "error": "No text could be extracted from file",
-                "extracted_text": "",
-                "chunks_stored": 0
-            }
-        
-        # Chunk the text for better retrieval
-        text_chunks = chunk_text(extracted_text)
-        
-        if not text_chunks:
-            return {
-                "success": False,
-                "error": "No text chunks created",
-                "extracted_text": extracted_text,
-                "chunks_stored": 0
-            }
-        
-        # Store chunks in vector database
-        chunks_stored = store_document_chunks(
-            client_id=client_id,
-            file_id=file_id,
-            filename=filename,
-            text_chunks=text_chunks,
-            sub_client_id=sub_client_id
-        )
-        
-        logger.info(f"Successfully processed file {filename}: {len(extracted_text)} chars, {chunks_stored} chunks")
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "total", **stage_labels):
+            INGEST_FILE_BYTES.observe(len(file_content), **stage_labels)
+
+            # Save file to storage
+            with time_stage(INGEST_STAGE_SECONDS, "ingest", "save", **stage_labels):
+                file_path = save_uploaded_file(file_content, filename, client_id)
+
+            # Extract text based on file type
+            with time_stage(INGEST_STAGE_SECONDS, "ingest", "extract", **stage_labels):
+                extracted_text = extract_text_from_file(file_path, file_extension)
+
+            if not extracted_text:
+                return {
+                    "success": False,
+                    "error": "No text could be extracted from file",
+                    "extracted_text": "",
+                    "chunks_stored": 0
+                }
+
+            INGEST_TEXT_CHARS.observe(len(extracted_text), **stage_labels)
+
+            # Chunk the text for better retrieval
+            with time_stage(INGEST_STAGE_SECONDS, "ingest", "chunk", **stage_labels):
+                text_chunks = chunk_text(extracted_text)
+
+            if not text_chunks:
+                return {
+                    "success": False,
+                    "error": "No text chunks created",
+                    "extracted_text": extracted_text,
+                    "chunks_stored": 0
+                }
+
+            # Store chunks in vector database (embedding and write stages are timed inside)
+            chunks_stored = store_document_chunks(
+                client_id=client_id,
+                file_id=file_id,
+                filename=filename,
+                text_chunks=text_chunks,
+                sub_client_id=sub_client_id,
+                file_type=file_extension
+            )
+            INGEST_CHUNKS.observe(chunks_stored, **stage_labels)
+
+        logger.info("Successfully processed file %s: %s chars, %s chunks", filename, len(extracted_text), chunks_stored)
         
         return {
             "success": True,
@@ -209,7 +229,7 @@ async def process_and_store_file(
         }
         
     except Exception as e:
-        logger.error(f"Error processing file {filename}: {e}")
+        logger.error("Error processing file %s: %s", filename, e)
         return {
             "success": False,
             "error": str(e),
@@ -0,0 +1,143 @@
+"""
+Generation cache for Lemur AI
+Persists deterministic chat-completion outputs in a local SQLite file so
+identical prompts (reprocessed meetings, retried requests) are answered
+without another model call
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.utils.config import get_settings
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Expired rows are purged once every this many writes
+PURGE_EVERY_WRITES = 500
+
+
+class GenerationCache:
+    """
+    SQLite-backed prompt/response cache with a TTL
+
+    Keys hash the model, the full message list (system prompt included) and
+    the sampling parameters, so any change to the prompt, context or
+    settings is a miss. Only temperature-0 calls are cached unless
+    `cache_sampled` is set: replaying one sample of a creative generation
+    for days would hide the variety callers ask for. Lookups run in a
+    worker thread to keep the event loop free; a failing cache never fails
+    a generation.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, enabled: bool = True, cache_sampled: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.cache_sampled = cache_sampled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """Stable hash of everything that determines the model output"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def cacheable(self, params: Dict[str, Any]) -> bool:
+        """Whether outputs of a call with these sampling parameters may be replayed"""
+        return self.enabled and (self.cache_sampled or params.get("temperature", 1.0) == 0)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS generations (
+                    key TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    content_type TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_expires ON generations (expires_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT content FROM generations WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, key: str, content: str, content_type: Optional[str]):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO generations (key, content, content_type, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, content_type, now, now + self.ttl_seconds)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                conn.execute("DELETE FROM generations WHERE expires_at <= ?", (now,))
+            conn.commit()
+
+    async def get(self, key: str, content_type: Optional[str] = None) -> Optional[str]:
+        """Cached content for `key`, or None on a miss, expiry or error"""
+        if not self.enabled:
+            return None
+        try:
+            content = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning("Generation cache lookup failed: %s", e)
+            return None
+        CACHE_LOOKUPS.inc(cache="generation", result="hit" if content is not None else "miss")
+        if content is not None:
+            logger.debug("Generation cache hit for %s", content_type or "generation")
+        return content
+
+    async def put(self, key: str, content: str, content_type: Optional[str] = None):
+        """Store `content` under `key` for the configured TTL"""
+        if not self.enabled or not content:
+            return
+        try:
+            await asyncio.to_thread(self._put, key, content, content_type)
+        except sqlite3.Error as e:
+            logger.warning("Generation cache write failed: %s", e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global generation cache instance
+generation_cache = GenerationCache(
+    path=settings.generation_cache_path,
+    ttl_seconds=settings.generation_cache_ttl_seconds,
+    enabled=settings.generation_cache_enabled,
+    cache_sampled=settings.generation_cache_sampled
+)
@@ -0,0 +1,271 @@
+"""
+Live meeting transcripts for Lemur AI
+Buffers the speaker turns Recall pushes while a bot is still recording,
+embedding them into the client's knowledge base as they accumulate and
+keeping rolling notes, so post-meeting processing only has to summarise
+the last few minutes
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.utils.config import get_settings
+from app.core.meeting_store import meeting_store, STAGE_RECORDING, STAGE_QUEUED
+from app.core.metrics import LIVE_TRANSCRIPT_EVENTS
+from app.core.tracing import create_traced_task
+from app.core.transcript import TranscriptSegment, estimate_tokens, render_segments
+from app.core.transcript_summarizer import transcript_summarizer
+from app.core.vector_store import delete_meeting_chunks, store_meeting_chunks
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+LIVE_CHUNK_SOURCE = "meeting_live"
+LIVE_STAGES = (STAGE_RECORDING, STAGE_QUEUED)  # live chunks are written until processing replaces them
+FINISHED_BOTS_KEPT = 1024  # late deliveries for these are dropped without a lookup
+
+
+def _segment_tokens(segment: TranscriptSegment) -> int:
+    return estimate_tokens(segment.speaker + segment.text) + 4
+
+
+def _running(task: Optional[asyncio.Task]) -> bool:
+    return task is not None and not task.done()
+
+
+def live_chunk_id(meeting_id: str, segments: List[TranscriptSegment], text: str) -> str:
+    """
+    Chunk ID from the turns it holds (first start time plus a content digest)
+
+    Deliveries for one bot may be spread over several processes, each
+    chunking the turns it received; IDs derived from the turns never
+    collide between them, and writing the same chunk again overwrites it.
+    """
+    start = segments[0].start
+    prefix = f"{int(round(start * 1000))}_" if start is not None else ""
+    return f"{meeting_id}_live_{prefix}{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+
+
+@dataclass
+class LiveMeeting:
+    """Transcript received so far for one recording meeting"""
+    meeting_id: str
+    client_id: str
+    sub_client_id: Optional[str]
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    indexed: int = 0         # segments embedded so far
+    pending_tokens: int = 0  # in segments not yet embedded
+    summarized: int = 0      # segments covered by notes
+    last_summary: float = field(default_factory=time.monotonic)
+    index_task: Optional[asyncio.Task] = None
+    summary_task: Optional[asyncio.Task] = None
+    watch_task: Optional[asyncio.Task] = None
+
+
+class LiveTranscripts:
+    """
+    Per-meeting buffers of real-time transcript segments
+
+    Each delivered turn is appended to its meeting's buffer. Once
+    `chunk_tokens` have accumulated they are embedded as one chunk of whole
+    turns into the client's collection, and every `summary_interval`
+    seconds the turns since the last refresh are condensed into notes.
+    Notes are appended to the meeting record, so the processing worker (in
+    whichever process it runs) condenses the downloaded transcript from
+    them instead of from scratch.
+
+    A bot's deliveries can land on any API process behind the webhook URL,
+    so each process buffers the turns it received: chunk IDs derive from
+    those turns and notes are appended atomically, so processes never
+    overwrite each other. A process flushes its buffer when it handles the
+    end of the meeting or, failing that, when it next checks the stored
+    stage (every `summary_interval`).
+    """
+
+    def __init__(self, chunk_tokens: int, summary_interval: float):
+        self.chunk_tokens = chunk_tokens
+        self.summary_interval = summary_interval
+        self._meetings: Dict[str, LiveMeeting] = {}  # by bot_id
+        self._finished: "OrderedDict[str, None]" = OrderedDict()  # bots whose buffer was flushed or dropped
+        self._finishing: set = set()
+
+    async def add_segment(self, bot_id: str, segment: TranscriptSegment) -> bool:
+        """Buffer a finished speaker turn; False if the bot's meeting is not recording"""
+        live = self._meetings.get(bot_id)
+        if live is None:
+            if bot_id in self._finished:
+                return False
+            meeting = await meeting_store.get_by_bot(bot_id)
+            if not meeting or meeting["stage"] != STAGE_RECORDING:
+                return False
+            if bot_id in self._finished:
+                return False  # finished while we were looking the meeting up
+            live = self._meetings.get(bot_id)
+            if live is None:
+                live = self._meetings[bot_id] = LiveMeeting(
+                    meeting_id=meeting["meeting_id"],
+                    client_id=meeting["client_id"],
+                    sub_client_id=meeting.get("sub_client_id")
+                )
+                live.watch_task = create_traced_task(self._watch(bot_id, live), "live_transcript.watch", open_span=False)
+
+        LIVE_TRANSCRIPT_EVENTS.inc(event="segment")
+        if not _running(live.index_task) and not _running(live.summary_task):
+            # Turns already embedded and summarised are not needed again (tasks hold indexes into the list)
+            done = min(live.indexed, live.summarized)
+            del live.segments[:done]
+            live.indexed -= done
+            live.summarized -= done
+        live.segments.append(segment)
+        live.pending_tokens += _segment_tokens(segment)
+
+        if live.pending_tokens >= self.chunk_tokens and not _running(live.index_task):
+            live.index_task = create_traced_task(self._index(live), "live_transcript.index")
+        if time.monotonic() - live.last_summary >= self.summary_interval and not _running(live.summary_task):
+            live.summary_task = create_traced_task(self._update_notes(live), "live_transcript.notes")
+        return True
+
+    def finish(self, bot_id: str):
+        """
+        Stop buffering a meeting that ended and embed what is left
+
+        Does not wait: notes still being written are saved if the meeting
+        has not been picked up for processing yet, and otherwise the worker
+        summarises those turns itself.
+        """
+        live = self._end(bot_id)
+        if live is None:
+            return
+        task = create_traced_task(self._flush(live), "live_transcript.flush")
+        self._finishing.add(task)
+        task.add_done_callback(self._finishing.discard)
+
+    def discard(self, bot_id: str):
+        """Drop a meeting's buffer (its recording failed)"""
+        live = self._end(bot_id)
+        if live is not None:
+            for task in (live.index_task, live.summary_task):
+                if task is not None:
+                    task.cancel()
+
+    def _end(self, bot_id: str) -> Optional[LiveMeeting]:
+        """Stop accepting turns for a bot; its buffer, if this process has one"""
+        self._finished[bot_id] = None
+        self._finished.move_to_end(bot_id)
+        while len(self._finished) > FINISHED_BOTS_KEPT:
+            self._finished.popitem(last=False)
+        live = self._meetings.pop(bot_id, None)
+        if live is not None and live.watch_task is not None and live.watch_task is not asyncio.current_task():
+            live.watch_task.cancel()
+        return live
+
+    async def stop(self):
+        """Cancel background work (shutdown); buffered turns are indexed from the download later"""
+        tasks = list(self._finishing)
+        for live in self._meetings.values():
+            tasks += [task for task in (live.index_task, live.summary_task, live.watch_task) if task is not None]
+        self._meetings.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _watch(self, bot_id: str, live: LiveMeeting):
+        """Flush the buffer once the meeting leaves recording (another process may have seen it end)"""
+        while True:
+            await asyncio.sleep(self.summary_interval)
+            try:
+                meeting = await meeting_store.get(live.meeting_id)
+            except Exception as e:
+                logger.error("❌ Error checking live meeting %s: %s", live.meeting_id, e)
+                continue
+            if self._meetings.get(bot_id) is not live:
+                return
+            if not meeting or meeting["stage"] != STAGE_RECORDING:
+                self.finish(bot_id)
+                return
+
+    async def _flush(self, live: LiveMeeting):
+        if _running(live.index_task):
+            await asyncio.gather(live.index_task, return_exceptions=True)
+        await self._index(live, final=True)
+
+    async def _index(self, live: LiveMeeting, final: bool = False):
+        """Embed buffered turns in chunks of about `chunk_tokens` (all of them when `final`)"""
+        while live.indexed < len(live.segments) and (final or live.pending_tokens >= self.chunk_tokens):
+            end, tokens = live.indexed, 0
+            while end < len(live.segments) and tokens < self.chunk_tokens:
+                tokens += _segment_tokens(live.segments[end])
+                end += 1
+            batch = live.segments[live.indexed:end]
+            text = render_segments(batch)
+            chunk = {
+                "id": live_chunk_id(live.meeting_id, batch, text),
+                "text": text,
+                "metadata": {
+                    "source": LIVE_CHUNK_SOURCE,
+                    "start": batch[0].start,
+                    "end": batch[-1].end,
+                    "speakers": ", ".join(sorted({s.speaker for s in batch}))
+                }
+            }
+            try:
+                meeting = await meeting_store.get(live.meeting_id)
+                if not meeting or meeting["stage"] not in LIVE_STAGES:
+                    break  # being processed: the downloaded transcript replaces the live chunks
+                await asyncio.to_thread(
+                    store_meeting_chunks, live.client_id, live.meeting_id, [chunk], live.sub_client_id
+                )
+                # Processing may have started, and replaced the live chunks, while this one was written
+                meeting = await meeting_store.get(live.meeting_id)
+                if not meeting or meeting["stage"] not in LIVE_STAGES:
+                    await asyncio.to_thread(
+                        delete_meeting_chunks, live.meeting_id, live.client_id, live.sub_client_id, [chunk["id"]]
+                    )
+                    break
+            except Exception as e:
+                LIVE_TRANSCRIPT_EVENTS.inc(event="chunk_failed")
+                logger.warning("Could not embed live transcript of meeting %s: %s", live.meeting_id, e)
+                break
+            LIVE_TRANSCRIPT_EVENTS.inc(event="chunk_stored")
+            live.indexed = end
+            live.pending_tokens -= tokens
+
+    async def _update_notes(self, live: LiveMeeting):
+        """Condense the turns received since the last refresh into notes"""
+        live.last_summary = time.monotonic()
+        end = len(live.segments)
+        batch = live.segments[live.summarized:end]
+        timed = [s.start for s in batch if s.start is not None]
+        if not timed:
+            # Notes are matched to the final transcript by time; untimed turns are summarised after the meeting
+            live.summarized = end
+            return
+
+        try:
+            text = await transcript_summarizer.summarize_segments(batch, client_id=live.client_id)
+        except Exception as e:
+            LIVE_TRANSCRIPT_EVENTS.inc(event="notes_failed")
+            logger.warning("Could not update live notes of meeting %s: %s", live.meeting_id, e)
+            return
+        finish = max(s.end if s.end is not None else s.start for s in batch if s.start is not None)
+        live.summarized = end
+        try:
+            # Still useful while the meeting waits in the queue; a worker already on it has its own copy
+            await meeting_store.append(live.meeting_id, "live_notes", [[min(timed), finish, text]], LIVE_STAGES)
+        except Exception as e:
+            logger.error("❌ Error saving live notes of meeting %s: %s", live.meeting_id, e)
+            return
+        LIVE_TRANSCRIPT_EVENTS.inc(event="notes_updated")
+        logger.info("📝 Live notes of meeting %s updated (%d turns)", live.meeting_id, len(batch))
+
+
+# Global live transcripts instance
+live_transcripts = LiveTranscripts(
+    chunk_tokens=settings.meeting_chunk_tokens,
+    summary_interval=settings.live_summary_interval_seconds
+)
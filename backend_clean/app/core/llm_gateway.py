@@ -0,0 +1,200 @@
+"""
+LLM gateway for Lemur AI
+One AsyncOpenAI client on a shared connection pool, with global and
+per-tenant concurrency limits, timeouts and jittered retries
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError
+
+from app.utils.config import get_settings
+from app.core.metrics import LLM_QUEUE_SECONDS, LLM_RETRIES, tenant_label
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMGateway:
+    """
+    Async chat-completion client shared by every generation path
+
+    Calls wait on a global semaphore (protects the worker and the upstream
+    rate limit) and a per-tenant semaphore (stops one client's batch from
+    starving everyone else). Slots are released while backing off, so a
+    throttled call never blocks others.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        max_connections: int = 200,
+        max_concurrency: int = 200,
+        max_concurrency_per_tenant: int = 20,
+        timeout: float = 120.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 20.0
+    ):
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout)
+        )
+        # Retries are handled here so they respect the concurrency slots
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=0
+        )
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_tenant = max_concurrency_per_tenant
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._tenant_slots: Dict[str, List[Any]] = {}  # tenant -> [semaphore, users]
+
+    @asynccontextmanager
+    async def slot(self, tenant: Optional[str] = None):
+        """Hold one global and one per-tenant concurrency slot"""
+        if self._global_slots is None:
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+        key = tenant or "none"
+        entry = self._tenant_slots.setdefault(key, [asyncio.Semaphore(self.max_concurrency_per_tenant), 0])
+        entry[1] += 1
+
+        start = time.perf_counter()
+        try:
+            async with entry[0]:
+                async with self._global_slots:
+                    LLM_QUEUE_SECONDS.observe(time.perf_counter() - start, tenant=tenant_label(tenant))
+                    yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._tenant_slots.pop(key, None)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than a Retry-After header"""
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.retry_max_delay))
+            except ValueError:
+                pass
+        return delay
+
+    @staticmethod
+    def _retry_reason(error: Exception) -> Optional[str]:
+        if isinstance(error, APIStatusError):
+            return str(error.status_code) if error.status_code in RETRYABLE_STATUS_CODES else None
+        if isinstance(error, APIConnectionError):
+            return type(error).__name__
+        return None
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        tenant: Optional[str] = None,
+        **params
+    ):
+        """
+        Create a chat completion, retrying 429/5xx and connection errors
+
+        Extra keyword arguments go straight to chat.completions.create.
+        """
+        model = model or settings.openai_model
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.slot(tenant):
+                    return await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        **params
+                    )
+            except (APIStatusError, APIConnectionError) as e:
+                reason = self._retry_reason(e)
+                if reason is None or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e)
+                LLM_RETRIES.inc(reason=reason)
+                logger.warning(
+                    "LLM call failed (%s), retry %d/%d in %.2fs",
+                    reason, attempt + 1, self.max_retries, delay
+                )
+                await asyncio.sleep(delay)
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        tenant: Optional[str] = None,
+        **params
+    ) -> AsyncIterator[Any]:
+        """
+        Stream chat-completion chunks, holding the concurrency slots until the end
+
+        Failures are retried only before the first chunk; once tokens have been
+        handed to the caller the error propagates. The last chunk carries usage.
+        """
+        model = model or settings.openai_model
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                async with self.slot(tenant):
+                    stream = await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        **params
+                    )
+                    async with stream:
+                        async for chunk in stream:
+                            started = True
+                            yield chunk
+                return
+            except (APIStatusError, APIConnectionError) as e:
+                reason = self._retry_reason(e)
+                if started or reason is None or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e)
+                LLM_RETRIES.inc(reason=reason)
+                logger.warning(
+                    "LLM stream failed (%s), retry %d/%d in %.2fs",
+                    reason, attempt + 1, self.max_retries, delay
+                )
+                await asyncio.sleep(delay)
+
+    async def aclose(self):
+        """Close the shared connection pool"""
+        await self._http_client.aclose()
+
+
+# Global LLM gateway instance
+llm_gateway = LLMGateway(
+    api_key=settings.openai_api_key,
+    base_url=settings.openai_base_url,
+    max_connections=settings.llm_max_connections,
+    max_concurrency=settings.llm_max_concurrency,
+    max_concurrency_per_tenant=settings.llm_max_concurrency_per_tenant,
+    timeout=settings.llm_timeout_seconds,
+    connect_timeout=settings.llm_connect_timeout_seconds,
+    max_retries=settings.llm_max_retries,
+    retry_base_delay=settings.llm_retry_base_delay,
+    retry_max_delay=settings.llm_retry_max_delay
+)
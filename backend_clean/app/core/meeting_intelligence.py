@@ -5,18 +5,42 @@ Handles end-to-end meeting processing with contextual AI generation
 
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import uuid
+from typing import Dict, Any, Optional, List, Set
 from datetime import datetime
-from app.core.recall_service import recall_service
-from app.core.ai_service import generate_content, generate_email, generate_summary, generate_action_items
-from app.core.vector_store import search_knowledge_base
+from app.core.recall_service import recall_service, DONE_STATUSES, FAILED_STATUSES
+from app.core.bot_poller import bot_poller
+from app.core.meeting_store import (
+    meeting_store, STAGE_RECORDING, STAGE_QUEUED, STAGE_PROCESSING, STAGE_PROCESSED, STAGE_FAILED, STAGE_DEAD_LETTER
+)
+from app.core.meeting_queue import meeting_queue, PRIORITY_MANUAL
+from app.core.live_transcripts import live_transcripts
+from app.core.ai_service import (
+    generate_content, generate_email, generate_summary, generate_action_items, retrieve_context,
+    extract_meeting_insights, render_action_items, transcript_token_budget
+)
+from app.core.transcript import TranscriptSegment, parse_transcript
+from app.core.transcript_fetcher import transcript_fetcher
+from app.core.transcript_summarizer import transcript_summarizer, split_into_windows
+from app.core.vector_store import store_meeting_chunks
 from app.core.database import db_manager
 from app.models.output import Output
+from app.core.metrics import MEETING_STATUS_UPDATES
+from app.core.tracing import traced
 from app.utils.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+TRANSCRIPT_CHUNK_SOURCE = "meeting_transcript"
+# Outputs a meeting must have stored to count as processed (the follow-up email needs attendees)
+REQUIRED_MEETING_OUTPUTS = ("summary", "action_items")
+
+
+def meeting_output_id(meeting_id: str, content_type: str) -> str:
+    """Deterministic output ID, so a meeting processed again overwrites its outputs instead of duplicating"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"lemur:meeting:{meeting_id}:{content_type}"))
+
 
 class MeetingIntelligenceService:
     """
@@ -29,9 +53,11 @@ class MeetingIntelligenceService:
     """
     
     def __init__(self):
-        self.active_meetings: Dict[str, Dict] = {}  # meeting_id -> meeting_data
-        self.processing_queue: List[str] = []  # Queue of meetings to process
+        # Meeting state lives in meeting_store so it survives restarts and is shared by workers
+        bot_poller.subscribe(self._on_polled_status)
+        meeting_queue.set_handler(self._process_completed_meeting)
     
+    @traced("meeting.start_recording")
     async def start_meeting_recording(
         self,
         meeting_url: str,
@@ -40,7 +66,8 @@ class MeetingIntelligenceService:
         sub_client_id: Optional[str] = None,
         user_id: str = None,
         attendees: List[str] = None,
-        meeting_title: str = "Meeting"
+        meeting_title: str = "Meeting",
+        expected_end: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Start recording a meeting with bot
@@ -53,15 +80,16 @@ class MeetingIntelligenceService:
             user_id: User who initiated the recording
             attendees: List of attendee emails
             meeting_title: Title of the meeting
+            expected_end: When the meeting is scheduled to end (polls faster near it)
             
         Returns:
             Dict with bot_id, status, and meeting info
         """
         try:
-            logger.info(f"🎬 Starting meeting recording for: {meeting_title}")
+            logger.info("🎬 Starting meeting recording for: %s", meeting_title)
             
             # Create bot with Recall AI
-            bot_result = recall_service.create_bot(
+            bot_result = await recall_service.create_bot(
                 meeting_url=meeting_url,
                 bot_name=f"Lemur AI - {meeting_title}"
             )
@@ -82,16 +110,17 @@ class MeetingIntelligenceService:
                 "attendees": attendees or [],
                 "meeting_title": meeting_title,
                 "status": "recording",
+                "stage": STAGE_RECORDING,
                 "started_at": datetime.now(),
-                "processed": False
+                "expected_end": expected_end
             }
             
-            self.active_meetings[meeting_id] = meeting_data
+            await meeting_store.save(meeting_data)
             
-            # Start monitoring in background
-            asyncio.create_task(self._monitor_meeting_completion(meeting_id))
+            # Webhooks drive the state machine; the shared poller reconciles missed deliveries
+            bot_poller.track(bot_id, expected_end=expected_end)
             
-            logger.info(f"✅ Bot {bot_id} created and monitoring started for meeting {meeting_id}")
+            logger.info("✅ Bot %s created and monitoring started for meeting %s", bot_id, meeting_id)
             
             return {
                 "success": True,
@@ -102,153 +131,212 @@ class MeetingIntelligenceService:
             }
             
         except Exception as e:
-            logger.error(f"❌ Error starting meeting recording: {e}")
+            logger.error("❌ Error starting meeting recording: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    async def _monitor_meeting_completion(self, meeting_id: str):
-        """Monitor meeting for completion and trigger processing"""
-        try:
-            meeting_data = self.active_meetings.get(meeting_id)
-            if not meeting_data:
-                return
-            
-            bot_id = meeting_data["bot_id"]
-            logger.info(f"🔍 Monitoring meeting {meeting_id} with bot {bot_id}")
-            
-            # Poll for completion (check every 30 seconds)
-            while True:
-                await asyncio.sleep(30)
-                
-                # Check bot status
-                status_result = recall_service.get_bot_status(bot_id)
-                
-                if status_result["success"]:
-                    status = status_result["status"]
-                    meeting_data["status"] = status
-                    
-                    logger.info(f"📊 Meeting {meeting_id} status: {status}")
-                    
-                    # Check if meeting is completed
-                    if status in ["done", "completed", "finished"]:
-                        logger.info(f"✅ Meeting {meeting_id} completed, starting AI processing")
-                        
-                        # Add to processing queue
-                        self.processing_queue.append(meeting_id)
-                        
-                        # Start AI processing
-                        asyncio.create_task(self._process_completed_meeting(meeting_id))
-                        break
-                        
-                    elif status in ["failed", "error"]:
-                        logger.error(f"❌ Meeting {meeting_id} recording failed")
-                        meeting_data["status"] = "failed"
-                        break
-                
-        except Exception as e:
-            logger.error(f"❌ Error monitoring meeting {meeting_id}: {e}")
+    async def handle_bot_status(self, bot_id: str, status: str, source: str = "webhook") -> bool:
+        """
+        Advance a meeting's state machine from a Recall bot status
+
+        Fed by the webhook receiver and by the reconciliation poll. Processing
+        starts exactly once; duplicate, late or out-of-order updates after a
+        meeting has settled are ignored. Returns False if no active meeting
+        uses the bot.
+        """
+        meeting_data = await meeting_store.get_by_bot(bot_id)
+        if not meeting_data:
+            return False
+
+        if source != "poll":
+            bot_poller.observe(bot_id, status)
+        meeting_id = meeting_data["meeting_id"]
+        if meeting_data["stage"] != STAGE_RECORDING:
+            return True
+
+        MEETING_STATUS_UPDATES.inc(source=source, status=status)
+        logger.info(
+            "📊 Meeting %s status: %s (%s)", meeting_id, status, source,
+            extra={"event": "meeting.status", "sample": True}
+        )
+
+        # Conditional stage transitions: only one process (or delivery) moves a meeting on
+        if status in DONE_STATUSES:
+            live_transcripts.finish(bot_id)
+            if await meeting_queue.enqueue(
+                meeting_id, [STAGE_RECORDING], meeting_queue.priority_for(meeting_data.get("client_id")),
+                status=status, completed_at=datetime.now()
+            ):
+                logger.info("✅ Meeting %s completed, queued for AI processing", meeting_id)
+        elif status in FAILED_STATUSES:
+            live_transcripts.discard(bot_id)
+            if await meeting_store.transition(meeting_id, [STAGE_RECORDING], STAGE_FAILED, status="failed"):
+                logger.error("❌ Meeting %s recording failed", meeting_id)
+        elif status != meeting_data["status"]:
+            await meeting_store.transition(meeting_id, [STAGE_RECORDING], STAGE_RECORDING, status=status)
+        return True
+
+    async def _on_polled_status(self, bot_id: str, status: str):
+        await self.handle_bot_status(bot_id, status, source="poll")
     
-    async def _process_completed_meeting(self, meeting_id: str):
-        """Process completed meeting with AI"""
+    async def recover(self) -> Dict[str, int]:
+        """
+        Resume meetings left unfinished by a restart
+
+        Bots still recording and not yet polled here are tracked by the
+        poller again (its first poll catches up on anything that happened
+        while nobody was watching). Queued meetings need nothing, and
+        meetings whose worker died are claimed again once its lease expires.
+        Safe to call repeatedly.
+        """
+        resumed = {"recording": 0, "queued": 0, "processing": 0}
+        tracked = set(bot_poller.tracked())
+        for meeting in await meeting_store.list(
+            stages=[STAGE_RECORDING, STAGE_QUEUED, STAGE_PROCESSING], limit=None
+        ):
+            stage = meeting["stage"]
+            if stage != STAGE_RECORDING:
+                resumed[stage] += 1
+            elif meeting.get("bot_id") and meeting["bot_id"] not in tracked:
+                bot_poller.track(meeting["bot_id"], expected_end=meeting.get("expected_end"))
+                resumed["recording"] += 1
+
+        if any(resumed.values()):
+            logger.info(
+                "♻️ Resumed meetings: %d recording, %d queued, %d in processing",
+                resumed["recording"], resumed["queued"], resumed["processing"]
+            )
+        return resumed
+
+    async def reprocess_meeting(self, meeting_id: str, bypass_cache: bool = False) -> Optional[Dict]:
+        """
+        Queue a meeting for processing ahead of automatic work
+
+        Works for processed, failed and dead-lettered meetings and bumps one
+        already waiting in the queue; returns None if the meeting is unknown,
+        still recording or being processed right now.
+        """
+        return await meeting_queue.enqueue(
+            meeting_id,
+            [STAGE_PROCESSED, STAGE_FAILED, STAGE_DEAD_LETTER, STAGE_QUEUED],
+            PRIORITY_MANUAL,
+            bypass_cache=bypass_cache
+        )
+
+    async def _process_completed_meeting(self, meeting_data: Dict[str, Any]) -> bool:
+        """Queue handler: process a completed meeting with AI (bypass_cache forces fresh generations)"""
+        succeeded = False
         try:
-            meeting_data = self.active_meetings.get(meeting_id)
-            if not meeting_data:
-                return
-            
-            bot_id = meeting_data["bot_id"]
-            client_id = meeting_data["client_id"]
-            sub_client_id = meeting_data.get("sub_client_id")
-            user_id = meeting_data["user_id"]
-            meeting_title = meeting_data["meeting_title"]
-            
-            logger.info(f"🧠 Processing completed meeting: {meeting_title}")
-            
-            # Get download URLs
-            logger.info(f"📥 Getting download URLs for bot {bot_id}")
-            download_result = recall_service.get_download_urls(bot_id)
+            succeeded = await self._run_meeting_pipeline(meeting_data, bool(meeting_data.get("bypass_cache")))
+            return succeeded
+        finally:
+            if not succeeded:
+                # The retry must see Recall's current view of the bot, not the data that just failed
+                recall_service.invalidate(meeting_data["bot_id"])
 
-            logger.info(f"📥 Download result: {download_result}")
+    async def _run_meeting_pipeline(self, meeting_data: Dict[str, Any], bypass_cache: bool) -> bool:
+        """Download the transcript, generate and store outputs; False if the meeting can't be processed"""
+        meeting_id = meeting_data["meeting_id"]
+        bot_id = meeting_data["bot_id"]
+        client_id = meeting_data["client_id"]
+        sub_client_id = meeting_data.get("sub_client_id")
+        user_id = meeting_data["user_id"]
+        meeting_title = meeting_data["meeting_title"]
+        
+        logger.info("🧠 Processing completed meeting: %s", meeting_title)
+        
+        # Get download URLs
+        logger.info("📥 Getting download URLs for bot %s", bot_id)
+        download_result = await recall_service.get_download_urls(bot_id)
 
-            if not download_result["success"]:
-                logger.error(f"❌ Failed to get download URLs for meeting {meeting_id}: {download_result}")
-                return
+        logger.debug(
+            "📥 Download result for bot %s: status=%s", bot_id, download_result.get("status"),
+            extra={"event": "meeting.download_result", "payload": download_result}
+        )
 
-            transcript_url = download_result.get("transcript_url")
-            video_url = download_result.get("video_url")
-            audio_url = download_result.get("audio_url")
+        if not download_result["success"]:
+            logger.error(
+                "❌ Failed to get download URLs for meeting %s: %s", meeting_id, download_result.get("error"),
+                extra={"event": "meeting.download_failed", "payload": download_result}
+            )
+            return False
 
-            logger.info(f"📥 URLs - Video: {video_url}, Transcript: {transcript_url}")
+        transcript_url = download_result.get("transcript_url")
+        video_url = download_result.get("video_url")
+        audio_url = download_result.get("audio_url")
 
-            # Download and process transcript
-            if transcript_url:
-                logger.info(f"📥 Downloading transcript from: {transcript_url}")
-                transcript_text = await self._download_transcript(transcript_url)
+        logger.debug("📥 URLs - Video: %s, Transcript: %s", video_url, transcript_url)
 
-                if transcript_text:
-                    logger.info(f"✅ Transcript downloaded successfully, length: {len(transcript_text)} characters")
-                else:
-                    logger.error(f"❌ Failed to download transcript from URL")
-                    return
+        # Download the transcript as speaker segments (parsed while it streams in)
+        if transcript_url:
+            logger.debug("📥 Downloading transcript from: %s", transcript_url)
+            transcript = await transcript_fetcher.fetch(transcript_url)
+
+            if transcript:
+                logger.info("✅ Transcript downloaded successfully, %s segments", len(transcript))
             else:
-                logger.error(f"❌ No transcript URL available for meeting {meeting_id}")
-                # Try to get transcript content directly from bot data
-                bot_data = download_result.get("data", {})
-                transcript_text = self._extract_transcript_from_bot_data(bot_data)
+                logger.error("❌ Failed to download transcript from URL")
+                return False
+        else:
+            logger.error("❌ No transcript URL available for meeting %s", meeting_id)
+            # Try to get transcript content directly from bot data
+            bot_data = download_result.get("data", {})
+            transcript_text = self._extract_transcript_from_bot_data(bot_data)
+            transcript = parse_transcript(transcript_text) if transcript_text else []
 
-                if transcript_text:
-                    logger.info(f"✅ Extracted transcript from bot data, length: {len(transcript_text)} characters")
-                else:
-                    logger.error(f"❌ No transcript available for meeting {meeting_id}")
-                    return
-            
-            # Get client context from knowledge base
-            client_context = await self._get_client_context(client_id, sub_client_id, meeting_title)
-            
-            # Generate AI content with context
+            if transcript:
+                logger.info("✅ Extracted transcript from bot data, %s segments", len(transcript))
+            else:
+                logger.error("❌ No transcript available for meeting %s", meeting_id)
+                return False
+        
+        # Embedding the transcript into the knowledge base overlaps with generation
+        indexing = (
+            asyncio.create_task(self._index_transcript(meeting_data, transcript))
+            if settings.index_meeting_transcripts else None
+        )
+        generated = False
+        try:
+            # Search the client's knowledge base once; every generation shares it
+            context_results = await self._get_client_context(client_id, sub_client_id, meeting_title, meeting_id)
+
+            # Generate AI content with context (each output is stored as soon as it is ready)
             ai_results = await self._generate_meeting_ai_content(
-                transcript_text=transcript_text,
-                client_context=client_context,
-                meeting_data=meeting_data
+                transcript=transcript,
+                context_results=context_results,
+                meeting_data=meeting_data,
+                bypass_cache=bypass_cache
             )
-            
-            # Store everything in database
-            await self._store_meeting_results(
+
+            # Store anything that was not stored during generation
+            stored = await self._store_meeting_results(
                 meeting_data=meeting_data,
-                transcript_text=transcript_text,
+                transcript=transcript,
                 video_url=video_url,
                 audio_url=audio_url,
                 ai_results=ai_results
             )
-            
-            # Mark as processed
-            meeting_data["processed"] = True
-            meeting_data["processed_at"] = datetime.now()
-            
-            logger.info(f"✅ Meeting {meeting_id} fully processed and stored")
-            
-        except Exception as e:
-            logger.error(f"❌ Error processing meeting {meeting_id}: {e}")
-    
-    async def _download_transcript(self, transcript_url: str) -> Optional[str]:
-        """Download transcript from URL"""
-        try:
-            import aiohttp
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(transcript_url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        return content
-                    else:
-                        logger.error(f"Failed to download transcript: {response.status}")
-                        return None
-                        
-        except Exception as e:
-            logger.error(f"Error downloading transcript: {e}")
-            return None
+            generated = True
+        finally:
+            if indexing is not None:
+                if not generated:
+                    # The attempt failed or lost its lease: don't leave indexing running past it
+                    indexing.cancel()
+                await asyncio.gather(indexing, return_exceptions=True)
 
+        # The queue retries the meeting (and dead-letters it eventually) unless
+        # the outputs every meeting gets were generated and stored
+        missing = [content_type for content_type in REQUIRED_MEETING_OUTPUTS if content_type not in stored]
+        if missing:
+            logger.error(
+                "❌ Meeting %s is missing %s: %s", meeting_id, ", ".join(missing),
+                ai_results.get("error", "generation or storage failed")
+            )
+            return False
+        return True
+    
     def _extract_transcript_from_bot_data(self, bot_data: Dict) -> Optional[str]:
         """Extract transcript text directly from bot data"""
         try:
@@ -281,172 +369,302 @@ class MeetingIntelligenceService:
             return None
 
         except Exception as e:
-            logger.error(f"Error extracting transcript from bot data: {e}")
+            logger.error("Error extracting transcript from bot data: %s", e)
             return None
 
+    @traced("meeting.get_client_context")
     async def _get_client_context(
         self, 
         client_id: str, 
         sub_client_id: Optional[str], 
-        meeting_title: str
-    ) -> str:
-        """Get relevant client context from knowledge base"""
+        meeting_title: str,
+        meeting_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get relevant client documents from the knowledge base (not the meeting's own transcript)"""
         try:
-            # Search for relevant documents in client's knowledge base
             search_query = f"meeting {meeting_title} project context background"
-            
-            search_results = search_knowledge_base(
-                query=search_query,
-                client_id=client_id,
-                sub_client_id=sub_client_id,
-                n_results=5
+            results = await retrieve_context(search_query, client_id, sub_client_id, n_results=10)
+            return [
+                result for result in results
+                if meeting_id is None or (result.get("metadata") or {}).get("meeting_id") != meeting_id
+            ][:5]
+        except Exception as e:
+            logger.error("Error getting client context: %s", e)
+            return []
+
+    @traced("meeting.index_transcript")
+    async def _index_transcript(self, meeting_data: Dict[str, Any], transcript: List[TranscriptSegment]) -> int:
+        """
+        Store the transcript in the client's knowledge base as speaker-turn chunks
+
+        Chunks carry the meeting's ID, date and attendees and have IDs derived
+        from the meeting, so processing it again overwrites them, and chunks
+        embedded while it was live are replaced. Returns the chunks stored.
+        """
+        meeting_id = meeting_data["meeting_id"]
+        started_at = meeting_data.get("started_at")
+        meeting_metadata = {
+            "source": TRANSCRIPT_CHUNK_SOURCE,
+            "meeting_title": meeting_data.get("meeting_title"),
+            "date": started_at.date().isoformat() if isinstance(started_at, datetime) else None,
+            "attendees": ", ".join(meeting_data.get("attendees") or []) or None
+        }
+        chunks = []
+        for i, window in enumerate(split_into_windows(
+            transcript, settings.meeting_chunk_tokens, settings.transcript_window_seconds
+        )):
+            chunks.append({
+                "id": f"{meeting_id}_transcript_{i}",
+                "text": window.render(),
+                "metadata": {
+                    **meeting_metadata,
+                    "chunk_index": i,
+                    "start": window.start,
+                    "end": window.end,
+                    "speakers": ", ".join(sorted({s.speaker for s in window.segments}))
+                }
+            })
+        if not chunks:
+            return 0
+
+        try:
+            stored = await asyncio.to_thread(
+                store_meeting_chunks, meeting_data["client_id"], meeting_id, chunks,
+                meeting_data.get("sub_client_id"), replace=True
             )
-            
-            if search_results:
-                context_parts = []
-                for result in search_results:
-                    context_parts.append(f"Document: {result.get('filename', 'Unknown')}")
-                    context_parts.append(f"Content: {result.get('content', '')[:500]}...")
-                    context_parts.append("---")
-                
-                return "\n".join(context_parts)
-            else:
-                return "No specific client context found in knowledge base."
-                
         except Exception as e:
-            logger.error(f"Error getting client context: {e}")
-            return "Error retrieving client context."
-    
+            # The outputs don't depend on it; a reprocess indexes the transcript again
+            logger.error("❌ Error indexing transcript of meeting %s: %s", meeting_id, e)
+            return 0
+        logger.info("📚 Indexed meeting %s transcript into the knowledge base (%d chunks)", meeting_id, stored)
+        return stored
+
+    @traced("meeting.generate_ai_content")
     async def _generate_meeting_ai_content(
         self,
-        transcript_text: str,
-        client_context: str,
-        meeting_data: Dict
+        transcript: List[TranscriptSegment],
+        context_results: List[Dict[str, Any]],
+        meeting_data: Dict,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
-        """Generate AI content for the meeting"""
+        """
+        Generate summary, action items and follow-up email
+
+        By default one structured call produces all three; if it fails or its
+        JSON does not validate, the per-type prompts run concurrently over the
+        same knowledge-base results, each output stored as soon as it is ready.
+        """
         try:
             client_id = meeting_data["client_id"]
             sub_client_id = meeting_data.get("sub_client_id")
             meeting_title = meeting_data["meeting_title"]
             attendees = meeting_data.get("attendees", [])
-            
-            # Prepare context for AI
-            full_context = f"""
-            Meeting: {meeting_title}
-            Attendees: {', '.join(attendees)}
-            
-            Client Context:
-            {client_context}
-            
-            Meeting Transcript:
-            {transcript_text}
-            """
-            
-            # Generate different types of content
-            results = {}
-            
-            # 1. Meeting Summary
-            summary_result = await generate_summary(
-                prompt=f"Create a comprehensive meeting summary based on this transcript and client context: {full_context}",
-                client_id=client_id,
-                sub_client_id=sub_client_id
-            )
-            results["summary"] = summary_result
-            
-            # 2. Action Items
-            action_items_result = await generate_action_items(
-                prompt=f"Extract and create detailed action items from this meeting, considering the client context: {full_context}",
+
+            header = f"Meeting: {meeting_title}\nAttendees: {', '.join(attendees)}"
+
+            # Long meetings are summarised window by window until the transcript
+            # fits what the prompt budget leaves after instructions and context;
+            # stretches already summarised while the meeting was live are reused
+            transcript_text = await transcript_summarizer.condense(
+                transcript,
                 client_id=client_id,
-                sub_client_id=sub_client_id
+                bypass_cache=bypass_cache,
+                max_tokens=transcript_token_budget(header),
+                notes=None if bypass_cache else meeting_data.get("live_notes")
             )
-            results["action_items"] = action_items_result
+
+            # Knowledge-base context is packed into each prompt from context_results
+            full_context = f"{header}\n\nMeeting Transcript:\n{transcript_text}"
+
+            if settings.meeting_structured_extraction:
+                results = await self._extract_meeting_outputs(
+                    full_context, context_results, meeting_data, bypass_cache
+                )
+                if results is not None:
+                    return results
+                logger.warning(
+                    "⚠️  Structured extraction failed for meeting %s, using per-type prompts",
+                    meeting_data["meeting_id"]
+                )
             
-            # 3. Follow-up Email
+            generations = {
+                "summary": generate_summary(
+                    prompt=f"Create a comprehensive meeting summary based on this transcript and client context: {full_context}",
+                    client_id=client_id,
+                    sub_client_id=sub_client_id,
+                    context_results=context_results,
+                    bypass_cache=bypass_cache
+                ),
+                "action_items": generate_action_items(
+                    prompt=f"Extract and create detailed action items from this meeting, considering the client context: {full_context}",
+                    client_id=client_id,
+                    sub_client_id=sub_client_id,
+                    context_results=context_results,
+                    bypass_cache=bypass_cache
+                )
+            }
             if attendees:
-                email_result = await generate_email(
+                generations["follow_up_email"] = generate_email(
                     prompt=f"Create a professional follow-up email for meeting attendees summarizing key points and next steps: {full_context}",
                     client_id=client_id,
                     sub_client_id=sub_client_id,
-                    recipient_name=attendees[0] if attendees else None
+                    recipient_name=attendees[0] if attendees else None,
+                    context_results=context_results,
+                    bypass_cache=bypass_cache
                 )
-                results["follow_up_email"] = email_result
-            
+
+            async def generate_and_store(content_type: str, generation) -> Dict[str, Any]:
+                result = await generation
+                if result.get("success"):
+                    result["stored"] = await self._store_output(meeting_data, content_type, result)
+                else:
+                    logger.error("❌ Failed to generate %s: %s", content_type, result.get("error"))
+                return result
+
+            outcomes = await asyncio.gather(
+                *(generate_and_store(content_type, generation) for content_type, generation in generations.items()),
+                return_exceptions=True
+            )
+
+            results = {}
+            for content_type, outcome in zip(generations, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error("❌ Error generating %s: %s", content_type, outcome)
+                    outcome = {"success": False, "error": str(outcome)}
+                results[content_type] = outcome
             return results
             
         except Exception as e:
-            logger.error(f"Error generating AI content: {e}")
+            logger.error("Error generating AI content: %s", e)
             return {"error": str(e)}
     
+    async def _extract_meeting_outputs(
+        self,
+        full_context: str,
+        context_results: List[Dict[str, Any]],
+        meeting_data: Dict,
+        bypass_cache: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Single-pass structured extraction; None when the caller should fall back"""
+        attendees = meeting_data.get("attendees", [])
+        extraction_result = await extract_meeting_insights(
+            meeting_context=full_context,
+            client_id=meeting_data["client_id"],
+            sub_client_id=meeting_data.get("sub_client_id"),
+            context_results=context_results,
+            recipient_name=attendees[0] if attendees else None,
+            bypass_cache=bypass_cache
+        )
+        if not extraction_result["success"]:
+            return None
+
+        extraction = extraction_result["extraction"]
+        contents = {
+            "summary": extraction.summary,
+            "action_items": render_action_items(extraction.action_items)
+        }
+        if attendees:
+            contents["follow_up_email"] = extraction.follow_up_email
+
+        results = {
+            content_type: {
+                "success": True,
+                "content": content,
+                "context_used": extraction_result.get("context_used", ""),
+                "tokens_used": extraction_result.get("tokens_used", 0),
+                "structured": True
+            }
+            for content_type, content in contents.items()
+        }
+        results["action_items"]["items"] = [item.model_dump() for item in extraction.action_items]
+
+        stored = await asyncio.gather(
+            *(self._store_output(meeting_data, content_type, result) for content_type, result in results.items())
+        )
+        for result, was_stored in zip(results.values(), stored):
+            result["stored"] = was_stored
+        return results
+
+    async def _store_output(self, meeting_data: Dict, content_type: str, result: Dict[str, Any]) -> bool:
+        """Store one AI-generated meeting output, falling back to a direct insert"""
+        client_id = meeting_data["client_id"]
+        sub_client_id = meeting_data.get("sub_client_id")
+        user_id = meeting_data["user_id"]
+        meeting_title = meeting_data["meeting_title"]
+
+        # Create proper title and prompt for each content type
+        titles = {
+            "summary": f"Meeting Summary - {meeting_title}",
+            "action_items": f"Action Items - {meeting_title}",
+            "follow_up_email": f"Follow-up Email - {meeting_title}"
+        }
+
+        prompts = {
+            "summary": f"Create a comprehensive meeting summary for: {meeting_title}",
+            "action_items": f"Extract action items from meeting: {meeting_title}",
+            "follow_up_email": f"Generate follow-up email for meeting: {meeting_title}"
+        }
+
+        try:
+            output = Output(
+                id=meeting_output_id(meeting_data["meeting_id"], content_type),
+                title=titles.get(content_type, f"{content_type.title()} - {meeting_title}"),
+                content=result.get("content", ""),
+                output_type=content_type,
+                prompt=prompts.get(content_type, f"Generate {content_type} for meeting"),
+                client_id=client_id,
+                sub_client_id=sub_client_id,
+                user_id=user_id,
+                meeting_id=meeting_data["meeting_id"],
+                context_used=f"Meeting transcript and client knowledge base for {meeting_title}",
+                created_at=datetime.now(),
+                updated_at=datetime.now()
+            )
+            if await db_manager.create_output(output, upsert=True):
+                logger.info("✅ Stored %s output successfully", content_type)
+                return True
+            logger.error("❌ Failed to store %s, trying direct insert", content_type)
+        except Exception as storage_error:
+            logger.error("❌ Failed to store %s: %s", content_type, storage_error)
+
+        # Try alternative storage method - direct database insert
+        stored = await self._store_output_direct(
+            content_type=content_type,
+            content=result.get("content", ""),
+            meeting_data=meeting_data,
+            user_id=user_id,
+            client_id=client_id,
+            sub_client_id=sub_client_id
+        )
+        if stored:
+            logger.info("✅ Stored %s using direct method", content_type)
+        else:
+            logger.error("❌ Direct storage also failed for %s", content_type)
+        return stored
+
+    @traced("meeting.store_results")
     async def _store_meeting_results(
         self,
         meeting_data: Dict,
-        transcript_text: str,
+        transcript: List[TranscriptSegment],
         video_url: Optional[str],
         audio_url: Optional[str],
         ai_results: Dict[str, Any]
-    ):
-        """Store all meeting results in database"""
+    ) -> Set[str]:
+        """Store all meeting results in database (outputs not already stored); returns the stored types"""
+        stored = set()
         try:
-            client_id = meeting_data["client_id"]
-            sub_client_id = meeting_data.get("sub_client_id")
-            user_id = meeting_data["user_id"]
-            meeting_title = meeting_data["meeting_title"]
-            
-            # Store each AI-generated output
             for content_type, result in ai_results.items():
-                if result and result.get("success"):
-                    # Create proper title and prompt for each content type
-                    titles = {
-                        "summary": f"Meeting Summary - {meeting_title}",
-                        "action_items": f"Action Items - {meeting_title}",
-                        "follow_up_email": f"Follow-up Email - {meeting_title}"
-                    }
-
-                    prompts = {
-                        "summary": f"Create a comprehensive meeting summary for: {meeting_title}",
-                        "action_items": f"Extract action items from meeting: {meeting_title}",
-                        "follow_up_email": f"Generate follow-up email for meeting: {meeting_title}"
-                    }
-
-                    output = Output(
-                        title=titles.get(content_type, f"{content_type.title()} - {meeting_title}"),
-                        content=result.get("content", ""),
-                        output_type=content_type,
-                        prompt=prompts.get(content_type, f"Generate {content_type} for meeting"),
-                        client_id=client_id,
-                        sub_client_id=sub_client_id,
-                        user_id=user_id,
-                        meeting_id=meeting_data["meeting_id"],
-                        context_used=f"Meeting transcript and client knowledge base for {meeting_title}",
-                        created_at=datetime.now(),
-                        updated_at=datetime.now()
-                    )
-                    
-                    # Try to store the output
-                    try:
-                        await db_manager.create_output(output)
-                        logger.info(f"✅ Stored {content_type} output successfully")
-                    except Exception as storage_error:
-                        logger.error(f"❌ Failed to store {content_type}: {storage_error}")
-
-                        # Try alternative storage method - direct database insert
-                        try:
-                            await self._store_output_direct(
-                                content_type=content_type,
-                                content=result.get("content", ""),
-                                meeting_data=meeting_data,
-                                user_id=user_id,
-                                client_id=client_id,
-                                sub_client_id=sub_client_id
-                            )
-                            logger.info(f"✅ Stored {content_type} using direct method")
-                        except Exception as direct_error:
-                            logger.error(f"❌ Direct storage also failed for {content_type}: {direct_error}")
+                if not isinstance(result, dict) or not result.get("success"):
+                    continue
+                if result.get("stored") or await self._store_output(meeting_data, content_type, result):
+                    stored.add(content_type)
             
-            logger.info(f"✅ Stored {len(ai_results)} AI outputs for meeting {meeting_data['meeting_id']}")
+            logger.info("✅ Stored %s AI outputs for meeting %s", len(stored), meeting_data['meeting_id'])
 
         except Exception as e:
-            logger.error(f"Error storing meeting results: {e}")
+            logger.error("Error storing meeting results: %s", e)
+        return stored
 
     async def _store_output_direct(
         self,
@@ -459,8 +677,6 @@ class MeetingIntelligenceService:
     ):
         """Direct storage method that bypasses Pydantic validation"""
         try:
-            import uuid
-
             # Create a simple dict for direct database insertion
             # Use proper UUIDs or None for invalid UUIDs
             def safe_uuid(value):
@@ -473,11 +689,11 @@ class MeetingIntelligenceService:
                     return value
                 except (ValueError, TypeError):
                     # If not a valid UUID, return None
-                    logger.warning(f"Invalid UUID format: {value}, using None")
+                    logger.warning("Invalid UUID format: %s, using None", value)
                     return None
 
             output_data = {
-                "id": str(uuid.uuid4()),
+                "id": meeting_output_id(meeting_data["meeting_id"], content_type),
                 "title": f"{content_type.title()} - {meeting_data.get('meeting_title', 'Meeting')}",
                 "content": content,
                 "output_type": content_type,
@@ -495,26 +711,31 @@ class MeetingIntelligenceService:
             from app.core.database import get_supabase_client
             client = get_supabase_client()
 
-            result = client.table("outputs").insert(output_data).execute()
+            result = client.table("outputs").upsert(output_data).execute()
 
             if result.data:
-                logger.info(f"✅ Direct storage successful for {content_type}")
+                logger.info("✅ Direct storage successful for %s", content_type)
                 return True
             else:
-                logger.error(f"❌ Direct storage failed for {content_type}: No data returned")
+                logger.error("❌ Direct storage failed for %s: No data returned", content_type)
                 return False
 
         except Exception as e:
-            logger.error(f"❌ Direct storage error for {content_type}: {e}")
+            logger.error("❌ Direct storage error for %s: %s", content_type, e)
             return False
     
-    def get_meeting_status(self, meeting_id: str) -> Optional[Dict]:
+    async def get_meeting_status(self, meeting_id: str) -> Optional[Dict]:
         """Get current status of a meeting"""
-        return self.active_meetings.get(meeting_id)
+        return await meeting_store.get(meeting_id)
     
-    def list_active_meetings(self) -> List[Dict]:
-        """List all active meetings"""
-        return list(self.active_meetings.values())
+    async def list_active_meetings(
+        self,
+        user_id: Optional[str] = None,
+        client_id: Optional[str] = None,
+        limit: int = 200
+    ) -> List[Dict]:
+        """List recorded meetings, newest first, optionally for one user or client"""
+        return await meeting_store.list(user_id=user_id, client_id=client_id, limit=limit)
 
 
 # Global service instance
@@ -0,0 +1,273 @@
+"""
+Post-meeting processing queue for Lemur AI
+A bounded pool of workers takes finished meetings from the meeting store in
+priority order, retrying failures with backoff and parking meetings that
+keep failing in a dead-letter stage
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.utils.config import get_settings
+from app.core.meeting_store import (
+    meeting_store, STAGE_QUEUED, STAGE_PROCESSING, STAGE_PROCESSED, STAGE_DEAD_LETTER
+)
+from app.core.metrics import (
+    MEETING_QUEUE_DEPTH, MEETING_QUEUE_EVENTS, MEETING_QUEUE_WAIT_SECONDS, MEETING_PROCESSING_SECONDS
+)
+from app.core.tracing import create_traced_task
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Lower runs first
+PRIORITY_MANUAL = 0   # user-requested reprocessing
+PRIORITY_VIP = 10     # clients listed in VIP_CLIENT_IDS
+PRIORITY_NORMAL = 20
+PRIORITY_LABELS = {PRIORITY_MANUAL: "manual", PRIORITY_VIP: "vip", PRIORITY_NORMAL: "normal"}
+
+MeetingHandler = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class MeetingQueue:
+    """
+    Worker pool over the meetings queued in meeting_store
+
+    `enqueue` moves a meeting to the queued stage; up to `workers` meetings
+    are processed at once, so a burst of meetings ending together waits its
+    turn instead of hitting the transcript and LLM APIs all at once. The
+    handler returns True on success; a False result or an exception is
+    retried after an exponential backoff until `max_attempts`, then the
+    meeting is dead-lettered for a manual reprocess.
+
+    Workers in any number of processes can share the store: each claim is
+    a lease held by this queue's `owner` and renewed while the handler
+    runs. If renewal fails the handler is cancelled, and results are only
+    recorded under a lease still held, so each meeting's outcome is
+    recorded once.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_attempts: int,
+        retry_base_delay: float,
+        retry_max_delay: float,
+        poll_interval: float,
+        lease_seconds: float
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.poll_interval = poll_interval  # catches retries coming due and other processes' enqueues
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[MeetingHandler] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def set_handler(self, handler: MeetingHandler):
+        self._handler = handler
+
+    def priority_for(self, client_id: Optional[str]) -> int:
+        return PRIORITY_VIP if client_id in settings.get_vip_client_ids() else PRIORITY_NORMAL
+
+    async def enqueue(
+        self,
+        meeting_id: str,
+        from_stages: Iterable[str],
+        priority: int = PRIORITY_NORMAL,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Queue a meeting currently in one of `from_stages`; None if it is elsewhere"""
+        now = datetime.now()
+        meeting = await meeting_store.transition(
+            meeting_id, from_stages, STAGE_QUEUED,
+            priority=priority, attempts=0, queued_at=now, available_at=now, error=None, **fields
+        )
+        if meeting is not None:
+            MEETING_QUEUE_EVENTS.inc(event="enqueued")
+            logger.info(
+                "📥 Queued meeting %s for processing (priority %s)",
+                meeting_id, PRIORITY_LABELS.get(priority, priority)
+            )
+            await self._update_depth()
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return meeting
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before attempt `attempts + 1`, with jitter"""
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _update_depth(self):
+        MEETING_QUEUE_DEPTH.set(await meeting_store.count([STAGE_QUEUED]))
+
+    def start(self):
+        """Start the worker pool (idempotent)"""
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks = [
+            create_traced_task(self._work(), f"meetings.worker.{n}", open_span=False)
+            for n in range(self.workers)
+        ]
+        logger.info("🧵 Meeting processing queue started with %d workers", self.workers)
+
+    async def stop(self, drain_seconds: float = 0.0):
+        """
+        Stop the workers, letting meetings in progress finish for up to `drain_seconds`
+
+        Meetings still running after that are cancelled; their leases
+        expire and another worker picks them up.
+        """
+        tasks, self._tasks = self._tasks, []
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if tasks and drain_seconds > 0:
+            await asyncio.wait(tasks, timeout=drain_seconds)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _work(self):
+        while not self._stopping:
+            try:
+                meeting = await meeting_store.claim_next(self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error("❌ Error claiming queued meeting: %s", e)
+                meeting = None
+
+            if meeting is None:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._update_depth()
+            await self.process(meeting)
+
+    async def process(self, meeting: Dict[str, Any]) -> bool:
+        """Run the handler on a claimed meeting and record the outcome"""
+        meeting_id = meeting["meeting_id"]
+        attempts = meeting["attempts"]
+        waited = (datetime.now() - (meeting.get("available_at") or meeting["updated_at"])).total_seconds()
+        MEETING_QUEUE_WAIT_SECONDS.observe(
+            max(waited, 0.0), priority=PRIORITY_LABELS.get(meeting.get("priority"), "other")
+        )
+
+        started = time.monotonic()
+        error = None
+        handler = asyncio.create_task(self._handler(meeting))
+        heartbeat = asyncio.create_task(self._keep_lease(meeting_id, handler))
+        try:
+            succeeded = await handler
+            if not succeeded:
+                error = "Meeting could not be processed"
+        except asyncio.CancelledError:
+            lease_lost = heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()
+            if not lease_lost:
+                # Shutting down: hand the meeting back rather than leaving it leased until expiry
+                handler.cancel()
+                try:
+                    await meeting_store.transition(
+                        meeting_id, [STAGE_PROCESSING], STAGE_QUEUED,
+                        lease_owner=self.owner, available_at=datetime.now()
+                    )
+                except Exception as e:
+                    logger.error("❌ Error releasing meeting %s: %s", meeting_id, e)
+                raise
+            # Another worker may own the meeting now; it records the outcome
+            MEETING_QUEUE_EVENTS.inc(event="lease_lost")
+            logger.warning("⚠️ Lost the lease on meeting %s, abandoned attempt %d", meeting_id, attempts)
+            return False
+        except Exception as e:
+            succeeded = False
+            error = str(e)
+            logger.error("❌ Error processing meeting %s (attempt %d): %s", meeting_id, attempts, e)
+        finally:
+            heartbeat.cancel()
+
+        MEETING_PROCESSING_SECONDS.observe(
+            time.monotonic() - started, outcome="success" if succeeded else "failure"
+        )
+
+        if succeeded:
+            MEETING_QUEUE_EVENTS.inc(event="processed")
+            if await meeting_store.transition(
+                meeting_id, [STAGE_PROCESSING], STAGE_PROCESSED, lease_owner=self.owner,
+                processed_at=datetime.now(), bypass_cache=False, error=None
+            ):
+                logger.info("✅ Meeting %s fully processed and stored", meeting_id)
+        elif attempts >= self.max_attempts:
+            MEETING_QUEUE_EVENTS.inc(event="dead_lettered")
+            await meeting_store.transition(
+                meeting_id, [STAGE_PROCESSING], STAGE_DEAD_LETTER, lease_owner=self.owner, error=error
+            )
+            logger.error(
+                "💀 Meeting %s failed %d times, moved to dead letter: %s", meeting_id, attempts, error
+            )
+        else:
+            MEETING_QUEUE_EVENTS.inc(event="retried")
+            delay = self.retry_delay(attempts)
+            await meeting_store.transition(
+                meeting_id, [STAGE_PROCESSING], STAGE_QUEUED, lease_owner=self.owner,
+                available_at=datetime.now() + timedelta(seconds=delay), error=error
+            )
+            logger.warning(
+                "🔁 Meeting %s attempt %d failed, retrying in %.0fs: %s", meeting_id, attempts, delay, error
+            )
+            await self._update_depth()
+        return succeeded
+
+    async def _keep_lease(self, meeting_id: str, handler: asyncio.Task) -> bool:
+        """
+        Renew the lease while `handler` runs; cancel it and return True if the lease is lost
+
+        A renewal that fails outright is retried, but once `lease_seconds`
+        pass without a successful one the lease has expired and another
+        worker may have claimed the meeting, so the handler is stopped.
+        """
+        last_renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            attempted = time.monotonic()
+            try:
+                renewed = await meeting_store.renew_lease(meeting_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.error("❌ Error renewing lease on meeting %s: %s", meeting_id, e)
+                if time.monotonic() - last_renewed < self.lease_seconds:
+                    continue
+                renewed = False
+            if renewed:
+                last_renewed = attempted
+            else:
+                handler.cancel()
+                return True
+
+
+# Global meeting queue instance
+meeting_queue = MeetingQueue(
+    workers=settings.meeting_workers,
+    max_attempts=settings.meeting_max_attempts,
+    retry_base_delay=settings.meeting_retry_base_delay,
+    retry_max_delay=settings.meeting_retry_max_delay,
+    poll_interval=settings.meeting_queue_poll_seconds,
+    lease_seconds=settings.meeting_lease_seconds
+)
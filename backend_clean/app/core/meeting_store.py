@@ -0,0 +1,679 @@
+"""
+Meeting state store for Lemur AI
+Persists recorded meetings, their processing stage and user/bot ownership so
+meetings survive restarts and every worker process sees the same state: in
+SQLite for a single host (local development), or in Postgres when API and
+worker processes run on several hosts (MEETING_STORE_BACKEND=postgres)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from app.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:
+    psycopg = None  # only needed for the postgres backend
+
+# Processing stages of a meeting (the Recall bot status is kept separately)
+STAGE_RECORDING = "recording"    # bot in the call, waiting for the recording
+STAGE_QUEUED = "queued"          # recording done, waiting for AI processing
+STAGE_PROCESSING = "processing"  # AI processing running
+STAGE_PROCESSED = "processed"
+STAGE_FAILED = "failed"
+STAGE_DEAD_LETTER = "dead_letter"  # processing failed on every attempt
+UNFINISHED_STAGES = (STAGE_RECORDING, STAGE_QUEUED, STAGE_PROCESSING)
+
+# Columns with their own index or filter; everything else lives in the JSON `data` column
+_COLUMNS = (
+    "meeting_id", "bot_id", "user_id", "client_id", "sub_client_id",
+    "status", "stage", "started_at", "updated_at",
+    "priority", "attempts", "queued_at", "available_at", "lease_owner", "lease_until"
+)
+_DATETIME_FIELDS = (
+    "started_at", "completed_at", "processed_at", "expected_end", "updated_at", "queued_at", "available_at",
+    "lease_until"
+)
+
+# Columns added after the first release, created on open if missing
+_ADDED_COLUMNS = {
+    "priority": "INTEGER",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "queued_at": "TEXT",
+    "available_at": "TEXT",
+    "lease_owner": "TEXT",
+    "lease_until": "TEXT"
+}
+
+
+def _encode(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode_meeting(row: Mapping[str, Any]) -> Dict[str, Any]:
+    data = row["data"]
+    meeting = json.loads(data) if isinstance(data, str) else dict(data)
+    for name in _COLUMNS:
+        meeting[name] = row[name]
+    for name in _DATETIME_FIELDS:
+        if isinstance(meeting.get(name), str):
+            meeting[name] = datetime.fromisoformat(meeting[name])
+    meeting["processed"] = meeting["stage"] == STAGE_PROCESSED
+    return meeting
+
+
+class MeetingStore:
+    """
+    SQLite-backed meeting records, indexed by bot, user, client and stage
+
+    WAL mode lets processes on one host share the database file; processes
+    on several hosts need PostgresMeetingStore.
+
+    Meeting dicts keep the shape the service always used (meeting_id, bot_id,
+    client_id, status, started_at, ...) plus a `stage`. Stage changes go
+    through `transition`, a conditional update, so when several processes
+    see the same event only one of them acts on it. Processing is claimed
+    with a lease (`claim_next`/`renew_lease`): a worker that dies stops
+    renewing and its meeting becomes claimable again, while a worker that
+    lost its lease can no longer record a result. Queries run in a worker
+    thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meetings (
+                    meeting_id TEXT PRIMARY KEY,
+                    bot_id TEXT,
+                    user_id TEXT,
+                    client_id TEXT,
+                    sub_client_id TEXT,
+                    status TEXT,
+                    stage TEXT NOT NULL,
+                    started_at TEXT,
+                    updated_at TEXT NOT NULL,
+                    priority INTEGER,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    queued_at TEXT,
+                    available_at TEXT,
+                    lease_owner TEXT,
+                    lease_until TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_bot ON meetings (bot_id);
+                CREATE INDEX IF NOT EXISTS idx_meetings_user ON meetings (user_id, started_at);
+                CREATE INDEX IF NOT EXISTS idx_meetings_client ON meetings (client_id, started_at);
+                CREATE INDEX IF NOT EXISTS idx_meetings_stage ON meetings (stage, updated_at);
+                CREATE TABLE IF NOT EXISTS user_bots (
+                    user_id TEXT NOT NULL,
+                    bot_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (user_id, bot_id)
+                );
+                """
+            )
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(meetings)")}
+            for name, definition in _ADDED_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE meetings ADD COLUMN {name} {definition}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_meetings_queue ON meetings (stage, priority, available_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                return fn(self._connection(), *args)
+        return await asyncio.to_thread(locked)
+
+    # ------------------------------------------------------------------ meetings
+
+    @staticmethod
+    def _row(meeting: Dict[str, Any]) -> Dict[str, Any]:
+        data = {k: _encode(v) for k, v in meeting.items() if k not in _COLUMNS and k != "processed"}
+        row = {name: _encode(meeting.get(name)) for name in _COLUMNS}
+        row["stage"] = row["stage"] or STAGE_RECORDING
+        row["attempts"] = row["attempts"] or 0
+        row["updated_at"] = datetime.now().isoformat()
+        row["data"] = json.dumps(data, default=str)
+        return row
+
+    async def save(self, meeting: Dict[str, Any]):
+        """Insert or replace a whole meeting record"""
+        row = self._row(meeting)
+
+        def save(conn):
+            conn.execute(
+                f"INSERT OR REPLACE INTO meetings ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values())
+            )
+            conn.commit()
+        await self._run(save)
+
+    def _modify(
+        self,
+        conn: sqlite3.Connection,
+        meeting_id: str,
+        fields: Union[Dict[str, Any], Callable[[Dict[str, Any]], Dict[str, Any]]],
+        from_stages: Optional[Iterable[str]] = None,
+        conditions: Iterable[Tuple[str, Any]] = ()
+    ) -> Optional[Dict[str, Any]]:
+        # Read-merge-write inside one write transaction, so concurrent processes serialize;
+        # `fields` may be a function of the current record
+        query = "SELECT * FROM meetings WHERE meeting_id = ?"
+        params: List[Any] = [meeting_id]
+        if from_stages is not None:
+            from_stages = tuple(from_stages)
+            query += f" AND stage IN ({', '.join('?' * len(from_stages))})"
+            params.extend(from_stages)
+        for clause, value in conditions:
+            query += f" AND {clause}"
+            params.append(_encode(value))
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            current = _decode_meeting(row)
+            meeting = {**current, **(fields(current) if callable(fields) else fields)}
+            new = self._row(meeting)
+            conn.execute(
+                f"UPDATE meetings SET {', '.join(f'{k} = ?' for k in new)} WHERE meeting_id = ?",
+                (*new.values(), meeting_id)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        meeting["updated_at"] = datetime.fromisoformat(new["updated_at"])
+        meeting["processed"] = meeting["stage"] == STAGE_PROCESSED
+        return meeting
+
+    async def update(
+        self,
+        meeting_id: str,
+        from_stages: Optional[Iterable[str]] = None,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Merge `fields` into a meeting (only while in one of `from_stages`, if given) and return the updated record"""
+        return await self._run(self._modify, meeting_id, fields, from_stages)
+
+    async def append(
+        self,
+        meeting_id: str,
+        field: str,
+        values: Iterable[Any],
+        from_stages: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Append `values` to the list in `field`, atomically, so concurrent writers don't drop each other's items"""
+        values = list(values)
+        return await self._run(
+            self._modify, meeting_id, lambda meeting: {field: list(meeting.get(field) or []) + values}, from_stages
+        )
+
+    async def transition(
+        self,
+        meeting_id: str,
+        from_stages: Iterable[str],
+        to_stage: str,
+        lease_owner: Optional[str] = None,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Move a meeting to `to_stage` only if it is in one of `from_stages`
+
+        Returns the updated meeting, or None if it was not in an expected
+        stage (another process got there first). With `lease_owner` the
+        meeting must also still be leased to that worker; the lease is
+        released by the move.
+        """
+        fields = {**fields, "stage": to_stage}
+        conditions = []
+        if lease_owner is not None:
+            conditions.append(("lease_owner = ?", lease_owner))
+            fields.update(lease_owner=None, lease_until=None)
+        return await self._run(self._modify, meeting_id, fields, tuple(from_stages), conditions)
+
+    async def claim_next(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next due meeting to `owner` and return it
+
+        Due means queued and available, or processing under an expired
+        lease (its worker died). Lowest priority value first, then longest
+        waiting. Counts the attempt; None when nothing is due.
+        """
+        def claim(conn):
+            while True:
+                now = datetime.now()
+                row = conn.execute(
+                    "SELECT meeting_id, attempts FROM meetings "
+                    "WHERE (stage = ? AND available_at <= ?) OR (stage = ? AND lease_until < ?) "
+                    "ORDER BY priority, available_at LIMIT 1",
+                    (STAGE_QUEUED, now.isoformat(), STAGE_PROCESSING, now.isoformat())
+                ).fetchone()
+                if row is None:
+                    return None
+                meeting = self._modify(
+                    conn, row["meeting_id"],
+                    {
+                        "stage": STAGE_PROCESSING,
+                        "attempts": row["attempts"] + 1,
+                        "lease_owner": owner,
+                        "lease_until": now + timedelta(seconds=lease_seconds)
+                    },
+                    (STAGE_QUEUED, STAGE_PROCESSING),
+                    [("(stage = 'queued' OR lease_until < ?)", now)]
+                )
+                if meeting is not None:
+                    return meeting
+                # Claimed by another process between the read and the update: take the next one
+        return await self._run(claim)
+
+    async def renew_lease(self, meeting_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend `owner`'s lease on a meeting it is processing; False if the lease was lost"""
+        meeting = await self._run(
+            self._modify, meeting_id,
+            {"lease_until": datetime.now() + timedelta(seconds=lease_seconds)},
+            (STAGE_PROCESSING,),
+            [("lease_owner = ?", owner)]
+        )
+        return meeting is not None
+
+    async def count(self, stages: Iterable[str]) -> int:
+        stages = tuple(stages)
+
+        def count(conn):
+            return conn.execute(
+                f"SELECT COUNT(*) FROM meetings WHERE stage IN ({', '.join('?' * len(stages))})", stages
+            ).fetchone()[0]
+        return await self._run(count)
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        def get(conn):
+            row = conn.execute("SELECT * FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+            return _decode_meeting(row) if row else None
+        return await self._run(get)
+
+    async def get_by_bot(self, bot_id: str) -> Optional[Dict[str, Any]]:
+        def get_by_bot(conn):
+            row = conn.execute("SELECT * FROM meetings WHERE bot_id = ?", (bot_id,)).fetchone()
+            return _decode_meeting(row) if row else None
+        return await self._run(get_by_bot)
+
+    async def list(
+        self,
+        user_id: Optional[str] = None,
+        client_id: Optional[str] = None,
+        stages: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 200
+    ) -> List[Dict[str, Any]]:
+        """Meetings matching every given filter, newest first (limit=None for all)"""
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if client_id is not None:
+            clauses.append("client_id = ?")
+            params.append(client_id)
+        if stages is not None:
+            stages = tuple(stages)
+            clauses.append(f"stage IN ({', '.join('?' * len(stages))})")
+            params.extend(stages)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        def select(conn):
+            rows = conn.execute(
+                f"SELECT * FROM meetings {where} ORDER BY started_at DESC LIMIT ?", (*params, -1 if limit is None else limit)
+            ).fetchall()
+            return [_decode_meeting(row) for row in rows]
+        return await self._run(select)
+
+    # ----------------------------------------------------------------- user bots
+
+    async def add_user_bot(self, user_id: str, bot_id: str):
+        def add(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO user_bots (user_id, bot_id, created_at) VALUES (?, ?, ?)",
+                (user_id, bot_id, datetime.now().isoformat())
+            )
+            conn.commit()
+        await self._run(add)
+
+    async def remove_user_bot(self, user_id: str, bot_id: str):
+        def remove(conn):
+            conn.execute("DELETE FROM user_bots WHERE user_id = ? AND bot_id = ?", (user_id, bot_id))
+            conn.commit()
+        await self._run(remove)
+
+    async def get_user_bots(self, user_id: str) -> List[str]:
+        def select(conn):
+            rows = conn.execute(
+                "SELECT bot_id FROM user_bots WHERE user_id = ? ORDER BY created_at", (user_id,)
+            ).fetchall()
+            return [row["bot_id"] for row in rows]
+        return await self._run(select)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Created on first connect; the same layout as SQLite with native timestamps and JSONB
+_POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    bot_id TEXT,
+    user_id TEXT,
+    client_id TEXT,
+    sub_client_id TEXT,
+    status TEXT,
+    stage TEXT NOT NULL,
+    started_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL,
+    priority INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued_at TIMESTAMP,
+    available_at TIMESTAMP,
+    lease_owner TEXT,
+    lease_until TIMESTAMP,
+    data JSONB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_bot ON meetings (bot_id);
+CREATE INDEX IF NOT EXISTS idx_meetings_user ON meetings (user_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_meetings_client ON meetings (client_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_meetings_stage ON meetings (stage, updated_at);
+CREATE INDEX IF NOT EXISTS idx_meetings_queue ON meetings (stage, priority, available_at);
+CREATE TABLE IF NOT EXISTS user_bots (
+    user_id TEXT NOT NULL,
+    bot_id TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, bot_id)
+);
+"""
+
+# Maintained by the store, never taken from the fields being written
+_DERIVED_FIELDS = ("meeting_id", "processed", "updated_at")
+
+
+class PostgresMeetingStore(MeetingStore):
+    """
+    Postgres-backed meeting records, shared by every host
+
+    Same interface and record shape as the SQLite store. Every write is a
+    single conditional `UPDATE ... WHERE stage = ANY(...) RETURNING *`:
+    column fields are set directly and the rest merged into the JSONB
+    `data`, so concurrent writers never overwrite each other's fields.
+    `claim_next` leases the next due meeting with `FOR UPDATE SKIP LOCKED`,
+    so workers on different hosts never claim the same meeting.
+    """
+
+    def __init__(self, dsn: str):
+        if psycopg is None:
+            raise RuntimeError(
+                "MEETING_STORE_BACKEND=postgres needs psycopg. Install with: pip install 'psycopg[binary]'"
+            )
+        if not dsn:
+            raise RuntimeError("MEETING_STORE_BACKEND=postgres needs MEETING_STORE_DSN")
+        super().__init__(path="")
+        self.dsn = dsn
+
+    def _connection(self):
+        if self._conn is None:
+            conn = psycopg.connect(self.dsn, autocommit=True, row_factory=dict_row)
+            conn.execute(_POSTGRES_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                try:
+                    return fn(self._connection(), *args)
+                except psycopg.OperationalError:
+                    # Connection lost (server restart, network): reconnect on the next call
+                    if self._conn is not None:
+                        self._conn.close()
+                        self._conn = None
+                    raise
+        return await asyncio.to_thread(locked)
+
+    @staticmethod
+    def _assignments(fields: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """SET clauses for `fields`: columns directly, everything else merged into `data`"""
+        fields = {k: v for k, v in fields.items() if k not in _DERIVED_FIELDS}
+        assignments, params = ["updated_at = %s"], [datetime.now()]
+        for name in _COLUMNS:
+            if name in fields:
+                assignments.append(f"{name} = %s")
+                params.append(fields[name])
+        data = {k: _encode(v) for k, v in fields.items() if k not in _COLUMNS}
+        if data:
+            assignments.append("data = data || %s::jsonb")
+            params.append(json.dumps(data, default=str))
+        return assignments, params
+
+    @staticmethod
+    def _conditional_update(
+        conn,
+        meeting_id: str,
+        assignments: List[str],
+        params: List[Any],
+        from_stages: Optional[Iterable[str]] = None,
+        conditions: Iterable[Tuple[str, Any]] = ()
+    ) -> Optional[Dict[str, Any]]:
+        query = f"UPDATE meetings SET {', '.join(assignments)} WHERE meeting_id = %s"
+        params = [*params, meeting_id]
+        if from_stages is not None:
+            query += " AND stage = ANY(%s)"
+            params.append(list(from_stages))
+        for clause, value in conditions:
+            query += f" AND {clause}"
+            params.append(value)
+        row = conn.execute(query + " RETURNING *", params).fetchone()
+        return _decode_meeting(row) if row else None
+
+    async def save(self, meeting: Dict[str, Any]):
+        """Insert or replace a whole meeting record"""
+        row = self._row(meeting)
+        for name in _DATETIME_FIELDS:
+            if isinstance(row.get(name), str):
+                row[name] = datetime.fromisoformat(row[name])
+
+        def save(conn):
+            conn.execute(
+                f"INSERT INTO meetings ({', '.join(row)}) VALUES ({', '.join(['%s'] * len(row))}) "
+                f"ON CONFLICT (meeting_id) DO UPDATE SET "
+                f"{', '.join(f'{name} = EXCLUDED.{name}' for name in row if name != 'meeting_id')}",
+                tuple(row.values())
+            )
+        await self._run(save)
+
+    async def update(
+        self,
+        meeting_id: str,
+        from_stages: Optional[Iterable[str]] = None,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Merge `fields` into a meeting (only while in one of `from_stages`, if given) and return the updated record"""
+        assignments, params = self._assignments(fields)
+        return await self._run(self._conditional_update, meeting_id, assignments, params, from_stages)
+
+    async def append(
+        self,
+        meeting_id: str,
+        field: str,
+        values: Iterable[Any],
+        from_stages: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Append `values` to the list in `field`, atomically, so concurrent writers don't drop each other's items"""
+        if field in _COLUMNS:
+            raise ValueError(f"{field} is not a list field")
+        assignments, params = self._assignments({})
+        assignments.append(
+            "data = jsonb_set(data, ARRAY[%s::text], "
+            "CASE WHEN jsonb_typeof(data -> %s::text) = 'array' THEN data -> %s::text ELSE '[]'::jsonb END "
+            "|| %s::jsonb)"
+        )
+        params += [field, field, field, json.dumps([_encode(v) for v in values], default=str)]
+        return await self._run(self._conditional_update, meeting_id, assignments, params, from_stages)
+
+    async def transition(
+        self,
+        meeting_id: str,
+        from_stages: Iterable[str],
+        to_stage: str,
+        lease_owner: Optional[str] = None,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Move a meeting to `to_stage` only if it is in one of `from_stages` (see MeetingStore.transition)"""
+        fields = {**fields, "stage": to_stage}
+        conditions = []
+        if lease_owner is not None:
+            conditions.append(("lease_owner = %s", lease_owner))
+            fields.update(lease_owner=None, lease_until=None)
+        assignments, params = self._assignments(fields)
+        return await self._run(
+            self._conditional_update, meeting_id, assignments, params, tuple(from_stages), conditions
+        )
+
+    async def claim_next(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the next due meeting to `owner` and return it (see MeetingStore.claim_next)"""
+        def claim(conn):
+            now = datetime.now()
+            row = conn.execute(
+                "UPDATE meetings SET stage = %s, attempts = attempts + 1, lease_owner = %s, lease_until = %s, "
+                "updated_at = %s "
+                "WHERE meeting_id = ("
+                "SELECT meeting_id FROM meetings "
+                "WHERE (stage = %s AND available_at <= %s) OR (stage = %s AND lease_until < %s) "
+                "ORDER BY priority NULLS FIRST, available_at LIMIT 1 FOR UPDATE SKIP LOCKED"
+                ") RETURNING *",
+                (
+                    STAGE_PROCESSING, owner, now + timedelta(seconds=lease_seconds), now,
+                    STAGE_QUEUED, now, STAGE_PROCESSING, now
+                )
+            ).fetchone()
+            return _decode_meeting(row) if row else None
+        return await self._run(claim)
+
+    async def renew_lease(self, meeting_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend `owner`'s lease on a meeting it is processing; False if the lease was lost"""
+        def renew(conn):
+            return conn.execute(
+                "UPDATE meetings SET lease_until = %s, updated_at = %s "
+                "WHERE meeting_id = %s AND stage = %s AND lease_owner = %s",
+                (datetime.now() + timedelta(seconds=lease_seconds), datetime.now(), meeting_id, STAGE_PROCESSING, owner)
+            ).rowcount == 1
+        return await self._run(renew)
+
+    async def count(self, stages: Iterable[str]) -> int:
+        stages = list(stages)
+
+        def count(conn):
+            return conn.execute(
+                "SELECT COUNT(*) AS count FROM meetings WHERE stage = ANY(%s)", (stages,)
+            ).fetchone()["count"]
+        return await self._run(count)
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        def get(conn):
+            row = conn.execute("SELECT * FROM meetings WHERE meeting_id = %s", (meeting_id,)).fetchone()
+            return _decode_meeting(row) if row else None
+        return await self._run(get)
+
+    async def get_by_bot(self, bot_id: str) -> Optional[Dict[str, Any]]:
+        def get_by_bot(conn):
+            row = conn.execute("SELECT * FROM meetings WHERE bot_id = %s", (bot_id,)).fetchone()
+            return _decode_meeting(row) if row else None
+        return await self._run(get_by_bot)
+
+    async def list(
+        self,
+        user_id: Optional[str] = None,
+        client_id: Optional[str] = None,
+        stages: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 200
+    ) -> List[Dict[str, Any]]:
+        """Meetings matching every given filter, newest first (limit=None for all)"""
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = %s")
+            params.append(user_id)
+        if client_id is not None:
+            clauses.append("client_id = %s")
+            params.append(client_id)
+        if stages is not None:
+            clauses.append("stage = ANY(%s)")
+            params.append(list(stages))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        def select(conn):
+            rows = conn.execute(
+                f"SELECT * FROM meetings {where} ORDER BY started_at DESC NULLS LAST LIMIT %s", (*params, limit)
+            ).fetchall()
+            return [_decode_meeting(row) for row in rows]
+        return await self._run(select)
+
+    async def add_user_bot(self, user_id: str, bot_id: str):
+        def add(conn):
+            conn.execute(
+                "INSERT INTO user_bots (user_id, bot_id, created_at) VALUES (%s, %s, %s) ON CONFLICT DO NOTHING",
+                (user_id, bot_id, datetime.now())
+            )
+        await self._run(add)
+
+    async def remove_user_bot(self, user_id: str, bot_id: str):
+        def remove(conn):
+            conn.execute("DELETE FROM user_bots WHERE user_id = %s AND bot_id = %s", (user_id, bot_id))
+        await self._run(remove)
+
+    async def get_user_bots(self, user_id: str) -> List[str]:
+        def select(conn):
+            rows = conn.execute(
+                "SELECT bot_id FROM user_bots WHERE user_id = %s ORDER BY created_at", (user_id,)
+            ).fetchall()
+            return [row["bot_id"] for row in rows]
+        return await self._run(select)
+
+
+def create_meeting_store() -> MeetingStore:
+    """The store selected by MEETING_STORE_BACKEND"""
+    if settings.meeting_store_backend == "postgres":
+        return PostgresMeetingStore(settings.meeting_store_dsn)
+    if settings.meeting_store_backend != "sqlite":
+        raise ValueError(f"Unknown MEETING_STORE_BACKEND: {settings.meeting_store_backend}")
+    return MeetingStore(settings.meeting_store_path)
+
+
+# Global meeting store instance
+meeting_store = create_meeting_store()
@@ -0,0 +1,416 @@
+"""
+In-process metrics for Lemur AI
+Histograms, counters and gauges rendered in the Prometheus text exposition format
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.utils.config import get_settings
+
+settings = get_settings()
+
+# Bucket layouts shared by the instruments below
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1024, 10240, 102400, 524288, 1048576, 5242880, 10485760, 52428800)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 128000)
+BACKGROUND_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as {name="value",...}"""
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape_label_value(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    """Render a sample value the way Prometheus expects"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        """Increment the counter for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}")
+        return lines
+
+
+class Gauge:
+    """Point-in-time value with a fixed set of label names"""
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str):
+        """Set the gauge for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        """Current value for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with a fixed set of label names"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        """Record a single observation"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the wall-clock duration of the wrapped block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        series = self._series.get(key)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (bucket_counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.label_names, key, ("le", _format_number(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every instrument and renders the /metrics payload"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter(name, description, label_names))
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._register(Gauge(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram(name, description, label_names, buckets))
+
+    def render(self) -> str:
+        """Render all instruments in Prometheus text format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry instance
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# TENANT LABELS
+# ============================================================================
+
+_tenant_labels: Dict[str, str] = {}
+_tenant_lock = threading.Lock()
+
+
+def tenant_label(client_id: Optional[str]) -> str:
+    """
+    Map a client ID to a bounded tenant label
+
+    The first `metrics_max_tenant_labels` clients seen keep their own label;
+    everyone after that is folded into "other" so label cardinality (and
+    therefore scrape size) stays bounded no matter how many clients exist.
+    """
+    if not client_id:
+        return "none"
+
+    label = _tenant_labels.get(client_id)
+    if label is not None:
+        return label
+
+    with _tenant_lock:
+        label = _tenant_labels.get(client_id)
+        if label is None:
+            if len(_tenant_labels) < settings.metrics_max_tenant_labels:
+                label = client_id
+            else:
+                label = "other"
+            _tenant_labels[client_id] = label
+    return label
+
+
+# ============================================================================
+# INSTRUMENTS
+# ============================================================================
+
+INGEST_STAGE_SECONDS = registry.histogram(
+    "lemur_ingest_stage_seconds",
+    "Time spent in each stage of file ingestion",
+    ["stage", "file_type", "tenant"]
+)
+INGEST_FILE_BYTES = registry.histogram(
+    "lemur_ingest_file_bytes",
+    "Size of uploaded files",
+    ["file_type", "tenant"],
+    SIZE_BUCKETS
+)
+INGEST_TEXT_CHARS = registry.histogram(
+    "lemur_ingest_extracted_chars",
+    "Characters of text extracted from uploaded files",
+    ["file_type", "tenant"],
+    SIZE_BUCKETS
+)
+INGEST_CHUNKS = registry.histogram(
+    "lemur_ingest_chunks",
+    "Chunks written to the vector store per file",
+    ["file_type", "tenant"],
+    COUNT_BUCKETS
+)
+
+SEARCH_STAGE_SECONDS = registry.histogram(
+    "lemur_search_stage_seconds",
+    "Time spent in each stage of knowledge base search",
+    ["stage", "tenant"]
+)
+SEARCH_RESULTS = registry.histogram(
+    "lemur_search_results",
+    "Results returned per knowledge base search",
+    ["tenant"],
+    COUNT_BUCKETS
+)
+
+GENERATION_STAGE_SECONDS = registry.histogram(
+    "lemur_generation_stage_seconds",
+    "Time spent in each stage of AI content generation",
+    ["stage", "content_type", "tenant"]
+)
+GENERATION_TOKENS = registry.histogram(
+    "lemur_generation_tokens",
+    "Tokens used per generation",
+    ["kind", "content_type", "tenant"],
+    TOKEN_BUCKETS
+)
+PROMPT_SECTION_TOKENS = registry.histogram(
+    "lemur_prompt_section_tokens",
+    "Prompt tokens per section (system, prompt, context, ...)",
+    ["section", "content_type"],
+    TOKEN_BUCKETS
+)
+MODEL_ROUTE_SECONDS = registry.histogram(
+    "lemur_model_route_seconds",
+    "LLM call latency per model route",
+    ["tier", "model", "content_type"]
+)
+MODEL_ROUTE_COST_USD = registry.counter(
+    "lemur_model_route_cost_usd_total",
+    "Estimated LLM spend per model route (list prices)",
+    ["tier", "model", "content_type"]
+)
+MODEL_ESCALATIONS = registry.counter(
+    "lemur_model_escalations_total",
+    "Fast-model outputs retried on the default model",
+    ["content_type", "reason"]
+)
+BATCH_ITEMS = registry.counter(
+    "lemur_batch_generations_total",
+    "Generations run by batch requests and batch jobs",
+    ["source", "outcome"]
+)
+
+LLM_QUEUE_SECONDS = registry.histogram(
+    "lemur_llm_queue_seconds",
+    "Time a generation waited for a global/tenant concurrency slot",
+    ["tenant"]
+)
+LLM_RETRIES = registry.counter(
+    "lemur_llm_retries_total",
+    "LLM calls retried after a transient failure",
+    ["reason"]
+)
+
+CACHE_LOOKUPS = registry.counter(
+    "lemur_cache_lookups_total",
+    "Cache lookups by cache and outcome (hit/miss)",
+    ["cache", "result"]
+)
+
+WEBHOOK_EVENTS = registry.counter(
+    "lemur_webhook_events_total",
+    "Webhook deliveries by source, event and outcome",
+    ["source", "event", "outcome"]
+)
+
+MEETING_STATUS_UPDATES = registry.counter(
+    "lemur_meeting_status_updates_total",
+    "Meeting state transitions by how they were detected (webhook/poll)",
+    ["source", "status"]
+)
+
+RECALL_RETRIES = registry.counter(
+    "lemur_recall_retries_total",
+    "Recall API calls retried, by reason (status code or connection error)",
+    ["reason"]
+)
+
+BOT_STATUS_LOOKUPS = registry.counter(
+    "lemur_bot_status_lookups_total",
+    "Recall API calls made to refresh bot statuses (list pages or single gets)",
+    ["method"]
+)
+
+MEETING_QUEUE_DEPTH = registry.gauge(
+    "lemur_meeting_queue_depth",
+    "Meetings waiting for post-meeting processing (including retries backing off)"
+)
+MEETING_QUEUE_WAIT_SECONDS = registry.histogram(
+    "lemur_meeting_queue_wait_seconds",
+    "Time a meeting waited in the processing queue before a worker picked it up",
+    ["priority"],
+    BACKGROUND_BUCKETS
+)
+MEETING_PROCESSING_SECONDS = registry.histogram(
+    "lemur_meeting_processing_seconds",
+    "Post-meeting processing time per attempt, by outcome",
+    ["outcome"],
+    BACKGROUND_BUCKETS
+)
+MEETING_QUEUE_EVENTS = registry.counter(
+    "lemur_meeting_queue_events_total",
+    "Processing queue events (enqueued/processed/retried/dead_lettered/lease_lost)",
+    ["event"]
+)
+LIVE_TRANSCRIPT_EVENTS = registry.counter(
+    "lemur_live_transcript_events_total",
+    "Live transcript work (segment/chunk_stored/chunk_failed/notes_updated/notes_failed)",
+    ["event"]
+)
+
+STAGE_ERRORS = registry.counter(
+    "lemur_stage_errors_total",
+    "Exceptions raised inside an instrumented stage",
+    ["operation", "stage"]
+)
+
+
+@contextmanager
+def time_stage(histogram: Histogram, operation: str, stage: str, **labels: str):
+    """
+    Time one pipeline stage and count it as an error if it raises
+
+    Usage:
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "extract", file_type=".pdf", tenant=t):
+            ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(operation=operation, stage=stage)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, stage=stage, **labels)
+
+
+def render_metrics() -> str:
+    """Render the current metrics snapshot"""
+    return registry.render()
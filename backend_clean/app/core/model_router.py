@@ -0,0 +1,87 @@
+"""
+Model routing for Lemur AI
+Maps each content type to a model tier (fast or default), escalates to the
+default model when fast-model output fails validation, and records latency
+and cost per route
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.utils.config import get_settings
+from app.core.metrics import MODEL_ESCALATIONS, MODEL_ROUTE_COST_USD, MODEL_ROUTE_SECONDS
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# USD per million (prompt, completion) tokens, matched by longest model prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4-32k": (60.00, 120.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50)
+}
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model chosen for one content type"""
+    content_type: str
+    tier: str
+    model: str
+
+
+def _price(model: str) -> Optional[tuple]:
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+class ModelRouter:
+    """
+    Per-content-type routing table
+
+    MODEL_ROUTES is a comma-separated list of `content_type=tier` pairs; a
+    tier is "fast" (OPENAI_FAST_MODEL), "default" (OPENAI_MODEL) or an
+    explicit model name. Content types without an entry use the default model.
+    """
+
+    def __init__(self, default_model: str, fast_model: str, routes: Dict[str, str], escalation: bool = True):
+        self.tiers = {"default": default_model, "fast": fast_model}
+        self.routes = routes
+        self.escalation = escalation
+
+    def route(self, content_type: str) -> ModelRoute:
+        tier = self.routes.get(content_type, "default")
+        return ModelRoute(content_type, tier, self.tiers.get(tier, tier))
+
+    def escalate(self, route: ModelRoute, reason: str) -> Optional[ModelRoute]:
+        """Default-model route to retry with, or None if there is nothing larger to try"""
+        default_model = self.tiers["default"]
+        if not self.escalation or route.model == default_model:
+            return None
+        MODEL_ESCALATIONS.inc(content_type=route.content_type, reason=reason)
+        logger.warning(
+            "Escalating %s from %s to %s (%s)", route.content_type, route.model, default_model, reason
+        )
+        return ModelRoute(route.content_type, "default", default_model)
+
+    def observe(self, route: ModelRoute, seconds: float, usage=None):
+        """Record latency and estimated cost of one call on `route`"""
+        labels = {"tier": route.tier, "model": route.model, "content_type": route.content_type}
+        MODEL_ROUTE_SECONDS.observe(seconds, **labels)
+        price = _price(route.model)
+        if usage and price:
+            cost = (usage.prompt_tokens * price[0] + usage.completion_tokens * price[1]) / 1_000_000
+            MODEL_ROUTE_COST_USD.inc(cost, **labels)
+
+
+# Global model router instance
+model_router = ModelRouter(
+    default_model=settings.openai_model,
+    fast_model=settings.openai_fast_model,
+    routes=settings.get_model_routes(),
+    escalation=settings.model_escalation
+)
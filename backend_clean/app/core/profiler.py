@@ -0,0 +1,152 @@
+"""
+On-demand sampling profiler
+Samples Python stacks of the running process from a background thread and
+renders them as collapsed stacks (flamegraph.pl / speedscope compatible)
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, Optional
+from app.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _frame_label(frame) -> str:
+    """Label for one stack frame: function (file:first line)"""
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Collects stack samples every `interval` seconds until stopped
+
+    Nothing runs until start() is called, so an idle profiler costs nothing.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: Optional[Iterable[int]] = None,
+        exclude_thread_ids: Iterable[int] = ()
+    ):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.exclude_thread_ids = set(exclude_thread_ids)
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self.duration = 0.0
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="lemur-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started_at
+        return self
+
+    def _run(self):
+        own_id = threading.get_ident()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or thread_id in self.exclude_thread_ids:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, one `stack count` per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """Keeps the most recent per-request profiles for later download"""
+
+    def __init__(self, max_profiles: int = 20):
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+        self._max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def add(self, profiler: SamplingProfiler, **info) -> str:
+        profile_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._profiles[profile_id] = {
+                "collapsed": profiler.collapsed(),
+                "samples": profiler.sample_count,
+                "duration_s": round(profiler.duration, 3),
+                **info
+            }
+            while len(self._profiles) > self._max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                profile_id: {k: v for k, v in profile.items() if k != "collapsed"}
+                for profile_id, profile in self._profiles.items()
+            }
+
+
+# Only one whole-process profile may run at a time
+_profile_lock = threading.Lock()
+request_profiles = ProfileStore()
+
+
+def profile_process(seconds: float, interval: Optional[float] = None) -> Optional[SamplingProfiler]:
+    """
+    Sample every thread for `seconds` (blocking; run it in a worker thread)
+
+    Returns None if another whole-process profile is already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        seconds = min(seconds, settings.profiler_max_seconds)
+        profiler = SamplingProfiler(
+            interval or settings.profiler_interval_ms / 1000,
+            exclude_thread_ids=[threading.get_ident()]
+        )
+        logger.info("Starting %.1fs sampling profile", seconds)
+        profiler.start()
+        time.sleep(seconds)
+        return profiler.stop()
+    finally:
+        _profile_lock.release()
+
+
+def start_request_profile() -> SamplingProfiler:
+    """Start sampling only the calling thread (the event loop) for one request"""
+    profiler = SamplingProfiler(
+        settings.profiler_interval_ms / 1000,
+        thread_ids=[threading.get_ident()]
+    )
+    profiler.start()
+    return profiler
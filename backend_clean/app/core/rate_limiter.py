@@ -0,0 +1,120 @@
+"""
+Client-side rate limiting for Lemur AI
+Adaptive concurrency and token buckets that keep long batch runs just under
+the upstream API rate limits without hand tuning
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Budget refilled continuously at `rate_per_minute`, bursting up to one minute's worth
+
+    `acquire` waits until the amount is available. `charge` takes tokens after
+    the fact (LLM token usage is only known once a call returns) and may put
+    the bucket in debt, which holds back later acquires until it is repaid.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        amount = min(amount, self.capacity)
+        # Waiters queue on the lock, so the bucket is served first come, first served
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def charge(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit that backs off when the upstream throttles
+
+    Additive increase, multiplicative decrease: the limit grows by one after
+    `limit` consecutive unthrottled calls and halves when `throttle_signal`
+    (a monotonically increasing count, e.g. 429 retries) moves during a
+    call. Halving happens at most once per `cooldown` seconds so a burst of
+    429s counts once. With `maximum == initial` and no signal this is a
+    plain semaphore.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        throttle_signal: Optional[Callable[[], float]] = None,
+        cooldown: float = 5.0
+    ):
+        self.limit = max(minimum, initial)
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.throttle_signal = throttle_signal
+        self.cooldown = cooldown
+        self.active = 0
+        self._streak = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of `limit` slots for the duration of a call"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+        before = self.throttle_signal() if self.throttle_signal else 0
+        try:
+            yield
+            if self.throttle_signal and self.throttle_signal() > before:
+                self.throttled()
+            else:
+                self.succeeded()
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self._condition.notify_all()
+
+    def succeeded(self):
+        self._streak += 1
+        if self._streak >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._streak = 0
+
+    def throttled(self):
+        self._streak = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        previous, self.limit = self.limit, max(self.minimum, self.limit // 2)
+        if self.limit < previous:
+            logger.warning("Upstream throttling, concurrency %d -> %d", previous, self.limit)
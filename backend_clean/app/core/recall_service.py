@@ -1,21 +1,95 @@
 """
 Recall AI service integration
-Real implementation using the proven RecallAIBot class
+Real implementation using the proven RecallAIBot class, on a shared async
+connection pool
 """
 
+import asyncio
+import importlib.util
 import logging
-from typing import Dict, Any, List
-try:
-    import requests
-except ImportError:
-    print("⚠️  requests library not found. Install with: pip install requests")
-    requests = None
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlencode
+
+import httpx
 
 from app.utils.config import get_settings
+from app.core.meeting_store import meeting_store
+from app.core.metrics import CACHE_LOOKUPS, RECALL_RETRIES
+from app.core.tracing import traced, SPAN_KIND_CLIENT
 
 logger = logging.getLogger(__name__)
+
+# httpx speaks HTTP/2 only with h2 installed (the httpx[http2] extra)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+if not HTTP2_AVAILABLE:
+    logger.warning("⚠️  h2 not found, Recall API calls use HTTP/1.1. Install with: pip install 'httpx[http2]'")
 settings = get_settings()
 
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+# A POST that reached Recall may have created a bot even if the response was
+# lost, so non-idempotent requests are only retried when they were refused
+# before being processed: throttled, or the connection never opened
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# How long a cached bot stays fresh, by status (others use RECALL_BOT_CACHE_TTL_SECONDS).
+# Statuses about to change are cached briefly; final statuses never change
+# (but a done bot is refetched until its transcript link appears).
+BOT_CACHE_TTLS = {
+    "ready": 30,
+    "waiting_to_join": 30,
+    "in_call_recording": 10,
+    "call_ended": 2,
+    "recording_done": 2
+}
+
+# Bot status codes that end a recording
+DONE_STATUSES = {"done", "completed", "finished"}
+FAILED_STATUSES = {"failed", "error", "fatal"}
+
+
+def bot_status_code(bot_data: Dict[str, Any]) -> str:
+    """Current status code of a bot from its API representation"""
+    status_changes = bot_data.get('status_changes', [])
+    if status_changes:
+        return status_changes[-1].get('code', 'unknown')
+    # When status_changes is empty, bot is in initial state
+    # Check if bot has recordings to determine if it's done
+    return 'done' if bot_data.get('recordings', []) else 'waiting_to_join'
+
+
+def bot_summary(bot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Status fields of a bot as returned by get_bot_status (without the raw data)"""
+    # Parse the meeting_url object
+    meeting_url_obj = bot_data.get("meeting_url", {})
+    if isinstance(meeting_url_obj, dict):
+        meeting_url_str = f"https://{meeting_url_obj.get('platform', 'unknown')}.com/{meeting_url_obj.get('meeting_id', '')}"
+    else:
+        meeting_url_str = str(meeting_url_obj)
+
+    return {
+        "bot_id": bot_data.get("id"),
+        "status": bot_status_code(bot_data),
+        "meeting_url": meeting_url_str,
+        "bot_name": bot_data.get("bot_name"),
+        "created_at": bot_data.get("join_at"),
+        "status_changes": bot_data.get("status_changes", [])
+    }
+
+
+@dataclass
+class CachedBot:
+    """One bot's API representation and when it was fetched"""
+    data: Dict[str, Any]
+    status: str
+    fetched_at: float
+
 
 class RecallAIBot:
     """
@@ -25,20 +99,61 @@ class RecallAIBot:
     - Create a bot that joins meetings
     - Monitor the recording status
     - Extract download URLs for video and transcript
+
+    API methods are coroutines sharing one keep-alive connection pool
+    (HTTP/2 when h2 is installed); 429s, and gateway errors on requests
+    safe to repeat, are retried with backoff that honours Retry-After.
+
+    `/bot/{id}` responses are cached per bot with a TTL that depends on the
+    bot's status (final statuses never expire once the transcript is
+    available), and concurrent lookups of the same bot share one request.
+    Webhook deliveries call `invalidate`.
     """
 
-    def __init__(self, api_key, base_url='https://us-west-2.recall.ai/api/v1'):
+    def __init__(
+        self,
+        api_key,
+        base_url='https://us-west-2.recall.ai/api/v1',
+        max_connections=50,
+        timeout=30.0,
+        connect_timeout=5.0,
+        max_retries=3,
+        retry_base_delay=0.5,
+        retry_max_delay=30.0,
+        cache_ttl=5.0,
+        cache_size=2048
+    ):
         """
         Initialize the RecallAI bot with API credentials.
 
         Args:
             api_key (str): Your Recall AI API key
             base_url (str): The base URL for Recall AI API (optional)
+            max_connections (int): Size of the shared connection pool
+            timeout (float): Per-request timeout in seconds
+            connect_timeout (float): Connection timeout in seconds
+            max_retries (int): Retries for 429/5xx responses and connection errors
+            retry_base_delay (float): First backoff delay in seconds (doubles per retry)
+            retry_max_delay (float): Upper bound on any single backoff, Retry-After included
+            cache_ttl (float): Freshness of cached bots in statuses without their own TTL
+            cache_size (int): Bots kept in the cache (least recently used are dropped)
         """
         self.api_key = api_key
         self.base_url = base_url
         self.bot_id = None  # Will store the current bot ID
-        self.bot_data = None  # Will store the full bot data from API
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._http_client = httpx.AsyncClient(
+            headers=self._get_headers(),
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout)
+        )
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._bots: "OrderedDict[str, CachedBot]" = OrderedDict()  # bot_id -> last response
+        self._inflight: Dict[str, asyncio.Future] = {}  # bot_id -> shared fetch
 
     def _get_headers(self):
         """
@@ -53,7 +168,116 @@ class RecallAIBot:
             'Content-Type': 'application/json'
         }
     
-    def create_bot(self, meeting_url, bot_name='Lemur AI Bot'):
+    def _retry_delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, never shorter than a Retry-After header"""
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                try:
+                    wait = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    wait = 0.0
+            delay = max(delay, min(wait, self.retry_max_delay))
+        return delay
+
+    async def _request(self, method, url, **kwargs):
+        """
+        Send a request on the shared pool, retrying throttling and transient failures
+
+        Returns the final response whatever its status; callers decide what an
+        error status means (e.g. 405 from delete_bot). Non-idempotent methods
+        (creating a bot) are only retried on 429 and connection failures, so
+        a request Recall may have acted on is never sent twice.
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._http_client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                if attempt == self.max_retries or not (idempotent or isinstance(e, UNSENT_ERRORS)):
+                    raise
+                reason, delay = type(e).__name__, self._retry_delay(attempt)
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRYABLE_STATUS_CODES
+                )
+                if not retryable or attempt == self.max_retries:
+                    return response
+                reason, delay = str(response.status_code), self._retry_delay(attempt, response)
+
+            RECALL_RETRIES.inc(reason=reason)
+            logger.warning(
+                "Recall API %s %s failed (%s), retry %d/%d in %.2fs",
+                method, url, reason, attempt + 1, self.max_retries, delay
+            )
+            await asyncio.sleep(delay)
+
+    def _fresh(self, cached, max_age=None):
+        """Whether a cached bot can be served (max_age caps the status TTL)"""
+        if cached.status in DONE_STATUSES and self.extract_download_urls(cached.data)[1] is None:
+            # Recall can report done before the transcript is ready; keep asking until it is
+            return False
+        if cached.status in DONE_STATUSES or cached.status in FAILED_STATUSES:
+            ttl = max_age
+        else:
+            ttl = BOT_CACHE_TTLS.get(cached.status, self.cache_ttl)
+            if max_age is not None:
+                ttl = min(ttl, max_age)
+        return ttl is None or time.monotonic() - cached.fetched_at <= ttl
+
+    def cache_bot(self, bot_data):
+        """Store a bot's API representation (also used for bots read from list_bots)"""
+        bot_id = bot_data.get('id')
+        if not bot_id:
+            return
+        self._bots[bot_id] = CachedBot(bot_data, bot_status_code(bot_data), time.monotonic())
+        self._bots.move_to_end(bot_id)
+        while len(self._bots) > self.cache_size:
+            self._bots.popitem(last=False)
+
+    def invalidate(self, bot_id):
+        """Forget a bot so the next lookup refetches it (and ignores any fetch in flight)"""
+        self._bots.pop(bot_id, None)
+        self._inflight.pop(bot_id, None)
+
+    async def _fetch_bot(self, bot_id):
+        response = await self._request('GET', f'{self.base_url}/bot/{bot_id}')
+        response.raise_for_status()
+        bot_data = response.json()
+        if self._inflight.get(bot_id) is asyncio.current_task():
+            self.cache_bot(bot_data)  # not invalidated while we were waiting
+        return bot_data
+
+    async def _load_bot(self, bot_id, max_age=None, force_refresh=False):
+        """Bot data from the cache, a fetch already in flight, or a new request"""
+        cached = self._bots.get(bot_id)
+        if cached is not None and not force_refresh and self._fresh(cached, max_age):
+            self._bots.move_to_end(bot_id)
+            CACHE_LOOKUPS.inc(cache="recall_bot", result="hit")
+            return cached.data
+
+        fetch = self._inflight.get(bot_id)
+        if fetch is not None:
+            CACHE_LOOKUPS.inc(cache="recall_bot", result="coalesced")
+        else:
+            CACHE_LOOKUPS.inc(cache="recall_bot", result="miss")
+            fetch = asyncio.ensure_future(self._fetch_bot(bot_id))
+            self._inflight[bot_id] = fetch
+            fetch.add_done_callback(
+                lambda done: self._inflight.pop(bot_id, None) if self._inflight.get(bot_id) is done else None
+            )
+        # Shielded so one cancelled caller doesn't fail the others sharing the fetch
+        return await asyncio.shield(fetch)
+
+    async def aclose(self):
+        """Close the shared connection pool"""
+        await self._http_client.aclose()
+
+    @traced("recall.create_bot", kind=SPAN_KIND_CLIENT)
+    async def create_bot(self, meeting_url, bot_name='Lemur AI Bot'):
         """
         Create a bot and send it to join the meeting.
 
@@ -65,7 +289,7 @@ class RecallAIBot:
             dict: Success status and bot information
         """
         try:
-            logger.info(f'🎬 Creating bot for meeting: {meeting_url}')
+            logger.info('🎬 Creating bot for meeting: %s', meeting_url)
 
             bot_config = {
                 'meeting_url': meeting_url,
@@ -78,14 +302,21 @@ class RecallAIBot:
                     }
                 }
             }
-
-            response = requests.post(f'{self.base_url}/bot', json=bot_config, headers=self._get_headers())
+            if settings.recall_realtime_url and settings.recall_realtime_token:
+                # Transcript segments are pushed to /webhooks/recall/transcript while the bot records
+                separator = '&' if '?' in settings.recall_realtime_url else '?'
+                realtime_url = f"{settings.recall_realtime_url}{separator}{urlencode({'token': settings.recall_realtime_token})}"
+                bot_config['recording_config']['realtime_endpoints'] = [
+                    {'type': 'webhook', 'url': realtime_url, 'events': ['transcript.data']}
+                ]
+
+            response = await self._request('POST', f'{self.base_url}/bot', json=bot_config)
             response.raise_for_status()
 
             bot_data = response.json()
             self.bot_id = bot_data['id']  # Store bot_id in the instance
 
-            logger.info(f'✅ Bot created: {self.bot_id}')
+            logger.info('✅ Bot created: %s', self.bot_id)
             logger.info('🤖 Bot is joining the meeting...')
 
             # Parse the meeting_url object for response
@@ -106,14 +337,15 @@ class RecallAIBot:
             }
 
         except Exception as e:
-            logger.error(f'❌ Error creating bot: {e}')
+            logger.error('❌ Error creating bot: %s', e)
             return {
                 "success": False,
                 "error": "Bot creation error",
                 "detail": str(e)
             }
     
-    def get_bot_status(self, bot_id=None):
+    @traced("recall.get_bot_status", kind=SPAN_KIND_CLIENT)
+    async def get_bot_status(self, bot_id=None):
         """
         Get the current status of a bot.
 
@@ -133,56 +365,31 @@ class RecallAIBot:
                     "error": "No bot_id provided and no current bot available"
                 }
 
-            response = requests.get(f'{self.base_url}/bot/{bot_id}', headers=self._get_headers())
-            response.raise_for_status()
-
-            bot_data = response.json()
-            status_changes = bot_data.get('status_changes', [])
-
-            if status_changes:
-                current_status = status_changes[-1].get('code', 'unknown')
-            else:
-                # When status_changes is empty, bot is in initial state
-                # Check if bot has recordings to determine if it's done
-                recordings = bot_data.get('recordings', [])
-                if recordings:
-                    current_status = 'done'
-                else:
-                    current_status = 'waiting_to_join'
-
-            # Parse the meeting_url object
-            meeting_url_obj = bot_data.get("meeting_url", {})
-            if isinstance(meeting_url_obj, dict):
-                meeting_url_str = f"https://{meeting_url_obj.get('platform', 'unknown')}.com/{meeting_url_obj.get('meeting_id', '')}"
-            else:
-                meeting_url_str = str(meeting_url_obj)
-
+            bot_data = await self._load_bot(bot_id)
             return {
                 "success": True,
+                **bot_summary(bot_data),
                 "bot_id": bot_id,
-                "status": current_status,
-                "meeting_url": meeting_url_str,
-                "bot_name": bot_data.get("bot_name"),
-                "created_at": bot_data.get("join_at"),
-                "status_changes": status_changes,
                 "data": bot_data
             }
 
         except Exception as e:
-            logger.error(f"❌ Error getting bot status: {e}")
+            logger.error("❌ Error getting bot status: %s", e)
             return {
                 "success": False,
                 "error": "Bot status error",
                 "detail": str(e)
             }
     
-    def get_bot_data(self, bot_id=None, force_refresh=False):
+    @traced("recall.get_bot_data", kind=SPAN_KIND_CLIENT)
+    async def get_bot_data(self, bot_id=None, force_refresh=False, max_age=None):
         """
-        Get full bot data including recordings. Caches the data for efficiency.
+        Get full bot data including recordings. Caches the data per bot for efficiency.
 
         Args:
             bot_id (str): Bot ID to get data for (optional, uses current bot if not provided)
             force_refresh (bool): If True, fetches fresh data from API even if cached
+            max_age (float): Oldest cached data (in seconds) to accept, even for finished bots
 
         Returns:
             dict: Complete bot data from the API
@@ -195,21 +402,12 @@ class RecallAIBot:
                 "error": "No bot_id provided and no current bot available"
             }
 
-        # Return cached data if available and not forcing refresh
-        if self.bot_data and not force_refresh:
-            return {"success": True, "data": self.bot_data}
-
         try:
-            # Fetch fresh data from API
-            response = requests.get(f'{self.base_url}/bot/{bot_id}', headers=self._get_headers())
-            response.raise_for_status()
-
-            # Cache the data
-            self.bot_data = response.json()
-            return {"success": True, "data": self.bot_data}
+            bot_data = await self._load_bot(bot_id, max_age=max_age, force_refresh=force_refresh)
+            return {"success": True, "data": bot_data}
 
         except Exception as e:
-            logger.error(f"❌ Error getting bot data: {e}")
+            logger.error("❌ Error getting bot data: %s", e)
             return {
                 "success": False,
                 "error": "Bot data error",
@@ -248,7 +446,8 @@ class RecallAIBot:
 
         return video_url, transcript_url
 
-    def get_download_urls(self, bot_id=None) -> Dict[str, Any]:
+    @traced("recall.get_download_urls", kind=SPAN_KIND_CLIENT)
+    async def get_download_urls(self, bot_id=None) -> Dict[str, Any]:
         """Get download URLs for bot recordings"""
         try:
             bot_id = bot_id or self.bot_id
@@ -259,8 +458,9 @@ class RecallAIBot:
                     "error": "No bot_id provided and no current bot available"
                 }
 
-            # Get fresh bot data
-            bot_data_result = self.get_bot_data(bot_id, force_refresh=True)
+            # Recent bot data; download links are pre-signed and expire, so even
+            # a finished bot is refetched once its cached copy is too old
+            bot_data_result = await self.get_bot_data(bot_id, max_age=settings.recall_download_url_max_age_seconds)
             if not bot_data_result["success"]:
                 return bot_data_result
 
@@ -285,14 +485,15 @@ class RecallAIBot:
             }
 
         except Exception as e:
-            logger.error(f"❌ Error getting download URLs: {e}")
+            logger.error("❌ Error getting download URLs: %s", e)
             return {
                 "success": False,
                 "error": "Download URLs error",
                 "detail": str(e)
             }
     
-    def delete_bot(self, bot_id=None) -> Dict[str, Any]:
+    @traced("recall.delete_bot", kind=SPAN_KIND_CLIENT)
+    async def delete_bot(self, bot_id=None) -> Dict[str, Any]:
         """Delete/stop a Recall AI bot (only works for scheduled bots that haven't joined)"""
         try:
             bot_id = bot_id or self.bot_id
@@ -303,10 +504,11 @@ class RecallAIBot:
                     "error": "No bot_id provided and no current bot available"
                 }
 
-            response = requests.delete(f'{self.base_url}/bot/{bot_id}', headers=self._get_headers())
+            self.invalidate(bot_id)
+            response = await self._request('DELETE', f'{self.base_url}/bot/{bot_id}')
 
             if response.status_code == 204:
-                logger.info(f"✅ Recall AI bot deleted successfully: {bot_id}")
+                logger.info("✅ Recall AI bot deleted successfully: %s", bot_id)
                 return {
                     "success": True,
                     "bot_id": bot_id,
@@ -318,7 +520,7 @@ class RecallAIBot:
                 try:
                     error_data = response.json()
                     if "cannot_delete_bot" in error_data.get("code", ""):
-                        logger.info(f"ℹ️  Bot {bot_id} cannot be deleted (already joined meeting)")
+                        logger.info("ℹ️  Bot %s cannot be deleted (already joined meeting)", bot_id)
                         return {
                             "success": True,  # Consider this success since bot is active
                             "bot_id": bot_id,
@@ -334,7 +536,7 @@ class RecallAIBot:
                     "detail": response.text
                 }
             else:
-                logger.error(f"❌ Failed to delete bot: {response.status_code} - {response.text}")
+                logger.error("❌ Failed to delete bot: %s - %s", response.status_code, response.text)
                 return {
                     "success": False,
                     "error": f"Failed to delete bot: {response.status_code}",
@@ -342,29 +544,47 @@ class RecallAIBot:
                 }
 
         except Exception as e:
-            logger.error(f"❌ Error deleting bot: {e}")
+            logger.error("❌ Error deleting bot: %s", e)
             return {
                 "success": False,
                 "error": "Bot deletion error",
                 "detail": str(e)
             }
     
-    def list_bots(self) -> Dict[str, Any]:
-        """List all bots for the API key"""
+    @traced("recall.list_bots", kind=SPAN_KIND_CLIENT)
+    async def list_bots(self, join_at_after: Optional[str] = None, max_pages: int = 1) -> Dict[str, Any]:
+        """
+        List bots for the API key, following `next` links for up to `max_pages` pages
+
+        Args:
+            join_at_after (str): Only bots joining after this ISO timestamp (optional)
+            max_pages (int): Page limit; `complete` is False if more pages were left
+        """
         try:
-            response = requests.get(f'{self.base_url}/bot', headers=self._get_headers())
-            response.raise_for_status()
+            url = f'{self.base_url}/bot'
+            params = {'join_at_after': join_at_after} if join_at_after else None
+            bots: List[Dict[str, Any]] = []
+            bots_data: Dict[str, Any] = {}
+            for _ in range(max_pages):
+                response = await self._request('GET', url, params=params)
+                response.raise_for_status()
+
+                bots_data = response.json()
+                bots.extend(bots_data.get("results", []))
+                url, params = bots_data.get("next"), None  # `next` already carries the query
+                if not url:
+                    break
 
-            bots_data = response.json()
             return {
                 "success": True,
-                "bots": bots_data.get("results", []),
-                "total_count": bots_data.get("count", 0),
+                "bots": bots,
+                "total_count": bots_data.get("count", len(bots)),
+                "complete": not url,
                 "data": bots_data
             }
 
         except Exception as e:
-            logger.error(f"❌ Error listing bots: {e}")
+            logger.error("❌ Error listing bots: %s", e)
             return {
                 "success": False,
                 "error": "Bot listing error",
@@ -373,59 +593,61 @@ class RecallAIBot:
 
 
 # Global Recall AI service instance
-recall_service = RecallAIBot(settings.recall_api_key)
-
-
-# In-memory storage for user-bot mapping (in production, use database)
-user_bots: Dict[str, List[str]] = {}  # user_id -> list of bot_ids
-
-
-def get_user_bots(user_id: str) -> List[str]:
+recall_service = RecallAIBot(
+    settings.recall_api_key,
+    settings.recall_base_url,
+    max_connections=settings.recall_max_connections,
+    timeout=settings.recall_timeout_seconds,
+    max_retries=settings.recall_max_retries,
+    retry_max_delay=settings.recall_retry_max_delay,
+    cache_ttl=settings.recall_bot_cache_ttl_seconds,
+    cache_size=settings.recall_bot_cache_size
+)
+
+
+async def get_user_bots(user_id: str) -> List[str]:
     """Get bot IDs for a specific user"""
-    return user_bots.get(user_id, [])
+    return await meeting_store.get_user_bots(user_id)
 
 
-def add_user_bot(user_id: str, bot_id: str):
+async def add_user_bot(user_id: str, bot_id: str):
     """Add a bot ID to a user's bot list"""
-    if user_id not in user_bots:
-        user_bots[user_id] = []
-    user_bots[user_id].append(bot_id)
+    await meeting_store.add_user_bot(user_id, bot_id)
 
 
-def remove_user_bot(user_id: str, bot_id: str):
+async def remove_user_bot(user_id: str, bot_id: str):
     """Remove a bot ID from a user's bot list"""
-    if user_id in user_bots and bot_id in user_bots[user_id]:
-        user_bots[user_id].remove(bot_id)
+    await meeting_store.remove_user_bot(user_id, bot_id)
 
 
-def cleanup_old_bots(user_id: str) -> Dict[str, Any]:
+async def cleanup_old_bots(user_id: str) -> Dict[str, Any]:
     """Cleanup old/inactive bots for a user"""
     try:
-        user_bot_ids = get_user_bots(user_id)
+        user_bot_ids = await get_user_bots(user_id)
         cleaned_up = 0
 
         for bot_id in user_bot_ids.copy():
-            status_result = recall_service.get_bot_status(bot_id)
+            status_result = await recall_service.get_bot_status(bot_id)
             if status_result["success"]:
                 status = status_result["status"]
                 # Clean up bots that are done, failed, or error
                 # Note: Most active bots cannot be deleted from Recall AI, so we just remove from our tracking
                 if status in ["done", "failed", "error", "fatal"]:
                     # Try to delete from Recall AI (may fail, that's OK)
-                    delete_result = recall_service.delete_bot(bot_id)
+                    delete_result = await recall_service.delete_bot(bot_id)
                     # Remove from our tracking regardless
-                    remove_user_bot(user_id, bot_id)
+                    await remove_user_bot(user_id, bot_id)
                     cleaned_up += 1
-                    logger.info(f"🧹 Cleaned up bot {bot_id} with status {status}")
+                    logger.info("🧹 Cleaned up bot %s with status %s", bot_id, status)
 
         return {
             "success": True,
             "cleaned_up": cleaned_up,
-            "remaining_bots": len(get_user_bots(user_id))
+            "remaining_bots": len(await get_user_bots(user_id))
         }
 
     except Exception as e:
-        logger.error(f"❌ Error cleaning up bots: {e}")
+        logger.error("❌ Error cleaning up bots: %s", e)
         return {
             "success": False,
             "error": "Cleanup error",
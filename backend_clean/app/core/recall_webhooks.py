@@ -0,0 +1,120 @@
+"""
+Recall AI webhook verification for Lemur AI
+Checks Svix signatures on incoming Recall deliveries and extracts bot
+status changes and real-time transcript segments from the event payloads
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.core.transcript import TranscriptSegment, segment_from_entry
+
+logger = logging.getLogger(__name__)
+
+# Deliveries signed further than this from our clock are rejected (replay protection)
+DEFAULT_TOLERANCE_SECONDS = 300
+
+
+class WebhookVerificationError(Exception):
+    """Raised when a webhook delivery is unsigned, stale or forged"""
+
+
+def _secret_bytes(secret: str) -> bytes:
+    # Svix secrets are "whsec_" + base64; anything else is used verbatim
+    if secret.startswith("whsec_"):
+        try:
+            return base64.b64decode(secret[len("whsec_"):], validate=True)
+        except binascii.Error:
+            raise WebhookVerificationError("Webhook secret is not valid base64 (check RECALL_WEBHOOK_SECRET)")
+    return secret.encode("utf-8")
+
+
+def verify_webhook(
+    secret: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    tolerance_seconds: int = DEFAULT_TOLERANCE_SECONDS
+) -> str:
+    """
+    Verify a Svix-signed delivery and return its message ID
+
+    The signature is base64(HMAC-SHA256(secret, "{id}.{timestamp}.{body}")),
+    sent as space-separated "v1,<signature>" entries so secrets can be
+    rotated. Both the svix-* and the standard webhook-* header names are
+    accepted.
+    """
+    def header(name: str) -> Optional[str]:
+        return headers.get(f"svix-{name}") or headers.get(f"webhook-{name}")
+
+    message_id, timestamp, signatures = header("id"), header("timestamp"), header("signature")
+    if not message_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing signature headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid signature timestamp")
+    if abs(time.time() - sent_at) > tolerance_seconds:
+        raise WebhookVerificationError("Signature timestamp outside tolerance")
+
+    signed = f"{message_id}.{timestamp}.".encode("utf-8") + body
+    expected = base64.b64encode(hmac.new(_secret_bytes(secret), signed, hashlib.sha256).digest()).decode()
+    for entry in signatures.split():
+        version, _, signature = entry.partition(",")
+        if version == "v1" and hmac.compare_digest(signature, expected):
+            return message_id
+    raise WebhookVerificationError("No matching signature")
+
+
+def parse_bot_status_event(payload: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """
+    (bot_id, status code) from a Recall bot event, or None for other events
+
+    Handles the `bot.status_change` event ({"data": {"bot": {...}, "status":
+    {"code": ...}}}) and the per-status `bot.<code>` events ({"data": {"bot":
+    {...}, "data": {"code": ...}}}).
+    """
+    event = payload.get("event") or ""
+    data = payload.get("data") or {}
+    bot = data.get("bot") or {}
+    bot_id = bot.get("id") or data.get("bot_id")
+    if not event.startswith("bot.") or not bot_id:
+        return None
+
+    if event == "bot.status_change":
+        code = (data.get("status") or {}).get("code")
+    else:
+        code = (data.get("data") or {}).get("code") or event[len("bot."):]
+    return (bot_id, code) if code else None
+
+
+def parse_transcript_event(payload: Dict[str, Any]) -> Optional[Tuple[str, TranscriptSegment]]:
+    """
+    (bot_id, speaker turn) from a Recall real-time transcript event, or None
+
+    Handles `transcript.data` ({"data": {"bot": {...}, "data": {"words":
+    [...], "participant": {...}}}}) and the legacy `bot.transcription`
+    event ({"data": {"bot_id": ..., "transcript": {"speaker": ..., "words":
+    [...], "is_final": ...}}}). Partial results are skipped; the final
+    delivery for the same turn follows.
+    """
+    event = payload.get("event") or ""
+    data = payload.get("data") or {}
+    if event == "transcript.data":
+        bot_id = (data.get("bot") or {}).get("id")
+        entry = data.get("data") or {}
+    elif event == "bot.transcription":
+        bot_id = data.get("bot_id") or (data.get("bot") or {}).get("id")
+        entry = data.get("transcript") or {}
+        if entry.get("is_final") is False:
+            return None
+    else:
+        return None
+
+    segment = segment_from_entry(entry) if bot_id and isinstance(entry, dict) else None
+    return (bot_id, segment) if segment else None
@@ -0,0 +1,387 @@
+"""
+Request-scoped tracing for Lemur AI
+Lightweight spans with OpenTelemetry/W3C-compatible identifiers and
+pluggable exporters (in-memory for tests, JSON log lines for production)
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Span kinds mirror the OpenTelemetry SpanKind values
+SPAN_KIND_INTERNAL = "internal"
+SPAN_KIND_SERVER = "server"
+SPAN_KIND_CLIENT = "client"
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("lemur_current_span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("lemur_request_id", default=None)
+
+
+def new_request_id() -> str:
+    """Generate a new request ID"""
+    return secrets.token_hex(8)
+
+
+def get_request_id() -> Optional[str]:
+    """Request ID for the current context (propagates into create_task)"""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Bind a request ID to the current context, returning the reset token"""
+    return _request_id.set(request_id)
+
+
+def get_current_span() -> Optional["Span"]:
+    """Innermost open span for the current context"""
+    return _current_span.get()
+
+
+class Span:
+    """A single timed operation inside a trace"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "remote_parent", "name", "kind", "attributes",
+        "start_ns", "end_ns", "status", "error", "request_id"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        kind: str = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        remote_parent: bool = False
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.remote_parent = remote_parent  # parent_id is an upstream service's span (from traceparent)
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "unset"
+        self.error: Optional[str] = None
+        self.request_id = request_id
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        """Mark the span as failed"""
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    @property
+    def is_local_root(self) -> bool:
+        """First span of its trace in this process (any parent is upstream)"""
+        return self.parent_id is None or self.remote_parent
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "remote_parent": self.remote_parent,
+            "kind": self.kind,
+            "request_id": self.request_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory (used by tests and the debug router)"""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: deque = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self):
+        self.clear()
+
+
+class LoggingSpanExporter:
+    """Writes each finished span as a JSON line on the `lemur.traces` logger"""
+
+    def __init__(self):
+        self._logger = logging.getLogger("lemur.traces")
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            self._logger.info(json.dumps(span.to_dict(), default=str))
+
+    def shutdown(self):
+        pass
+
+
+class SlowTraceCollector:
+    """
+    Groups spans by trace and keeps whole traces whose root span was slow
+
+    Spans that finish after their root (background tasks) are appended to a
+    kept trace; for fast traces they are dropped.
+    """
+
+    def __init__(self, threshold_ms: float, max_traces: int = 100, max_pending: int = 1000):
+        self.threshold_ms = threshold_ms
+        self._pending: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._finished: "OrderedDict[str, Optional[List[Span]]]" = OrderedDict()
+        self._slow: deque = deque(maxlen=max_traces)
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            for span in spans:
+                self._add(span)
+
+    def _add(self, span: Span):
+        if span.trace_id in self._finished:
+            kept = self._finished[span.trace_id]
+            if kept is not None:
+                kept.append(span)
+            return
+
+        bucket = self._pending.setdefault(span.trace_id, [])
+        bucket.append(span)
+        if len(self._pending) > self._max_pending:
+            self._pending.popitem(last=False)
+
+        if span.is_local_root:
+            spans = self._pending.pop(span.trace_id, [])
+            kept = None
+            if span.duration_ms >= self.threshold_ms:
+                kept = spans
+                self._slow.append({"trace_id": span.trace_id, "root": span, "spans": spans})
+                logger.warning(
+                    "Slow trace %s (%s) took %.0f ms across %d spans",
+                    span.trace_id, span.name, span.duration_ms, len(spans)
+                )
+            self._finished[span.trace_id] = kept
+            if len(self._finished) > self._max_pending:
+                self._finished.popitem(last=False)
+
+    def get_slow_traces(self) -> List[Dict[str, Any]]:
+        """Kept traces, oldest first, with spans ordered by start time"""
+        with self._lock:
+            traces = list(self._slow)
+        return [
+            {
+                "trace_id": trace["trace_id"],
+                "request_id": trace["root"].request_id,
+                "root": trace["root"].name,
+                "duration_ms": round(trace["root"].duration_ms, 3),
+                "spans": [s.to_dict() for s in sorted(trace["spans"], key=lambda s: s.start_ns)]
+            }
+            for trace in traces
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._finished.clear()
+            self._slow.clear()
+
+    def shutdown(self):
+        self.clear()
+
+
+# ============================================================================
+# TRACER
+# ============================================================================
+
+class Tracer:
+    """Creates spans and hands finished spans to the registered exporters"""
+
+    def __init__(self):
+        self._exporters: List[Any] = []
+
+    def add_exporter(self, exporter):
+        """Register an exporter (anything with export(spans) and shutdown())"""
+        self._exporters.append(exporter)
+        return exporter
+
+    def remove_exporter(self, exporter):
+        if exporter in self._exporters:
+            self._exporters.remove(exporter)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        traceparent: Optional[str] = None
+    ):
+        """
+        Open a span as a child of the current one
+
+        A `traceparent` header value starts the span inside an upstream trace,
+        as a child of the caller's span.
+        """
+        parent = _current_span.get()
+        trace_id, parent_id, remote_parent = None, None, False
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif traceparent:
+            match = _TRACEPARENT_RE.match(traceparent.strip().lower())
+            if match:
+                trace_id, parent_id, remote_parent = match.group(1), match.group(2), True
+        span = Span(
+            name,
+            trace_id=trace_id or secrets.token_hex(16),
+            parent_id=parent_id,
+            kind=kind,
+            attributes=attributes,
+            request_id=get_request_id(),
+            remote_parent=remote_parent
+        )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            if not isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+                span.record_exception(exc)
+            raise
+        finally:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Closed from a different context (e.g. a streamed response)
+                pass
+            span.end_ns = time.time_ns()
+            if span.status == "unset":
+                span.status = "ok"
+            self._export(span)
+
+    def _export(self, span: Span):
+        for exporter in self._exporters:
+            try:
+                exporter.export([span])
+            except Exception as e:
+                logger.debug("Span exporter %r failed: %s", exporter, e)
+
+
+# Global tracer and default exporters
+tracer = Tracer()
+slow_traces = tracer.add_exporter(SlowTraceCollector(settings.tracing_slow_threshold_ms))
+if settings.tracing_exporter == "log":
+    tracer.add_exporter(LoggingSpanExporter())
+elif settings.tracing_exporter == "memory":
+    tracer.add_exporter(InMemorySpanExporter())
+
+
+def traced(name: Optional[str] = None, kind: str = SPAN_KIND_INTERNAL):
+    """
+    Decorator that wraps a sync or async function in a span
+
+    Usage:
+        @traced("openai.embeddings", kind=SPAN_KIND_CLIENT)
+        def create_embeddings(...):
+    """
+    def decorator(func: Callable):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with tracer.start_span(span_name, kind=kind):
+                return func(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator
+
+
+def create_traced_task(coro: Awaitable, name: str, open_span: bool = True) -> asyncio.Task:
+    """
+    asyncio.create_task that keeps the request ID and links to the caller's trace
+
+    The task inherits the caller's context, so the request ID survives after
+    the request returns. Background work usually outlives the request span, so
+    it gets its own root span (and slow-trace accounting) with an OpenTelemetry
+    style link back to the span that spawned it. Long-lived loops pass
+    open_span=False so each iteration's spans become their own short traces.
+    """
+    parent = _current_span.get()
+    attributes = {"background": True}
+    if parent is not None:
+        attributes["link.trace_id"] = parent.trace_id
+        attributes["link.span_id"] = parent.span_id
+
+    async def runner():
+        _current_span.set(None)
+        if not open_span:
+            return await coro
+        with tracer.start_span(name, attributes=attributes):
+            return await coro
+
+    return asyncio.create_task(runner(), name=name)
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id/trace_id to every log record for correlation"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current_span.get()
+        record.request_id = get_request_id() or "-"
+        record.trace_id = span.trace_id if span else "-"
+        return True
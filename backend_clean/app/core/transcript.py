@@ -0,0 +1,224 @@
+"""
+Meeting transcript parsing
+Normalises Recall AI transcript downloads (current and legacy JSON formats)
+and plain-text transcripts into speaker segments, all at once or
+incrementally as a download streams in
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+_SPEAKER_LINE_RE = re.compile(r"^\s*(?:\[(?P<ts>[\d:.]+)\]\s*)?(?P<speaker>[^:\[\]]{1,60}):\s+(?P<text>.+)$")
+
+
+@dataclass
+class TranscriptSegment:
+    """One speaker turn; times are seconds from the start of the recording"""
+    speaker: str
+    start: Optional[float]
+    end: Optional[float]
+    text: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English)"""
+    return max(1, len(text) // 4)
+
+
+def format_timestamp(seconds: float) -> str:
+    """mm:ss (or h:mm:ss) for a transcript offset"""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+def _parse_timestamp(value: str) -> Optional[float]:
+    parts = value.split(":")
+    try:
+        total = 0.0
+        for part in parts:
+            total = total * 60 + float(part)
+        return total
+    except ValueError:
+        return None
+
+
+def _word_time(word: Dict[str, Any], key: str) -> Optional[float]:
+    """Word offset from either format: {start_timestamp: {relative}} or start_time"""
+    stamp = word.get(f"{key}_timestamp")
+    if isinstance(stamp, dict) and stamp.get("relative") is not None:
+        return float(stamp["relative"])
+    if word.get(f"{key}_time") is not None:
+        return float(word[f"{key}_time"])
+    return None
+
+
+def segment_from_entry(entry: Dict[str, Any]) -> Optional[TranscriptSegment]:
+    """Convert one Recall transcript entry (a speaker turn with timed words)"""
+    participant = entry.get("participant")
+    if isinstance(participant, dict):
+        speaker = participant.get("name") or f"Speaker {participant.get('id', '?')}"
+    else:
+        speaker = entry.get("speaker") or "Unknown"
+
+    words = entry.get("words") or []
+    if words:
+        text = " ".join(str(w.get("text", "")).strip() for w in words if w.get("text"))
+        start, end = _word_time(words[0], "start"), _word_time(words[-1], "end")
+    else:
+        text = str(entry.get("text", "")).strip()
+        start, end = entry.get("start"), entry.get("end")
+
+    if not text:
+        return None
+    return TranscriptSegment(speaker=str(speaker), start=start, end=end, text=text)
+
+
+def _parse_plain_text(raw: str) -> List[TranscriptSegment]:
+    segments: List[TranscriptSegment] = []
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _SPEAKER_LINE_RE.match(line)
+        if match:
+            start = _parse_timestamp(match.group("ts")) if match.group("ts") else None
+            segments.append(TranscriptSegment(match.group("speaker").strip(), start, None, match.group("text").strip()))
+        elif segments and segments[-1].speaker != "Unknown":
+            segments[-1].text += " " + line
+        else:
+            segments.append(TranscriptSegment("Unknown", None, None, line))
+    return segments
+
+
+def parse_transcript(raw: str) -> List[TranscriptSegment]:
+    """
+    Parse a transcript download into segments
+
+    Accepts Recall JSON (a list of speaker turns, possibly wrapped in an
+    object) and falls back to "Speaker: text" lines for plain text.
+    """
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return _parse_plain_text(raw or "")
+
+    if isinstance(data, dict):
+        data = data.get("transcript") or data.get("segments") or data.get("results") or []
+    if isinstance(data, str):
+        return _parse_plain_text(data)
+    if not isinstance(data, list):
+        return []
+
+    segments = []
+    for entry in data:
+        if isinstance(entry, dict):
+            segment = segment_from_entry(entry)
+            if segment:
+                segments.append(segment)
+    return segments
+
+
+class TranscriptStreamParser:
+    """
+    Incremental transcript parser for streamed downloads
+
+    Text is fed in chunks as it arrives and each `feed` returns the speaker
+    turns completed so far, so only the turn being received is held in
+    memory rather than the whole download (per-word timings make Recall's
+    JSON many times larger than the text). A top-level JSON list of objects
+    (`[` then `{` or `]`) is decoded entry by entry with raw_decode;
+    anything else (a wrapping object, plain text that happens to start with
+    `[00:01]`, a list whose first entry is not JSON) is buffered and handed
+    to parse_transcript by `close`.
+    """
+
+    _SEPARATORS = " \t\r\n,"
+    _MAX_PARTIAL_TOKEN = 64  # longer undecodable text after the error position is malformed, not truncated
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._raw: Optional[str] = ""  # the whole download until the first entry decodes, for the fallback
+        self._streaming: Optional[bool] = None  # None until the text after the opening bracket arrives
+        self._finished = False
+
+    def feed(self, chunk: str) -> List[TranscriptSegment]:
+        self._buffer += chunk
+        if self._streaming is None:
+            head = self._buffer.lstrip()
+            if head[:1] == "[":
+                head = head[1:].lstrip()
+                if not head:
+                    return []
+                self._streaming = head[0] in "{]"
+            elif head:
+                self._streaming = False
+            else:
+                return []
+            if self._streaming:
+                self._raw = self._buffer
+                self._buffer = head
+            else:
+                self._raw = None
+        elif self._raw is not None:
+            self._raw += chunk
+        if not self._streaming or self._finished:
+            return []
+
+        segments: List[TranscriptSegment] = []
+        buffer, position = self._buffer, 0
+        while True:
+            while position < len(buffer) and buffer[position] in self._SEPARATORS:
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                self._finished = True
+                self._raw = None
+                position = len(buffer)
+                break
+            try:
+                entry, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if self._raw is not None and not self._truncated(e):
+                    # Not a JSON list after all: parse the whole download at the end instead
+                    self._streaming, self._buffer, self._raw = False, self._raw, None
+                    return []
+                break  # entry still arriving
+            self._raw = None
+            if isinstance(entry, dict):
+                segment = segment_from_entry(entry)
+                if segment:
+                    segments.append(segment)
+        self._buffer = buffer[position:]
+        return segments
+
+    @classmethod
+    def _truncated(cls, error: json.JSONDecodeError) -> bool:
+        """Whether decoding failed only because the entry has not fully arrived"""
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return len(error.doc) - error.pos <= cls._MAX_PARTIAL_TOKEN
+
+    def close(self) -> List[TranscriptSegment]:
+        """Segments still pending at the end of the download; ValueError if it was cut short"""
+        if not self._streaming:
+            return parse_transcript(self._buffer)
+        if not self._finished:
+            if self._raw is not None:
+                return parse_transcript(self._raw)  # the first entry never decoded
+            raise ValueError("Transcript JSON ended before its closing bracket")
+        return []
+
+
+def render_segments(segments: List[TranscriptSegment]) -> str:
+    """Compact prompt-ready transcript: `[mm:ss] Speaker: text` per turn"""
+    lines = []
+    for segment in segments:
+        prefix = f"[{format_timestamp(segment.start)}] " if segment.start is not None else ""
+        lines.append(f"{prefix}{segment.speaker}: {segment.text}")
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+"""
+Transcript downloads for Lemur AI
+Streams Recall transcript files over a shared connection pool, parsing
+speaker turns as the bytes arrive
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+import httpx
+
+from app.utils.config import get_settings
+from app.core.transcript import TranscriptSegment, TranscriptStreamParser
+from app.core.tracing import traced, SPAN_KIND_CLIENT
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TranscriptTooLarge(Exception):
+    """Raised when a download exceeds the configured size limit"""
+
+
+class TranscriptFetcher:
+    """
+    Downloads transcripts into normalised segments
+
+    Transcript links are pre-signed storage URLs, so this client carries no
+    Recall credentials. The body is parsed chunk by chunk and never held
+    whole; downloads are capped in size and total time so a multi-hour
+    transcript can't stall a worker or exhaust its memory.
+    """
+
+    def __init__(self, max_connections: int, timeout: float, max_bytes: int):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            follow_redirects=True
+        )
+
+    async def _stream(self, url: str) -> Optional[List[TranscriptSegment]]:
+        parser = TranscriptStreamParser()
+        segments: List[TranscriptSegment] = []
+        async with self._http_client.stream("GET", url) as response:
+            if response.status_code != 200:
+                logger.error("Failed to download transcript: %s", response.status_code)
+                return None
+            async for chunk in response.aiter_text():
+                if response.num_bytes_downloaded > self.max_bytes:
+                    raise TranscriptTooLarge(f"transcript exceeds {self.max_bytes} bytes")
+                segments.extend(parser.feed(chunk))
+            logger.debug(
+                "Downloaded transcript: %d bytes, %d segments", response.num_bytes_downloaded, len(segments)
+            )
+        segments.extend(parser.close())
+        return segments
+
+    @traced("transcript.download", kind=SPAN_KIND_CLIENT)
+    async def fetch(self, url: str) -> Optional[List[TranscriptSegment]]:
+        """Speaker segments of the transcript at `url`, or None if it could not be downloaded"""
+        try:
+            return await asyncio.wait_for(self._stream(url), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.error("Transcript download timed out after %.0fs", self.timeout)
+        except (httpx.HTTPError, TranscriptTooLarge, ValueError) as e:
+            logger.error("Error downloading transcript: %s", e)
+        return None
+
+    async def aclose(self):
+        await self._http_client.aclose()
+
+
+# Global transcript fetcher instance
+transcript_fetcher = TranscriptFetcher(
+    max_connections=settings.transcript_max_connections,
+    timeout=settings.transcript_download_timeout_seconds,
+    max_bytes=settings.transcript_max_download_bytes
+)
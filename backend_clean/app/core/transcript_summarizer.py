@@ -0,0 +1,383 @@
+"""
+Map-reduce summarisation for long meeting transcripts
+Splits a transcript into time/speaker windows, summarises the windows
+concurrently and merges the partial notes until they fit one prompt
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from app.utils.config import get_settings
+from app.core.transcript import (
+    TranscriptSegment, estimate_tokens, format_timestamp, parse_transcript, render_segments
+)
+from app.core.context_budget import count_tokens
+from app.core.llm_gateway import llm_gateway
+from app.core.model_router import model_router
+from app.core.tracing import traced
+from app.core.metrics import CACHE_LOOKUPS, GENERATION_STAGE_SECONDS, tenant_label, time_stage
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when the prompts change so cached notes are not reused across versions
+PROMPT_VERSION = "1"
+
+WINDOW_SUMMARY_PROMPT = """You are condensing one part of a long meeting transcript into notes that will later be used to write the meeting summary, action items and follow-up email.
+
+Keep, attributed to the speaker:
+- decisions and agreements
+- action items with owner and due date when stated
+- numbers, dates, prices and commitments, verbatim
+- open questions, risks and blockers
+
+Write concise bullet points. Do not add anything that is not in the transcript."""
+
+REDUCE_PROMPT = """You are merging consecutive notes from parts of the same meeting into one set of notes.
+
+Keep every decision, action item (with owner and due date), commitment, number and open question. Remove repetition and keep the chronological order. Write concise bullet points. Do not add anything that is not in the notes."""
+
+
+@dataclass
+class TranscriptWindow:
+    """Consecutive speaker turns summarised in one call"""
+    segments: List[TranscriptSegment]
+
+    @property
+    def start(self) -> Optional[float]:
+        return next((s.start for s in self.segments if s.start is not None), None)
+
+    @property
+    def end(self) -> Optional[float]:
+        for segment in reversed(self.segments):
+            if segment.end is not None:
+                return segment.end
+            if segment.start is not None:
+                return segment.start
+        return None
+
+    @property
+    def label(self) -> str:
+        if self.start is None:
+            return ""
+        return f"{format_timestamp(self.start)}-{format_timestamp(self.end)}"
+
+    def render(self) -> str:
+        return render_segments(self.segments)
+
+
+def _split_segment(segment: TranscriptSegment, max_tokens: int) -> List[TranscriptSegment]:
+    """Break a monologue longer than a window into word-aligned pieces"""
+    max_chars = max_tokens * 4
+    pieces, current = [], []
+    length = 0
+    for word in segment.text.split():
+        if current and length + len(word) + 1 > max_chars:
+            pieces.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return [
+        TranscriptSegment(segment.speaker, segment.start if i == 0 else None, None, piece)
+        for i, piece in enumerate(pieces)
+    ]
+
+
+def split_into_windows(
+    segments: List[TranscriptSegment],
+    max_tokens: int,
+    max_seconds: float
+) -> List[TranscriptWindow]:
+    """
+    Group speaker turns into windows of at most `max_tokens` and `max_seconds`
+
+    Windows are cut between turns, never inside one, unless a single turn is
+    longer than a window on its own.
+    """
+    windows: List[TranscriptWindow] = []
+    current: List[TranscriptSegment] = []
+    current_tokens = 0
+    window_start: Optional[float] = None
+
+    for segment in segments:
+        for piece in _split_segment(segment, max_tokens) if estimate_tokens(segment.text) > max_tokens else [segment]:
+            tokens = estimate_tokens(piece.speaker + piece.text) + 4
+            too_long = (
+                window_start is not None and piece.start is not None
+                and piece.start - window_start >= max_seconds
+            )
+            if current and (current_tokens + tokens > max_tokens or too_long):
+                windows.append(TranscriptWindow(current))
+                current, current_tokens, window_start = [], 0, None
+            current.append(piece)
+            current_tokens += tokens
+            if window_start is None:
+                window_start = piece.start
+
+    if current:
+        windows.append(TranscriptWindow(current))
+    return windows
+
+
+class SummaryCache:
+    """Small in-process LRU of window/merge summaries keyed by content hash"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        CACHE_LOOKUPS.inc(cache="transcript_summary", result="hit" if value is not None else "miss")
+        return value
+
+    def put(self, key: str, value: str):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class TranscriptSummarizer:
+    """
+    Condenses transcripts that are too long for a single generation prompt
+
+    Short transcripts pass through (normalised to `[mm:ss] Speaker: text`).
+    Long ones are mapped window by window through the LLM gateway, so every
+    call has a bounded prompt, then the partial notes are merged level by
+    level until they fit `reduce_max_tokens`. Window notes are cached by
+    content, so generating another output type for the same meeting (or
+    reprocessing it) does not summarise the transcript again.
+    """
+
+    def __init__(
+        self,
+        direct_max_tokens: int = 6000,
+        window_tokens: int = 3000,
+        window_seconds: float = 600,
+        reduce_max_tokens: int = 4000,
+        summary_max_tokens: int = 500,
+        cache_size: int = 512
+    ):
+        self.direct_max_tokens = direct_max_tokens
+        self.window_tokens = window_tokens
+        self.window_seconds = window_seconds
+        self.reduce_max_tokens = reduce_max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.cache = SummaryCache(cache_size)
+
+    def _cache_key(self, model: str, system_prompt: str, text: str) -> str:
+        digest = hashlib.sha256()
+        for part in (PROMPT_VERSION, model, system_prompt, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def _summarize(
+        self,
+        system_prompt: str,
+        text: str,
+        client_id: Optional[str],
+        bypass_cache: bool = False
+    ) -> str:
+        route = model_router.route("transcript")
+        key = self._cache_key(route.model, system_prompt, text)
+        cached = None if bypass_cache else self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            start = time.perf_counter()
+            response = await llm_gateway.chat_completion(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                model=route.model,
+                tenant=client_id,
+                max_tokens=self.summary_max_tokens,
+                temperature=0.2
+            )
+            model_router.observe(route, time.perf_counter() - start, response.usage)
+            summary = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            # Keep the pipeline going with a truncated excerpt rather than failing the meeting
+            logger.warning("Transcript window summary failed, using an excerpt: %s", e)
+            return text[:self.summary_max_tokens * 4] + " [...]"
+
+        self.cache.put(key, summary)
+        return summary
+
+    async def _summarize_window(
+        self,
+        index: int,
+        window: TranscriptWindow,
+        client_id: Optional[str],
+        bypass_cache: bool = False
+    ) -> str:
+        label = f"Part {index + 1}" + (f" ({window.label})" if window.label else "")
+        notes = await self._summarize(WINDOW_SUMMARY_PROMPT, window.render(), client_id, bypass_cache)
+        return f"{label}:\n{notes}"
+
+    async def summarize_segments(
+        self,
+        segments: List[TranscriptSegment],
+        client_id: Optional[str] = None
+    ) -> str:
+        """Notes for a run of consecutive speaker turns (a live meeting's latest minutes)"""
+        windows = split_into_windows(segments, self.window_tokens, self.window_seconds)
+        notes = await asyncio.gather(*(
+            self._summarize(WINDOW_SUMMARY_PROMPT, window.render(), client_id) for window in windows
+        ))
+        return "\n".join(notes)
+
+    async def _reduce(
+        self,
+        parts: List[str],
+        max_tokens: int,
+        client_id: Optional[str],
+        bypass_cache: bool = False
+    ) -> str:
+        """Merge neighbouring notes until the whole set fits `max_tokens`"""
+        for _ in range(8):
+            joined = "\n\n".join(parts)
+            if len(parts) <= 1 or count_tokens(joined) <= max_tokens:
+                return joined
+
+            groups: List[List[str]] = [[]]
+            group_tokens = 0
+            for part in parts:
+                tokens = count_tokens(part)
+                if len(groups[-1]) >= 2 and group_tokens + tokens > max_tokens:
+                    groups.append([])
+                    group_tokens = 0
+                groups[-1].append(part)
+                group_tokens += tokens
+
+            parts = list(await asyncio.gather(*(
+                self._summarize(REDUCE_PROMPT, "\n\n".join(group), client_id, bypass_cache) for group in groups
+            )))
+        return "\n\n".join(parts)
+
+    @traced("transcript.condense")
+    async def condense(
+        self,
+        transcript: Union[str, List[TranscriptSegment]],
+        client_id: Optional[str] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None,
+        notes: Optional[Sequence[Sequence]] = None
+    ) -> str:
+        """
+        Prompt-sized version of a transcript (parsed segments, raw Recall JSON or plain text)
+
+        `max_tokens` is the prompt budget left for the transcript; it tightens
+        both the pass-through limit and the size the notes are reduced to.
+        `notes` are [start, end, text] notes already written for stretches of
+        the meeting (while it was live); only the turns they don't cover are
+        summarised now.
+        """
+        segments = parse_transcript(transcript) if isinstance(transcript, str) else transcript
+        if not segments:
+            return transcript if isinstance(transcript, str) else ""
+
+        direct_limit, reduce_limit = self.direct_max_tokens, self.reduce_max_tokens
+        if max_tokens is not None:
+            direct_limit, reduce_limit = min(direct_limit, max_tokens), min(reduce_limit, max_tokens)
+
+        rendered = render_segments(segments)
+        tokens = count_tokens(rendered)
+        if tokens <= direct_limit:
+            return rendered
+
+        stage_labels = {"content_type": "transcript", "tenant": tenant_label(client_id)}
+        covered = self._covering_notes(segments, notes or [])
+        if covered:
+            return await self._condense_with_notes(segments, covered, client_id, bypass_cache, reduce_limit, stage_labels)
+
+        windows = split_into_windows(segments, self.window_tokens, self.window_seconds)
+        logger.info("Condensing transcript of %d tokens in %d windows", tokens, len(windows))
+
+        with time_stage(GENERATION_STAGE_SECONDS, "condense", "map", **stage_labels):
+            parts = await asyncio.gather(*(
+                self._summarize_window(i, window, client_id, bypass_cache) for i, window in enumerate(windows)
+            ))
+        with time_stage(GENERATION_STAGE_SECONDS, "condense", "reduce", **stage_labels):
+            notes = await self._reduce(list(parts), reduce_limit, client_id, bypass_cache)
+
+        return f"(Condensed from a {len(windows)}-part transcript)\n{notes}"
+
+    @staticmethod
+    def _covering_notes(
+        segments: List[TranscriptSegment],
+        notes: Sequence[Sequence]
+    ) -> List[Tuple[float, float, str]]:
+        """The notes that cover at least one turn of `segments` (matched by start time)"""
+        covered = []
+        for start, end, text in notes:
+            if any(s.start is not None and start <= s.start <= end for s in segments):
+                covered.append((float(start), float(end), text))
+        return covered
+
+    async def _condense_with_notes(
+        self,
+        segments: List[TranscriptSegment],
+        covered: List[Tuple[float, float, str]],
+        client_id: Optional[str],
+        bypass_cache: bool,
+        reduce_limit: int,
+        stage_labels: dict
+    ) -> str:
+        """Summarise only the stretches `covered` misses, then merge everything in meeting order"""
+        def is_covered(segment: TranscriptSegment) -> bool:
+            return segment.start is not None and any(start <= segment.start <= end for start, end, _ in covered)
+
+        runs: List[List[TranscriptSegment]] = [[]]
+        for segment in segments:
+            if not is_covered(segment):
+                runs[-1].append(segment)
+            elif runs[-1]:
+                runs.append([])
+        windows = [
+            window for run in runs if run
+            for window in split_into_windows(run, self.window_tokens, self.window_seconds)
+        ]
+        logger.info("Condensing transcript from %d live notes and %d windows", len(covered), len(windows))
+
+        with time_stage(GENERATION_STAGE_SECONDS, "condense", "map", **stage_labels):
+            summaries = await asyncio.gather(*(
+                self._summarize(WINDOW_SUMMARY_PROMPT, window.render(), client_id, bypass_cache) for window in windows
+            ))
+
+        pieces = [(start, f"{format_timestamp(start)}-{format_timestamp(end)}", text) for start, end, text in covered]
+        pieces += [(window.start, window.label, summary) for window, summary in zip(windows, summaries)]
+        pieces.sort(key=lambda piece: piece[0] if piece[0] is not None else float("inf"))
+        parts = [
+            f"Part {i + 1}" + (f" ({label})" if label else "") + f":\n{text}"
+            for i, (_, label, text) in enumerate(pieces)
+        ]
+
+        with time_stage(GENERATION_STAGE_SECONDS, "condense", "reduce", **stage_labels):
+            notes = await self._reduce(parts, reduce_limit, client_id, bypass_cache)
+
+        return f"(Condensed from a {len(parts)}-part transcript)\n{notes}"
+
+
+# Global transcript summarizer instance
+transcript_summarizer = TranscriptSummarizer(
+    direct_max_tokens=settings.transcript_direct_max_tokens,
+    window_tokens=settings.transcript_window_tokens,
+    window_seconds=settings.transcript_window_seconds,
+    reduce_max_tokens=settings.transcript_reduce_max_tokens,
+    summary_max_tokens=settings.transcript_summary_max_tokens,
+    cache_size=settings.transcript_summary_cache_size
+)
@@ -10,12 +10,17 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 from openai import OpenAI
 from app.utils.config import get_settings, get_chroma_path
+from app.core.tracing import traced, tracer, SPAN_KIND_CLIENT
+from app.core.metrics import (
+    INGEST_STAGE_SECONDS, SEARCH_STAGE_SECONDS, SEARCH_RESULTS,
+    tenant_label, time_stage
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Initialize OpenAI for embeddings
-client = OpenAI(api_key=settings.openai_api_key)
+client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
 # Global ChromaDB client
 chroma_client = None
@@ -35,9 +40,9 @@ def get_chroma_client():
                     allow_reset=True
                 )
             )
-            logger.info(f"ChromaDB client initialized at {chroma_path}")
+            logger.info("ChromaDB client initialized at %s", chroma_path)
         except Exception as e:
-            logger.error(f"Failed to initialize ChromaDB: {e}")
+            logger.error("Failed to initialize ChromaDB: %s", e)
             raise
     
     return chroma_client
@@ -50,6 +55,7 @@ def get_collection_name(client_id: str, sub_client_id: Optional[str] = None) ->
     return f"client_{client_id}"
 
 
+@traced("openai.embeddings.create", kind=SPAN_KIND_CLIENT)
 def create_embeddings(texts: List[str]) -> List[List[float]]:
     """Create embeddings for texts using OpenAI"""
     try:
@@ -59,16 +65,18 @@ def create_embeddings(texts: List[str]) -> List[List[float]]:
         )
         return [embedding.embedding for embedding in response.data]
     except Exception as e:
-        logger.error(f"Error creating embeddings: {e}")
+        logger.error("Error creating embeddings: %s", e)
         raise
 
 
+@traced("vector_store.store_document_chunks")
 def store_document_chunks(
     client_id: str,
     file_id: str,
     filename: str,
     text_chunks: List[str],
-    sub_client_id: Optional[str] = None
+    sub_client_id: Optional[str] = None,
+    file_type: str = ""
 ) -> int:
     """
     Store document chunks in vector database
@@ -76,6 +84,8 @@ def store_document_chunks(
     This builds the "Centralized Brain" by storing document embeddings
     that can be searched semantically for AI content generation.
     """
+    stage_labels = {"file_type": file_type, "tenant": tenant_label(client_id)}
+
     try:
         client = get_chroma_client()
         collection_name = get_collection_name(client_id, sub_client_id)
@@ -90,7 +100,8 @@ def store_document_chunks(
             )
         
         # Create embeddings for chunks
-        embeddings = create_embeddings(text_chunks)
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "embed", **stage_labels):
+            embeddings = create_embeddings(text_chunks)
         
         # Generate IDs for chunks
         chunk_ids = [f"{file_id}_chunk_{i}" for i in range(len(text_chunks))]
@@ -109,21 +120,91 @@ def store_document_chunks(
         ]
         
         # Store in ChromaDB
-        collection.add(
-            embeddings=embeddings,
-            documents=text_chunks,
-            metadatas=metadatas,
-            ids=chunk_ids
-        )
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "vector_write", **stage_labels), \
+                tracer.start_span("chroma.add", kind=SPAN_KIND_CLIENT, attributes={"chunks": len(text_chunks)}):
+            collection.add(
+                embeddings=embeddings,
+                documents=text_chunks,
+                metadatas=metadatas,
+                ids=chunk_ids
+            )
         
-        logger.info(f"Stored {len(text_chunks)} chunks for file {filename}")
+        logger.info("Stored %s chunks for file %s", len(text_chunks), filename)
         return len(text_chunks)
         
     except Exception as e:
-        logger.error(f"Error storing document chunks: {e}")
+        logger.error("Error storing document chunks: %s", e)
         raise
 
 
+@traced("vector_store.store_meeting_chunks")
+def store_meeting_chunks(
+    client_id: str,
+    meeting_id: str,
+    chunks: List[Dict[str, Any]],
+    sub_client_id: Optional[str] = None,
+    replace: bool = False
+) -> int:
+    """
+    Store meeting transcript chunks in vector database
+
+    Each chunk is {"id", "text", "metadata"}. IDs are deterministic, so a
+    chunk written again (a retried write, a reprocessed meeting) replaces
+    the stored one instead of adding a duplicate. With `replace`, the
+    meeting's other chunks (written live, or by an earlier processing that
+    produced more) are deleted once the new ones are stored.
+    """
+    stage_labels = {"file_type": "meeting", "tenant": tenant_label(client_id)}
+
+    try:
+        client = get_chroma_client()
+        collection_name = get_collection_name(client_id, sub_client_id)
+
+        try:
+            collection = client.get_collection(collection_name)
+        except:
+            collection = client.create_collection(
+                name=collection_name,
+                metadata={"client_id": client_id, "sub_client_id": sub_client_id}
+            )
+
+        texts = [chunk["text"] for chunk in chunks]
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "embed", **stage_labels):
+            embeddings = create_embeddings(texts)
+
+        # Chroma rejects None metadata values
+        base = {"meeting_id": meeting_id, "client_id": client_id, "sub_client_id": sub_client_id}
+        metadatas = [
+            {k: v for k, v in {**base, **chunk.get("metadata", {}), "text_length": len(chunk["text"])}.items() if v is not None}
+            for chunk in chunks
+        ]
+
+        with time_stage(INGEST_STAGE_SECONDS, "ingest", "vector_write", **stage_labels), \
+                tracer.start_span("chroma.upsert", kind=SPAN_KIND_CLIENT, attributes={"chunks": len(chunks)}):
+            collection.upsert(
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=metadatas,
+                ids=[chunk["id"] for chunk in chunks]
+            )
+
+        if replace:
+            chunk_ids = {chunk["id"] for chunk in chunks}
+            existing = collection.get(where={"meeting_id": meeting_id}, include=["metadatas"])
+            stale = [chunk_id for chunk_id in existing["ids"] if chunk_id not in chunk_ids]
+            if stale:
+                collection.delete(ids=stale)
+                logger.info("Deleted %s outdated chunks for meeting %s", len(stale), meeting_id)
+
+        logger.info("Stored %s transcript chunks for meeting %s", len(chunks), meeting_id)
+        return len(chunks)
+
+    except Exception as e:
+        logger.error("Error storing meeting chunks: %s", e)
+        raise
+
+
+@traced("vector_store.search_knowledge_base")
 def search_knowledge_base(
     query: str,
     client_id: str,
@@ -136,6 +217,8 @@ def search_knowledge_base(
     This is the core search function for the "Centralized Brain" -
     it finds relevant context from all stored documents.
     """
+    tenant = tenant_label(client_id)
+
     try:
         client = get_chroma_client()
         collection_name = get_collection_name(client_id, sub_client_id)
@@ -143,18 +226,21 @@ def search_knowledge_base(
         try:
             collection = client.get_collection(collection_name)
         except:
-            logger.warning(f"Collection {collection_name} not found")
+            logger.warning("Collection %s not found", collection_name)
             return []
         
         # Create embedding for query
-        query_embedding = create_embeddings([query])[0]
+        with time_stage(SEARCH_STAGE_SECONDS, "search", "embed", tenant=tenant):
+            query_embedding = create_embeddings([query])[0]
         
         # Search collection
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            include=["documents", "metadatas", "distances"]
-        )
+        with time_stage(SEARCH_STAGE_SECONDS, "search", "vector_query", tenant=tenant), \
+                tracer.start_span("chroma.query", kind=SPAN_KIND_CLIENT, attributes={"n_results": n_results}):
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                include=["documents", "metadatas", "distances"]
+            )
         
         # Format results
         formatted_results = []
@@ -166,11 +252,15 @@ def search_knowledge_base(
                     "score": 1 - results["distances"][0][i]  # Convert distance to similarity score
                 })
         
-        logger.info(f"Found {len(formatted_results)} results for query: {query[:50]}...")
+        SEARCH_RESULTS.observe(len(formatted_results), tenant=tenant)
+        logger.info(
+            "Found %s results for query: %s...", len(formatted_results), query[:50],
+            extra={"event": "kb.search", "sample": True, "tenant": tenant}
+        )
         return formatted_results
         
     except Exception as e:
-        logger.error(f"Error searching knowledge base: {e}")
+        logger.error("Error searching knowledge base: %s", e)
         return []
 
 
@@ -197,7 +287,7 @@ def get_client_knowledge_stats(client_id: str, sub_client_id: Optional[str] = No
             }
             
     except Exception as e:
-        logger.error(f"Error getting knowledge stats: {e}")
+        logger.error("Error getting knowledge stats: %s", e)
         return {
             "total_chunks": 0,
             "collection_name": "",
@@ -222,10 +312,38 @@ def delete_file_chunks(file_id: str, client_id: str, sub_client_id: Optional[str
             
             if results["ids"]:
                 collection.delete(ids=results["ids"])
-                logger.info(f"Deleted {len(results['ids'])} chunks for file {file_id}")
+                logger.info("Deleted %s chunks for file %s", len(results['ids']), file_id)
                 
         except Exception as e:
-            logger.warning(f"Could not delete chunks for file {file_id}: {e}")
+            logger.warning("Could not delete chunks for file %s: %s", file_id, e)
             
     except Exception as e:
-        logger.error(f"Error deleting file chunks: {e}")
+        logger.error("Error deleting file chunks: %s", e)
+
+
+def delete_meeting_chunks(
+    meeting_id: str,
+    client_id: str,
+    sub_client_id: Optional[str] = None,
+    chunk_ids: Optional[List[str]] = None
+):
+    """Delete a meeting's transcript chunks (only `chunk_ids`, if given)"""
+    try:
+        client = get_chroma_client()
+        collection_name = get_collection_name(client_id, sub_client_id)
+
+        try:
+            collection = client.get_collection(collection_name)
+
+            if chunk_ids is None:
+                chunk_ids = collection.get(where={"meeting_id": meeting_id}, include=["metadatas"])["ids"]
+
+            if chunk_ids:
+                collection.delete(ids=chunk_ids)
+                logger.info("Deleted %s chunks for meeting %s", len(chunk_ids), meeting_id)
+
+        except Exception as e:
+            logger.warning("Could not delete chunks for meeting %s: %s", meeting_id, e)
+
+    except Exception as e:
+        logger.error("Error deleting meeting chunks: %s", e)
@@ -2,8 +2,8 @@
 AI content generation schemas
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
 
 
 class AIGenerationRequest(BaseModel):
@@ -15,6 +15,7 @@ class AIGenerationRequest(BaseModel):
     additional_instructions: Optional[str] = Field(None, max_length=500, description="Additional instructions")
     recipient_name: Optional[str] = Field(None, description="Recipient name (for emails)")
     sender_name: Optional[str] = Field(None, description="Sender name (for emails)")
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force a fresh model call")
 
 
 class AIGenerationResponse(BaseModel):
@@ -27,6 +28,8 @@ class AIGenerationResponse(BaseModel):
     sub_client_id: Optional[str] = Field(None, description="Sub-client ID")
     context_used: str = Field(..., description="Context from knowledge base")
     tokens_used: int = Field(default=0, description="Tokens used for generation")
+    cached: bool = Field(default=False, description="Served from the generation cache")
+    model: Optional[str] = Field(None, description="Model that produced the content")
     created_at: str = Field(..., description="Generation timestamp")
 
 
@@ -37,6 +40,7 @@ class EmailGenerationRequest(BaseModel):
     sub_client_id: Optional[str] = Field(None, description="Sub-client ID for context")
     recipient_name: str = Field(..., description="Email recipient name")
     sender_name: str = Field(..., description="Email sender name")
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force a fresh model call")
 
 
 class SummaryGenerationRequest(BaseModel):
@@ -45,6 +49,7 @@ class SummaryGenerationRequest(BaseModel):
     client_id: str = Field(..., description="Client ID for context")
     sub_client_id: Optional[str] = Field(None, description="Sub-client ID for context")
     meeting_id: Optional[str] = Field(None, description="Associated meeting ID")
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force a fresh model call")
 
 
 class ProposalGenerationRequest(BaseModel):
@@ -52,6 +57,7 @@ class ProposalGenerationRequest(BaseModel):
     prompt: str = Field(..., min_length=10, max_length=2000, description="Proposal prompt")
     client_id: str = Field(..., description="Client ID for context")
     sub_client_id: Optional[str] = Field(None, description="Sub-client ID for context")
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force a fresh model call")
 
 
 class ScopeOfWorkRequest(BaseModel):
@@ -59,3 +65,46 @@ class ScopeOfWorkRequest(BaseModel):
     prompt: str = Field(..., min_length=10, max_length=2000, description="Scope of work prompt")
     client_id: str = Field(..., description="Client ID for context")
     sub_client_id: Optional[str] = Field(None, description="Sub-client ID for context")
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force a fresh model call")
+
+
+class BatchGenerationItem(BaseModel):
+    """One prompt in a batch generation request"""
+    prompt: str = Field(..., min_length=10, max_length=2000, description="Generation prompt")
+    content_type: str = Field(..., description="Type: email, summary, proposal, scope_of_work, action_items")
+    sub_client_id: Optional[str] = Field(None, description="Sub-client ID for context")
+    additional_instructions: Optional[str] = Field(None, max_length=500, description="Additional instructions")
+    recipient_name: Optional[str] = Field(None, description="Recipient name (for emails)")
+    sender_name: Optional[str] = Field(None, description="Sender name (for emails)")
+    title: Optional[str] = Field(None, description="Output title (defaults by content type)")
+
+
+class BatchGenerationRequest(BaseModel):
+    """Batch AI content generation request schema"""
+    client_id: str = Field(..., description="Client ID for context")
+    items: List[BatchGenerationItem] = Field(..., min_length=1, max_length=100, description="Prompts to generate")
+    context_query: Optional[str] = Field(
+        None, max_length=2000,
+        description="Knowledge-base query shared by every item (default: one search per distinct prompt)"
+    )
+    bypass_cache: bool = Field(False, description="Skip the generation cache and force fresh model calls")
+
+
+class MeetingActionItem(BaseModel):
+    """Action item extracted from a meeting transcript"""
+    task: str = Field(..., min_length=1, description="What needs to be done")
+    owner: Optional[str] = Field(None, description="Person responsible, if named")
+    due_date: Optional[str] = Field(None, description="Due date (YYYY-MM-DD when known)")
+    priority: Literal["high", "medium", "low"] = Field("medium", description="Priority")
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def normalize_priority(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class MeetingExtraction(BaseModel):
+    """Single-pass structured output for a meeting: summary, action items and follow-up email"""
+    summary: str = Field(..., min_length=1, description="Meeting summary")
+    action_items: List[MeetingActionItem] = Field(default_factory=list, description="Action items")
+    follow_up_email: str = Field(..., min_length=1, description="Follow-up email draft")
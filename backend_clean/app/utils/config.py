@@ -29,6 +29,7 @@ class Settings(BaseSettings):
     jwt_secret_key: str = Field(env="JWT_SECRET_KEY")
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
     jwt_expiration_hours: int = Field(default=24, env="JWT_EXPIRATION_HOURS")
+    admin_token: Optional[str] = Field(default=None, env="ADMIN_TOKEN")
     
     # ============================================================================
     # DATABASE (SUPABASE)
@@ -42,12 +43,81 @@ class Settings(BaseSettings):
     # ============================================================================
     openai_api_key: str = Field(env="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4", env="OPENAI_MODEL")
+    openai_base_url: Optional[str] = Field(default=None, env="OPENAI_BASE_URL")  # None = api.openai.com
+    openai_fast_model: str = Field(default="gpt-4o-mini", env="OPENAI_FAST_MODEL")
+    model_routes: str = Field(
+        default="action_items=fast,summary=fast,transcript=fast,meeting_extraction=fast",
+        env="MODEL_ROUTES"
+    )  # content_type=fast|default|<model>; unlisted types use OPENAI_MODEL
+    model_escalation: bool = Field(default=True, env="MODEL_ESCALATION")  # retry failed fast-model output on OPENAI_MODEL
+    openai_json_mode: bool = Field(default=False, env="OPENAI_JSON_MODE")  # response_format=json_object (gpt-4o, gpt-4-turbo, ...)
+    openai_context_window: Optional[int] = Field(default=None, env="OPENAI_CONTEXT_WINDOW")  # None = known window for the model
+    context_max_tokens: int = Field(default=2000, env="CONTEXT_MAX_TOKENS")  # knowledge-base context per prompt
+    meeting_structured_extraction: bool = Field(default=True, env="MEETING_STRUCTURED_EXTRACTION")
+    batch_max_concurrency: int = Field(default=8, env="BATCH_MAX_CONCURRENCY")  # per /ai/generate/batch request
+    batch_worker_concurrency: int = Field(default=16, env="BATCH_WORKER_CONCURRENCY")  # starting point, adapts to 429s
+    batch_worker_max_concurrency: int = Field(default=64, env="BATCH_WORKER_MAX_CONCURRENCY")
+    batch_requests_per_minute: int = Field(default=0, env="BATCH_REQUESTS_PER_MINUTE")  # 0 = no client-side cap
+    batch_tokens_per_minute: int = Field(default=0, env="BATCH_TOKENS_PER_MINUTE")  # 0 = no client-side cap
+    batch_flush_size: int = Field(default=100, env="BATCH_FLUSH_SIZE")  # outputs per bulk insert
+    generation_cache_enabled: bool = Field(default=True, env="GENERATION_CACHE_ENABLED")
+    generation_cache_path: str = Field(default="./data/generation_cache.db", env="GENERATION_CACHE_PATH")
+    generation_cache_ttl_seconds: int = Field(default=604800, env="GENERATION_CACHE_TTL_SECONDS")  # 7 days
+    generation_cache_sampled: bool = Field(default=False, env="GENERATION_CACHE_SAMPLED")  # also replay temperature > 0 outputs
+    # Long transcripts are summarised window by window before generation
+    transcript_direct_max_tokens: int = Field(default=6000, env="TRANSCRIPT_DIRECT_MAX_TOKENS")
+    transcript_max_connections: int = Field(default=10, env="TRANSCRIPT_MAX_CONNECTIONS")  # shared download pool
+    transcript_download_timeout_seconds: float = Field(default=120.0, env="TRANSCRIPT_DOWNLOAD_TIMEOUT_SECONDS")  # whole download
+    transcript_max_download_bytes: int = Field(default=268435456, env="TRANSCRIPT_MAX_DOWNLOAD_BYTES")  # 256 MB
+    transcript_window_tokens: int = Field(default=3000, env="TRANSCRIPT_WINDOW_TOKENS")
+    transcript_window_seconds: int = Field(default=600, env="TRANSCRIPT_WINDOW_SECONDS")
+    transcript_reduce_max_tokens: int = Field(default=4000, env="TRANSCRIPT_REDUCE_MAX_TOKENS")
+    transcript_summary_max_tokens: int = Field(default=500, env="TRANSCRIPT_SUMMARY_MAX_TOKENS")
+    transcript_summary_cache_size: int = Field(default=512, env="TRANSCRIPT_SUMMARY_CACHE_SIZE")
+    llm_max_connections: int = Field(default=200, env="LLM_MAX_CONNECTIONS")
+    llm_max_concurrency: int = Field(default=200, env="LLM_MAX_CONCURRENCY")
+    llm_max_concurrency_per_tenant: int = Field(default=20, env="LLM_MAX_CONCURRENCY_PER_TENANT")
+    llm_timeout_seconds: float = Field(default=120.0, env="LLM_TIMEOUT_SECONDS")
+    llm_connect_timeout_seconds: float = Field(default=5.0, env="LLM_CONNECT_TIMEOUT_SECONDS")
+    llm_max_retries: int = Field(default=3, env="LLM_MAX_RETRIES")
+    llm_retry_base_delay: float = Field(default=0.5, env="LLM_RETRY_BASE_DELAY")
+    llm_retry_max_delay: float = Field(default=20.0, env="LLM_RETRY_MAX_DELAY")
     
     # ============================================================================
     # RECALL AI
     # ============================================================================
     recall_api_key: str = Field(env="RECALL_API_KEY")
+    recall_base_url: str = Field(default="https://us-west-2.recall.ai/api/v1", env="RECALL_BASE_URL")
     recall_calendar_auth_url: str = Field(env="RECALL_CALENDAR_AUTH_URL")
+    recall_max_connections: int = Field(default=50, env="RECALL_MAX_CONNECTIONS")
+    recall_timeout_seconds: float = Field(default=30.0, env="RECALL_TIMEOUT_SECONDS")
+    recall_max_retries: int = Field(default=3, env="RECALL_MAX_RETRIES")
+    recall_retry_max_delay: float = Field(default=30.0, env="RECALL_RETRY_MAX_DELAY")  # caps Retry-After too
+    recall_bot_cache_ttl_seconds: float = Field(default=5.0, env="RECALL_BOT_CACHE_TTL_SECONDS")  # statuses without their own TTL
+    recall_bot_cache_size: int = Field(default=2048, env="RECALL_BOT_CACHE_SIZE")
+    recall_download_url_max_age_seconds: float = Field(default=300.0, env="RECALL_DOWNLOAD_URL_MAX_AGE_SECONDS")  # pre-signed links expire
+    recall_webhook_secret: Optional[str] = Field(default=None, env="RECALL_WEBHOOK_SECRET")  # whsec_...; None = webhooks disabled
+    recall_webhook_tolerance_seconds: int = Field(default=300, env="RECALL_WEBHOOK_TOLERANCE_SECONDS")
+    recall_realtime_url: Optional[str] = Field(default=None, env="RECALL_REALTIME_URL")  # public URL of /webhooks/recall/transcript; None = no live transcripts
+    recall_realtime_token: Optional[str] = Field(default=None, env="RECALL_REALTIME_TOKEN")  # appended as ?token=, checked on delivery; required for live transcripts
+    meeting_poll_interval_seconds: int = Field(default=30, env="MEETING_POLL_INTERVAL_SECONDS")  # bot states without their own interval
+    meeting_reconcile_interval_seconds: int = Field(default=300, env="MEETING_RECONCILE_INTERVAL_SECONDS")  # poll floor with webhooks
+    bot_poller_max_pages: int = Field(default=10, env="BOT_POLLER_MAX_PAGES")  # list_bots pages per refresh
+    bot_status_max_age_seconds: float = Field(default=10.0, env="BOT_STATUS_MAX_AGE_SECONDS")  # GET /bots/ reuse window
+    meeting_store_backend: str = Field(default="sqlite", env="MEETING_STORE_BACKEND")  # sqlite (one host) or postgres (shared by every host)
+    meeting_store_path: str = Field(default="./data/meetings.db", env="MEETING_STORE_PATH")  # SQLite meeting state
+    meeting_store_dsn: Optional[str] = Field(default=None, env="MEETING_STORE_DSN")  # postgresql://... for the postgres backend
+    meeting_lease_seconds: float = Field(default=120.0, env="MEETING_LEASE_SECONDS")  # a dead worker's meeting is reclaimed after this
+    meeting_workers_in_api: bool = Field(default=True, env="MEETING_WORKERS_IN_API")  # False when app.workers.meetings runs
+    meeting_workers: int = Field(default=4, env="MEETING_WORKERS")  # meetings processed at once per process
+    meeting_max_attempts: int = Field(default=4, env="MEETING_MAX_ATTEMPTS")  # then dead-lettered
+    meeting_retry_base_delay: float = Field(default=30.0, env="MEETING_RETRY_BASE_DELAY")  # doubles per attempt
+    meeting_retry_max_delay: float = Field(default=900.0, env="MEETING_RETRY_MAX_DELAY")
+    meeting_queue_poll_seconds: float = Field(default=5.0, env="MEETING_QUEUE_POLL_SECONDS")
+    meeting_chunk_tokens: int = Field(default=400, env="MEETING_CHUNK_TOKENS")  # transcripts embedded in chunks of about this size
+    index_meeting_transcripts: bool = Field(default=True, env="INDEX_MEETING_TRANSCRIPTS")  # processed transcripts go to the knowledge base
+    live_summary_interval_seconds: float = Field(default=180.0, env="LIVE_SUMMARY_INTERVAL_SECONDS")  # rolling notes refresh
+    vip_client_ids: str = Field(default="", env="VIP_CLIENT_IDS")  # comma-separated, processed first
     
     # ============================================================================
     # GOOGLE SERVICES
@@ -81,6 +151,20 @@ class Settings(BaseSettings):
     chroma_db_path: str = Field(default="./data/chroma_db", env="CHROMA_DB_PATH")
     embedding_model: str = Field(default="text-embedding-ada-002", env="EMBEDDING_MODEL")
     
+    # ============================================================================
+    # OBSERVABILITY
+    # ============================================================================
+    log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    log_format: str = Field(default="text", env="LOG_FORMAT")  # text, json
+    log_queue: bool = Field(default=True, env="LOG_QUEUE")
+    log_sample_rate: float = Field(default=0.1, env="LOG_SAMPLE_RATE")
+    log_max_field_chars: int = Field(default=2000, env="LOG_MAX_FIELD_CHARS")
+    metrics_max_tenant_labels: int = Field(default=50, env="METRICS_MAX_TENANT_LABELS")
+    tracing_exporter: str = Field(default="none", env="TRACING_EXPORTER")  # none, log, memory
+    tracing_slow_threshold_ms: float = Field(default=2000.0, env="TRACING_SLOW_THRESHOLD_MS")
+    profiler_interval_ms: float = Field(default=5.0, env="PROFILER_INTERVAL_MS")
+    profiler_max_seconds: float = Field(default=60.0, env="PROFILER_MAX_SECONDS")
+
     # ============================================================================
     # CORS
     # ============================================================================
@@ -89,6 +173,19 @@ class Settings(BaseSettings):
         env="ALLOWED_ORIGINS"
     )
 
+    def get_model_routes(self) -> dict:
+        """Parse model routes string into {content_type: tier}"""
+        routes = {}
+        for entry in self.model_routes.split(","):
+            if "=" in entry:
+                content_type, tier = entry.split("=", 1)
+                routes[content_type.strip()] = tier.strip()
+        return routes
+
+    def get_vip_client_ids(self) -> set:
+        """Parse VIP client IDs string into a set"""
+        return {client_id.strip() for client_id in self.vip_client_ids.split(",") if client_id.strip()}
+
     def get_allowed_origins_list(self) -> list:
         """Parse allowed origins string into list"""
         if isinstance(self.allowed_origins, str):
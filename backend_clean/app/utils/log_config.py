@@ -0,0 +1,142 @@
+"""
+Logging configuration for Lemur AI
+Text or structured JSON output, sampling of high-volume events, size-capped
+payload fields and a queue-based handler so the event loop never blocks on I/O
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Any, Optional
+from app.core.tracing import RequestContextFilter
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+# Attributes used to control logging itself rather than carry data
+_CONTROL_ATTRS = {"sample", "request_id", "trace_id"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def cap_payload(value: Any, max_chars: int = 2000) -> Any:
+    """
+    Limit the size of a value destined for a log line
+
+    Strings and containers are rendered and truncated with a marker saying how
+    much was dropped; numbers, booleans and None pass through untouched.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        text = value
+    else:
+        try:
+            text = json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            text = repr(value)
+    if len(text) <= max_chars:
+        return value if isinstance(value, str) else text
+    return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with extra fields capped in size"""
+
+    def __init__(self, max_field_chars: int = 2000):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": cap_payload(record.getMessage(), self.max_field_chars),
+            "request_id": getattr(record, "request_id", "-"),
+            "trace_id": getattr(record, "trace_id", "-")
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in _CONTROL_ATTRS and not key.startswith("_"):
+                entry[key] = cap_payload(value, self.max_field_chars)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops a share of records logged with extra={"sample": True}
+
+    Warnings and errors are never sampled away.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate
+
+
+class NonFormattingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that defers message formatting to the listener thread
+
+    The stock handler renders the message on the calling thread; here the
+    record is only copied (after filters have stamped request/trace IDs),
+    so %-style arguments are formatted off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return logging.makeLogRecord(vars(record))
+
+
+def configure_logging(settings) -> None:
+    """Install root logging handlers according to settings"""
+    global _listener
+
+    if settings.log_format == "json":
+        formatter: logging.Formatter = JsonFormatter(settings.log_max_field_chars)
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(settings.log_level.upper())
+
+    if settings.log_queue:
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        queue_handler = NonFormattingQueueHandler(log_queue)
+        queue_handler.addFilter(RequestContextFilter())
+        queue_handler.addFilter(SamplingFilter(settings.log_sample_rate))
+        root.addHandler(queue_handler)
+
+        if _listener is not None:
+            _listener.stop()
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        stream_handler.addFilter(RequestContextFilter())
+        stream_handler.addFilter(SamplingFilter(settings.log_sample_rate))
+        root.addHandler(stream_handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,5 @@
+"""
+Background workers for Lemur AI
+Long-running jobs started with `python -m app.workers.<name>` rather than
+through the API
+"""
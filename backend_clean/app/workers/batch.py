@@ -0,0 +1,297 @@
+"""
+Offline batch generation for Lemur AI
+
+Runs a JSONL job file through the generate_content pipeline (overnight
+report runs, thousands of summaries), pacing calls to the upstream rate
+limits, writing outputs to Supabase in bulk and checkpointing progress so
+an interrupted run resumes where it stopped.
+
+Job file, one JSON object per line (`id` defaults to the line number):
+    {"id": "acme-q3", "client_id": "...", "content_type": "summary", "prompt": "...",
+     "sub_client_id": null, "additional_instructions": null, "recipient_name": null,
+     "sender_name": null, "title": null, "context_query": null}
+
+Usage (from backend_clean/):
+    python -m app.workers.batch jobs.jsonl --user-id <uuid>
+    python -m app.workers.batch jobs.jsonl --user-id <uuid> --requests-per-minute 500 --tokens-per-minute 300000
+    python -m app.workers.batch jobs.jsonl --user-id <uuid> --retry-failed
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.config import get_settings
+from app.utils.log_config import configure_logging
+from app.core.batch_generation import BatchJob, build_output, run_batch
+from app.core.database import db_manager, init_database
+from app.core.generation_cache import generation_cache
+from app.core.llm_gateway import llm_gateway
+from app.core.metrics import LLM_RETRIES
+from app.core.rate_limiter import AdaptiveConcurrency, TokenBucket
+from app.models.output import Output
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_FIELDS = {
+    "prompt", "content_type", "client_id", "sub_client_id", "additional_instructions",
+    "recipient_name", "sender_name", "title", "context_query"
+}
+PROGRESS_EVERY_SECONDS = 30.0
+
+
+def load_jobs(path: str) -> List[Tuple[str, BatchJob]]:
+    """(job id, job) for every line of a JSONL job file"""
+    jobs: List[Tuple[str, BatchJob]] = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                job_id = str(entry.get("id") or f"line-{line_number}")
+                job = BatchJob(**{k: v for k, v in entry.items() if k in JOB_FIELDS})
+            except (json.JSONDecodeError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid job: {e}")
+            if not job.prompt or not job.content_type or not job.client_id:
+                raise ValueError(f"{path}:{line_number}: prompt, content_type and client_id are required")
+            if job_id in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate job id {job_id!r}")
+            seen.add(job_id)
+            jobs.append((job_id, job))
+    return jobs
+
+
+class Checkpoint:
+    """
+    Append-only JSONL record of finished jobs
+
+    A job is written here only once its output is stored (or it has failed
+    for good), so anything missing is redone on the next run. Outputs whose
+    bulk insert failed are kept in a spill file next to it (<path>.unsaved)
+    and inserted again on resume, so a paid generation is not redone just
+    because Supabase was down.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.spill_path = f"{path}.unsaved"
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record per job id"""
+        records: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+                records[record["id"]] = record
+        return records
+
+    def record(self, entries: List[Dict[str, Any]]):
+        self._append(self.path, entries)
+
+    def spill(self, outputs: List[Tuple[str, Output]]):
+        """Keep generated outputs that could not be stored for the next run"""
+        self._append(self.spill_path, [
+            {"id": job_id, "output": output.model_dump(mode="json")} for job_id, output in outputs
+        ])
+
+    def load_spill(self, finished: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Output]]:
+        """Spilled outputs of jobs the checkpoint does not record as finished"""
+        spilled: Dict[str, Output] = {}
+        if not os.path.exists(self.spill_path):
+            return []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+                if entry["id"] not in finished:
+                    spilled[entry["id"]] = Output.model_validate(entry["output"])
+        return list(spilled.items())
+
+    def clear_spill(self):
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+    @staticmethod
+    def _append(path: str, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def output_id(run_id: str, job_id: str) -> str:
+    """Deterministic output ID, so replaying a stored batch overwrites instead of duplicating"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"lemur:batch:{run_id}:{job_id}"))
+
+
+class BatchRun:
+    """Buffers results, bulk-writes outputs and checkpoints them"""
+
+    def __init__(self, checkpoint: Checkpoint, flush_size: int):
+        self.checkpoint = checkpoint
+        self.flush_size = flush_size
+        self.outputs: List[Tuple[str, Output]] = []
+        self.failures: List[Dict[str, Any]] = []
+        self.stored = 0
+        self.failed = 0
+        self.unsaved = 0
+
+    async def add(self, job_id: str, output: Output):
+        self.outputs.append((job_id, output))
+        if len(self.outputs) >= self.flush_size:
+            await self.flush()
+
+    def fail(self, job_id: str, error: str):
+        self.failed += 1
+        self.failures.append({"id": job_id, "status": "failed", "error": error})
+
+    async def flush(self):
+        outputs, self.outputs = self.outputs, []
+        if outputs:
+            rows = await db_manager.create_outputs_bulk([output for _, output in outputs], upsert=True)
+            if len(rows) == len(outputs):
+                self.stored += len(outputs)
+                self.checkpoint.record([
+                    {"id": job_id, "status": "stored", "output_id": row["id"]}
+                    for (job_id, _), row in zip(outputs, rows)
+                ])
+            else:
+                # Left out of the checkpoint but spilled: the next run inserts them without regenerating
+                self.checkpoint.spill(outputs)
+                self.unsaved += len(outputs)
+                logger.error(
+                    "Bulk insert of %d outputs failed, kept in %s for the next run",
+                    len(outputs), self.checkpoint.spill_path
+                )
+        failures, self.failures = self.failures, []
+        self.checkpoint.record(failures)
+
+
+async def main_async(args) -> int:
+    if not init_database():
+        logger.error("Database initialization failed")
+        return 2
+
+    jobs = load_jobs(args.jobs)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.jobs}.checkpoint")
+    finished = checkpoint.load()
+    spilled = checkpoint.load_spill(finished)
+    spilled_ids = {job_id for job_id, _ in spilled}
+    pending = [
+        (job_id, job) for job_id, job in jobs
+        if job_id not in spilled_ids
+        and (job_id not in finished or (args.retry_failed and finished[job_id]["status"] == "failed"))
+    ]
+    logger.info(
+        "%d jobs, %d already finished, %d generated but unsaved, %d to run (checkpoint %s)",
+        len(jobs), len(jobs) - len(pending) - len(spilled), len(spilled), len(pending), checkpoint.path
+    )
+
+    run = BatchRun(checkpoint, args.flush_size)
+    for job_id, output in spilled:
+        await run.add(job_id, output)
+    owned = {client["id"] for client in await db_manager.get_clients_by_user(args.user_id)}
+    runnable = []
+    for job_id, job in pending:
+        if job.client_id in owned:
+            runnable.append((job_id, job))
+        else:
+            run.fail(job_id, f"client {job.client_id} does not belong to user {args.user_id}")
+
+    limiter = AdaptiveConcurrency(
+        args.concurrency,
+        maximum=max(args.concurrency, args.max_concurrency),
+        throttle_signal=lambda: LLM_RETRIES.value(reason="429")
+    )
+    requests_bucket = TokenBucket(args.requests_per_minute) if args.requests_per_minute else None
+    tokens_bucket = TokenBucket(args.tokens_per_minute) if args.tokens_per_minute else None
+    run_id = args.run_id or os.path.splitext(os.path.basename(args.jobs))[0]
+
+    started = last_progress = time.monotonic()
+    done = 0
+    results = run_batch(
+        (job for _, job in runnable),
+        limiter,
+        bypass_cache=args.bypass_cache,
+        source="worker",
+        requests_per_minute=requests_bucket,
+        tokens_per_minute=tokens_bucket
+    )
+    try:
+        async for index, result in results:
+            job_id, job = runnable[index]
+            if result.get("success"):
+                await run.add(job_id, build_output(job, result, args.user_id, output_id(run_id, job_id)))
+            else:
+                run.fail(job_id, result.get("error", "Unknown error"))
+            done += 1
+            if time.monotonic() - last_progress >= PROGRESS_EVERY_SECONDS:
+                last_progress = time.monotonic()
+                rate = done / (last_progress - started) * 60
+                logger.info(
+                    "%d/%d done (%.0f/min, concurrency %d)", done, len(runnable), rate, limiter.limit
+                )
+    finally:
+        await results.aclose()
+        await run.flush()
+        if run.unsaved == 0:
+            # Every spilled output is in the checkpoint now
+            checkpoint.clear_spill()
+        await llm_gateway.aclose()
+        generation_cache.close()
+
+    elapsed = time.monotonic() - started
+    print(
+        f"{run.stored} stored, {run.failed} failed, {run.unsaved} unsaved "
+        f"in {elapsed:.0f}s ({done / elapsed * 60 if elapsed else 0:.0f}/min)"
+    )
+    return 0 if run.failed == 0 and run.unsaved == 0 else 1
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m app.workers.batch", description=__doc__.split("\n\n")[1])
+    parser.add_argument("jobs", help="JSONL job file")
+    parser.add_argument("--user-id", required=True, help="user that owns the clients and the outputs")
+    parser.add_argument("--checkpoint", help="progress file (default: <jobs>.checkpoint)")
+    parser.add_argument("--run-id", help="namespace for output IDs (default: job file name)")
+    parser.add_argument("--retry-failed", action="store_true", help="rerun jobs the checkpoint records as failed")
+    parser.add_argument("--bypass-cache", action="store_true", help="skip the generation cache")
+    parser.add_argument("--concurrency", type=int, default=settings.batch_worker_concurrency,
+                        help="starting concurrency; halves on 429s and grows back while calls succeed")
+    parser.add_argument("--max-concurrency", type=int, default=settings.batch_worker_max_concurrency)
+    parser.add_argument("--requests-per-minute", type=int, default=settings.batch_requests_per_minute,
+                        help="client-side request cap (0 = none)")
+    parser.add_argument("--tokens-per-minute", type=int, default=settings.batch_tokens_per_minute,
+                        help="client-side token cap (0 = none)")
+    parser.add_argument("--flush-size", type=int, default=settings.batch_flush_size,
+                        help="outputs per bulk insert")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    configure_logging(settings)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Meeting processing worker for Lemur AI
+
+Consumes the post-meeting processing queue (transcript download, AI
+generation, output storage) outside the API process, so heavy meetings
+don't compete with request handling. Run as many as needed alongside the
+API: each meeting is leased to one worker at a time, and a worker that
+dies releases its meetings when the lease expires. With the default
+SQLite store every process must run on the API's host (they share the
+database file); workers on other hosts need MEETING_STORE_BACKEND=postgres
+on every process. Set MEETING_WORKERS_IN_API=false on the API once
+workers run.
+
+With --monitor the worker also polls Recall for bots still recording,
+picking up meetings whose API process has gone away.
+
+Usage (from backend_clean/):
+    python -m app.workers.meetings
+    python -m app.workers.meetings --workers 8
+    python -m app.workers.meetings --monitor
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from typing import List, Optional
+
+from app.utils.config import get_settings
+from app.utils.log_config import configure_logging
+from app.core.bot_poller import bot_poller
+from app.core.database import init_database
+from app.core.generation_cache import generation_cache
+from app.core.llm_gateway import llm_gateway
+from app.core.meeting_intelligence import meeting_intelligence
+from app.core.meeting_queue import meeting_queue
+from app.core.meeting_store import meeting_store
+from app.core.metrics import MEETING_QUEUE_EVENTS
+from app.core.recall_service import recall_service
+from app.core.transcript_fetcher import transcript_fetcher
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def monitor_recordings(interval: float):
+    """Periodically track recording bots that no process is polling"""
+    while True:
+        try:
+            await meeting_intelligence.recover()
+        except Exception as e:
+            logger.error("❌ Error syncing recording meetings: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def main_async(args) -> int:
+    if not init_database():
+        logger.error("Database initialization failed")
+        return 2
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    meeting_queue.workers = args.workers
+    meeting_queue.start()
+    monitor = asyncio.create_task(monitor_recordings(args.monitor_interval)) if args.monitor else None
+    logger.info("Meeting worker %s running (%d workers)", meeting_queue.owner, args.workers)
+
+    try:
+        await stop.wait()
+        logger.info("Stopping, waiting up to %.0fs for meetings in progress", args.drain_seconds)
+    finally:
+        if monitor is not None:
+            monitor.cancel()
+        await meeting_queue.stop(drain_seconds=args.drain_seconds)
+        await bot_poller.stop()
+        await recall_service.aclose()
+        await transcript_fetcher.aclose()
+        await llm_gateway.aclose()
+        generation_cache.close()
+        meeting_store.close()
+
+    print(
+        f"{MEETING_QUEUE_EVENTS.value(event='processed'):.0f} processed, "
+        f"{MEETING_QUEUE_EVENTS.value(event='retried'):.0f} retried, "
+        f"{MEETING_QUEUE_EVENTS.value(event='dead_lettered'):.0f} dead-lettered"
+    )
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m app.workers.meetings", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--workers", type=int, default=settings.meeting_workers,
+                        help="meetings processed at once by this process")
+    parser.add_argument("--monitor", action="store_true", help="also poll Recall for bots still recording")
+    parser.add_argument("--monitor-interval", type=float, default=settings.meeting_reconcile_interval_seconds,
+                        help="seconds between checks for recording bots nobody polls")
+    parser.add_argument("--drain-seconds", type=float, default=settings.meeting_lease_seconds,
+                        help="on shutdown, how long meetings in progress may finish")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    configure_logging(settings)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
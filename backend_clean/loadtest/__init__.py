@@ -0,0 +1,5 @@
+"""
+Load-testing harness for Lemur AI
+Fake upstream services, traffic mixes and a latency-reporting driver
+(run with `python -m loadtest`)
+"""
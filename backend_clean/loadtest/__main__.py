@@ -0,0 +1,274 @@
+"""
+Load-test Lemur AI on a laptop
+
+Boots fake OpenAI, Recall and Supabase servers, starts main:app pointed at
+them, seeds a tenant (demo login, client, a few documents), then drives a
+traffic mix and prints throughput and latency percentiles per endpoint.
+
+Usage (from backend_clean/):
+    python -m loadtest --mix mixed --users 20 --duration 60
+    python -m loadtest --mix generate --openai-latency-ms 800 --openai-tokens-per-second 50
+    python -m loadtest --mix read --error-rate 0.05 --json results.json
+    python -m loadtest --target http://127.0.0.1:8000 --no-fakes   # app already running
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from loadtest.fakes import (
+    FaultConfig, create_fake_openai_app, create_fake_recall_app, create_fake_supabase_app
+)
+from loadtest.runner import run_load
+from loadtest.scenarios import MIXES, TenantContext, document_text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEMO_EMAIL = "demo@lemurai.com"
+DEMO_PASSWORD = "demo1234"
+# supabase-py only accepts JWT-shaped keys; the fake never checks signatures
+FAKE_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.loadtest"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeServer:
+    """Runs a fake app under uvicorn in a background thread"""
+
+    def __init__(self, app, port: int):
+        self.url = f"http://127.0.0.1:{port}"
+        self.app = app
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.server.install_signal_handlers = lambda: None
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self) -> "FakeServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def start_fakes(args) -> Dict[str, FakeServer]:
+    def faults(latency_ms: float) -> FaultConfig:
+        # Errors are switched on after seeding so the tenant set-up always succeeds
+        return FaultConfig(latency_ms, args.jitter_ms, 0.0, seed=args.seed)
+
+    recall_port = free_port()
+    return {
+        "openai": FakeServer(create_fake_openai_app(
+            faults(args.openai_latency_ms),
+            embedding_dim=args.embedding_dim,
+            completion_tokens=args.completion_tokens,
+            tokens_per_second=args.openai_tokens_per_second
+        ), free_port()).start(),
+        "recall": FakeServer(create_fake_recall_app(
+            f"http://127.0.0.1:{recall_port}",
+            faults(args.recall_latency_ms),
+            meeting_seconds=args.meeting_seconds
+        ), recall_port).start(),
+        "supabase": FakeServer(create_fake_supabase_app(
+            faults(args.supabase_latency_ms)
+        ), free_port()).start()
+    }
+
+
+def app_environment(fakes: Dict[str, FakeServer], data_dir: str, args) -> Dict[str, str]:
+    """Environment for main:app: every external URL points at a fake, state in a temp dir"""
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": f"{fakes['openai'].url}/v1",
+        "OPENAI_API_KEY": "sk-loadtest",
+        "RECALL_BASE_URL": f"{fakes['recall'].url}/api/v1",
+        "RECALL_API_KEY": "loadtest",
+        "RECALL_CALENDAR_AUTH_URL": f"{fakes['recall'].url}/api/v1/calendar/authenticate/",
+        "SUPABASE_URL": fakes["supabase"].url,
+        "SUPABASE_ANON_KEY": FAKE_SUPABASE_KEY,
+        "SUPABASE_SERVICE_KEY": FAKE_SUPABASE_KEY,
+        "JWT_SECRET_KEY": "loadtest-secret",
+        "CHROMA_DB_PATH": os.path.join(data_dir, "chroma_db"),
+        "UPLOAD_DIR": os.path.join(data_dir, "uploads"),
+        "MEETING_STORE_BACKEND": "sqlite",
+        "MEETING_STORE_PATH": os.path.join(data_dir, "meetings.db"),
+        "GENERATION_CACHE_PATH": os.path.join(data_dir, "generation_cache.db"),
+        "LOG_LEVEL": args.app_log_level,
+        "TRACING_EXPORTER": "none",
+        "DEBUG": "false"
+    })
+    for name in ("GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI",
+                 "GOOGLE_REDIRECT_URI_CALENDAR", "GOOGLE_OAUTH_BASE_URL", "SMTP_SERVER",
+                 "SMTP_USERNAME", "SMTP_PASSWORD", "FROM_EMAIL", "FROM_NAME"):
+        env.setdefault(name, "loadtest")
+    env.setdefault("SMTP_PORT", "587")
+    return env
+
+
+def start_app(env: Dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("main:app did not become healthy in time")
+
+
+async def seed_tenant(client: httpx.AsyncClient, rng: random.Random, documents: int) -> TenantContext:
+    """Log in as the demo user and create a client with a small knowledge base"""
+    response = await client.post("/auth/login", json={"email": DEMO_EMAIL, "password": DEMO_PASSWORD})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.post("/clients/", headers=headers, json={
+        "name": f"Load Test Client {rng.randint(0, 10**6)}",
+        "description": "Seeded by the load-test harness"
+    })
+    response.raise_for_status()
+    ctx = TenantContext(headers=headers, client_id=response.json()["id"], rng=rng)
+
+    for i in range(documents):
+        response = await client.post(
+            "/files/upload",
+            headers=headers,
+            data={"client_id": ctx.client_id},
+            files={"file": (f"seed-{i}.txt", document_text(rng).encode(), "text/plain")}
+        )
+        response.raise_for_status()
+    return ctx
+
+
+def upstream_calls(fakes: Dict[str, FakeServer]) -> Dict[str, Dict[str, int]]:
+    return {name: dict(fake.app.state.calls) for name, fake in fakes.items()}
+
+
+async def main_async(args) -> int:
+    fakes: Dict[str, FakeServer] = {}
+    app_process: Optional[subprocess.Popen] = None
+    base_url = args.target
+
+    try:
+        if not args.no_fakes:
+            fakes = start_fakes(args)
+            print("Fakes: " + ", ".join(f"{name}={fake.url}" for name, fake in fakes.items()))
+
+        if base_url is None:
+            data_dir = tempfile.mkdtemp(prefix="lemur-loadtest-")
+            port = free_port()
+            app_process = start_app(app_environment(fakes, data_dir, args), port, args.workers)
+            base_url = f"http://127.0.0.1:{port}"
+            print(f"App: {base_url} (data in {data_dir})")
+
+        limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_healthy(client)
+            ctx = await seed_tenant(client, random.Random(args.seed), args.seed_documents)
+            for fake in fakes.values():
+                fake.app.state.faults.error_rate = args.error_rate
+                fake.app.state.calls.clear()
+
+            if args.warmup:
+                await run_load(client, ctx, args.mix, MIXES[args.mix], args.users, args.warmup, args.think_ms / 1000)
+                for fake in fakes.values():
+                    fake.app.state.calls.clear()
+
+            result = await run_load(
+                client, ctx, args.mix, MIXES[args.mix], args.users, args.duration, args.think_ms / 1000
+            )
+
+        print()
+        print(result.format_table())
+        calls = upstream_calls(fakes)
+        if calls:
+            print("\nUpstream calls:")
+            for name, counts in calls.items():
+                for route, count in sorted(counts.items()):
+                    print(f"  {name:<9} {route:<40} {count:>7}")
+        if args.json:
+            with open(args.json, "w") as f:
+                f.write(result.to_json(calls))
+            print(f"\nWrote {args.json}")
+        return 0
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            try:
+                app_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                app_process.kill()
+        for fake in fakes.values():
+            fake.stop()
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed", help="traffic mix")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured warm-up seconds")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a user's requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request client timeout")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for traffic and fault injection")
+    parser.add_argument("--seed-documents", type=int, default=3, help="documents uploaded before the run")
+    parser.add_argument("--json", help="also write results as JSON to this path")
+
+    app = parser.add_argument_group("application")
+    app.add_argument("--target", help="base URL of an already running app (skips booting main:app)")
+    app.add_argument("--no-fakes", action="store_true", help="do not start fake upstream services")
+    app.add_argument("--workers", type=int, default=1, help="uvicorn workers for main:app")
+    app.add_argument("--app-log-level", default="WARNING", help="LOG_LEVEL for main:app")
+
+    upstream = parser.add_argument_group("fake upstreams")
+    upstream.add_argument("--openai-latency-ms", type=float, default=200.0)
+    upstream.add_argument("--openai-tokens-per-second", type=float, default=0.0,
+                          help="pace chat completions like a real model (0 = instant)")
+    upstream.add_argument("--completion-tokens", type=int, default=300)
+    upstream.add_argument("--embedding-dim", type=int, default=1536)
+    upstream.add_argument("--recall-latency-ms", type=float, default=100.0)
+    upstream.add_argument("--meeting-seconds", type=float, default=20.0,
+                          help="how long a fake bot stays in the call before its recording is done")
+    upstream.add_argument("--supabase-latency-ms", type=float, default=20.0)
+    upstream.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter for all fakes")
+    upstream.add_argument("--error-rate", type=float, default=0.0,
+                          help="share of upstream requests failing with 429/500/503")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.no_fakes and args.target is None:
+        print("--no-fakes requires --target")
+        return 2
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
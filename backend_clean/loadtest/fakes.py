@@ -0,0 +1,577 @@
+"""
+Local stand-ins for the third-party services Lemur AI talks to
+OpenAI (embeddings + chat), the Recall AI bot API and Supabase PostgREST,
+each a small FastAPI app with configurable latency and error injection
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+
+
+@dataclass
+class FaultConfig:
+    """Latency and failure profile applied to every request of a fake service"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: tuple = (429, 500, 503)
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def delay(self) -> float:
+        """Seconds to wait before answering"""
+        jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def pick_error(self) -> Optional[int]:
+        """HTTP status to fail with, or None to answer normally"""
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._random.choice(self.error_statuses)
+        return None
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _install_faults(app: FastAPI, faults: FaultConfig, error_body) -> None:
+    """Add latency/error injection and per-route call counting to a fake app"""
+    app.state.calls = Counter()
+    app.state.faults = faults
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path == "/_stats":
+            return await call_next(request)
+
+        await asyncio.sleep(faults.delay())
+        status = faults.pick_error()
+        if status is not None:
+            app.state.calls[f"{request.method} error {status}"] += 1
+            headers = {"Retry-After": "1"} if status == 429 else {}
+            return JSONResponse(error_body(status), status_code=status, headers=headers)
+
+        response = await call_next(request)
+        route = request.scope.get("route")
+        app.state.calls[f"{request.method} {route.path if route else request.url.path}"] += 1
+        return response
+
+    @app.get("/_stats")
+    async def stats():
+        return dict(app.state.calls)
+
+
+# ============================================================================
+# OPENAI
+# ============================================================================
+
+_WORDS = (
+    "project timeline budget client scope deliverable meeting review follow up team "
+    "milestone risk proposal requirement integration launch feedback priority owner "
+    "decision next steps action item summary discussion roadmap estimate contract"
+).split()
+_SPEAKERS = ("Alex Johnson", "Priya Patel", "Sam Lee", "Maria Garcia")
+
+
+def _token_estimate(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    """
+    Deterministic unit vector for a text
+
+    Words are hashed into buckets, so texts sharing vocabulary land close
+    together and similarity search returns sensible neighbours.
+    """
+    vector = [0.0] * dim
+    for word in text.lower().split():
+        digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _fake_completion_text(messages: List[Dict[str, Any]], tokens: int) -> str:
+    """Deterministic filler text roughly `tokens` tokens long"""
+    seed = hashlib.sha256(json.dumps(messages, sort_keys=True, default=str).encode()).digest()
+    rng = random.Random(seed)
+    words = [rng.choice(_WORDS) for _ in range(max(1, int(tokens * 0.75)))]
+    sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+    return " ".join(sentences)
+
+
+def _wants_json(body: Dict[str, Any]) -> bool:
+    """JSON mode requested, or a system prompt asking for a JSON object"""
+    if (body.get("response_format") or {}).get("type") in ("json_object", "json_schema"):
+        return True
+    return any(
+        m.get("role") == "system" and "JSON object" in str(m.get("content", ""))
+        for m in body.get("messages", [])
+    )
+
+
+def _fake_meeting_extraction(messages: List[Dict[str, Any]], tokens: int) -> str:
+    """JSON document shaped like the meeting extraction schema"""
+    text = _fake_completion_text(messages, tokens)
+    sentences = text.split(". ")
+    return json.dumps({
+        "summary": ". ".join(sentences[: len(sentences) // 2]),
+        "action_items": [
+            {"task": sentence[:80], "owner": _SPEAKERS[i % len(_SPEAKERS)], "due_date": None,
+             "priority": ("high", "medium", "low")[i % 3]}
+            for i, sentence in enumerate(sentences[:5])
+        ],
+        "follow_up_email": ". ".join(sentences[len(sentences) // 2:])
+    })
+
+
+def create_fake_openai_app(
+    faults: Optional[FaultConfig] = None,
+    embedding_dim: int = 1536,
+    completion_tokens: int = 300,
+    tokens_per_second: float = 0.0
+) -> FastAPI:
+    """
+    OpenAI-compatible /v1/embeddings and /v1/chat/completions
+
+    tokens_per_second > 0 adds generation time proportional to the completion
+    length (and paces streamed chunks), mimicking a real model.
+    """
+    app = FastAPI(title="Fake OpenAI")
+    _install_faults(app, faults or FaultConfig(), lambda status: {
+        "error": {"message": f"Injected failure ({status})", "type": "server_error", "code": None}
+    })
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dim = body.get("dimensions") or embedding_dim
+
+        data = []
+        for index, text in enumerate(inputs):
+            vector = fake_embedding(str(text), dim)
+            if body.get("encoding_format") == "base64":
+                embedding: Any = base64.b64encode(struct.pack(f"<{dim}f", *vector)).decode()
+            else:
+                embedding = vector
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        prompt_tokens = sum(_token_estimate(str(text)) for text in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "text-embedding-ada-002"),
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens") or completion_tokens
+        n_tokens = min(completion_tokens, max_tokens)
+        if _wants_json(body):
+            content = _fake_meeting_extraction(messages, n_tokens)
+        else:
+            content = _fake_completion_text(messages, n_tokens)
+        prompt_tokens = sum(_token_estimate(str(m.get("content", ""))) for m in messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": n_tokens,
+            "total_tokens": prompt_tokens + n_tokens
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "gpt-4")
+
+        if not body.get("stream"):
+            if tokens_per_second > 0:
+                await asyncio.sleep(n_tokens / tokens_per_second)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish_reason=None, chunk_usage=None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [] if chunk_usage else [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ]
+            }
+            if chunk_usage:
+                payload["usage"] = chunk_usage
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream():
+            yield chunk({"role": "assistant", "content": ""})
+            words = content.split(" ")
+            step = 4
+            for i in range(0, len(words), step):
+                if tokens_per_second > 0:
+                    await asyncio.sleep(step / tokens_per_second)
+                piece = " ".join(words[i:i + step])
+                yield chunk({"content": piece if i == 0 else " " + piece})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, chunk_usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+# ============================================================================
+# RECALL AI
+# ============================================================================
+
+def fake_transcript(bot_id: str, segments: int) -> List[Dict[str, Any]]:
+    """Recall-style transcript: one entry per speaker turn with timed words"""
+    rng = random.Random(bot_id)
+    transcript, clock = [], 0.0
+    for i in range(segments):
+        words = []
+        for _ in range(rng.randint(8, 40)):
+            start = clock
+            clock += rng.uniform(0.2, 0.5)
+            words.append({
+                "text": rng.choice(_WORDS),
+                "start_timestamp": {"relative": round(start, 2)},
+                "end_timestamp": {"relative": round(clock, 2)}
+            })
+        clock += rng.uniform(0.5, 2.0)
+        speaker = _SPEAKERS[i % len(_SPEAKERS)]
+        transcript.append({
+            "participant": {"id": _SPEAKERS.index(speaker) + 1, "name": speaker},
+            "words": words
+        })
+    return transcript
+
+
+def create_fake_recall_app(
+    public_url: str,
+    faults: Optional[FaultConfig] = None,
+    join_seconds: float = 2.0,
+    meeting_seconds: float = 20.0,
+    transcript_segments: int = 200,
+    page_size: int = 50
+) -> FastAPI:
+    """
+    Recall bot API under /api/v1 plus transcript downloads under /transcripts
+
+    Bots move through joining_call -> in_call_recording -> call_ended -> done
+    on a timer, after which their recording exposes a transcript URL served
+    by this same app. Bots created with a webhook in
+    recording_config.realtime_endpoints get the same transcript pushed to it
+    as `transcript.data` events, one speaker turn at a time, spread over
+    the recording.
+    """
+    app = FastAPI(title="Fake Recall AI")
+    _install_faults(app, faults or FaultConfig(), lambda status: {
+        "code": "throttled" if status == 429 else "server_error",
+        "detail": f"Injected failure ({status})"
+    })
+    bots: Dict[str, Dict[str, Any]] = {}
+    lock = threading.Lock()
+    pushers: set = set()
+
+    def render(bot: Dict[str, Any]) -> Dict[str, Any]:
+        elapsed = time.time() - bot["_created"]
+        codes = ["joining_call"]
+        if elapsed >= join_seconds:
+            codes.append("in_call_recording")
+        if elapsed >= meeting_seconds:
+            codes += ["call_ended", "done"]
+        status_changes = [
+            {"code": code, "sub_code": None, "created_at": bot["join_at"]} for code in codes
+        ]
+        recordings = []
+        if "done" in codes:
+            recordings.append({
+                "id": f"rec-{bot['id']}",
+                "status": {"code": "done"},
+                "media_shortcuts": {
+                    "video_mixed": {"data": {"download_url": f"{public_url}/media/{bot['id']}.mp4"}},
+                    "transcript": {"data": {"download_url": f"{public_url}/transcripts/{bot['id']}"}}
+                }
+            })
+        public = {k: v for k, v in bot.items() if not k.startswith("_")}
+        return {**public, "status_changes": status_changes, "recordings": recordings}
+
+    @app.post("/api/v1/bot", status_code=201)
+    async def create_bot(request: Request):
+        body = await request.json()
+        bot_id = str(uuid.uuid4())
+        meeting_url = str(body.get("meeting_url", ""))
+        bot = {
+            "id": bot_id,
+            "bot_name": body.get("bot_name", "Bot"),
+            "meeting_url": {
+                "platform": meeting_url.split("//")[-1].split(".")[0] or "google_meet",
+                "meeting_id": meeting_url.rstrip("/").rsplit("/", 1)[-1]
+            },
+            "join_at": _now_iso(),
+            "recording_config": body.get("recording_config", {}),
+            "_created": time.time()
+        }
+        with lock:
+            bots[bot_id] = bot
+        urls = [
+            endpoint["url"] for endpoint in bot["recording_config"].get("realtime_endpoints") or []
+            if endpoint.get("type") == "webhook" and "transcript.data" in (endpoint.get("events") or [])
+        ]
+        if urls:
+            task = asyncio.create_task(push_transcript(bot_id, urls))
+            pushers.add(task)
+            task.add_done_callback(pushers.discard)
+        return render(bot)
+
+    async def push_transcript(bot_id: str, urls: List[str]):
+        entries = fake_transcript(bot_id, transcript_segments)
+        spacing = (meeting_seconds - join_seconds) / max(len(entries), 1)
+        await asyncio.sleep(join_seconds)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            for entry in entries:
+                event = {
+                    "event": "transcript.data",
+                    "data": {"data": entry, "bot": {"id": bot_id, "metadata": {}}}
+                }
+                for url in urls:
+                    try:
+                        await client.post(url, json=event)
+                    except httpx.HTTPError:
+                        pass  # real-time deliveries are not retried
+                await asyncio.sleep(spacing)
+
+    @app.get("/api/v1/bot")
+    async def list_bots(cursor: int = 0):
+        with lock:
+            all_bots = list(bots.values())
+        page = all_bots[cursor:cursor + page_size]
+        next_cursor = cursor + page_size
+        return {
+            "count": len(all_bots),
+            "next": f"{public_url}/api/v1/bot?cursor={next_cursor}" if next_cursor < len(all_bots) else None,
+            "previous": None,
+            "results": [render(bot) for bot in page]
+        }
+
+    @app.get("/api/v1/bot/{bot_id}")
+    async def get_bot(bot_id: str):
+        bot = bots.get(bot_id)
+        if bot is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        return render(bot)
+
+    @app.delete("/api/v1/bot/{bot_id}")
+    async def delete_bot(bot_id: str):
+        bot = bots.get(bot_id)
+        if bot is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        if time.time() - bot["_created"] >= join_seconds:
+            return JSONResponse(
+                {"code": "cannot_delete_bot", "detail": "Bot has already joined the call."},
+                status_code=405
+            )
+        with lock:
+            bots.pop(bot_id, None)
+        return Response(status_code=204)
+
+    @app.get("/transcripts/{bot_id}")
+    async def download_transcript(bot_id: str):
+        if bot_id not in bots:
+            return PlainTextResponse("Not found", status_code=404)
+        return fake_transcript(bot_id, transcript_segments)
+
+    return app
+
+
+# ============================================================================
+# SUPABASE (POSTGREST)
+# ============================================================================
+
+def _as_text(value: Any) -> str:
+    """Render a stored value the way it appears in a PostgREST filter"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (eq, neq, gt, gte, lt, lte, is, in, like, ilike, not.*)"""
+    if expression.startswith("not."):
+        return not _matches(row, column, expression[4:])
+    operator, _, operand = expression.partition(".")
+    value = row.get(column)
+    text = _as_text(value)
+
+    if operator == "eq":
+        return text == operand
+    if operator == "neq":
+        return text != operand
+    if operator == "is":
+        return text == operand.lower()
+    if operator == "in":
+        options = [o.strip().strip('"') for o in operand.strip("()").split(",")]
+        return text in options
+    if operator in ("like", "ilike"):
+        pattern = operand.replace("*", "%")
+        subject, pattern = (text.lower(), pattern.lower()) if operator == "ilike" else (text, pattern)
+        parts = pattern.split("%")
+        return subject.startswith(parts[0]) and subject.endswith(parts[-1]) and all(p in subject for p in parts)
+    if operator in ("gt", "gte", "lt", "lte"):
+        if value is None:
+            return False
+        try:
+            left, right = float(value), float(operand)
+        except (TypeError, ValueError):
+            left, right = text, operand
+        return {
+            "gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right
+        }[operator]
+    return False
+
+
+_RESERVED_PARAMS = {"select", "columns", "on_conflict", "order", "limit", "offset"}
+
+
+def create_fake_supabase_app(faults: Optional[FaultConfig] = None) -> FastAPI:
+    """
+    In-memory PostgREST emulation at /rest/v1/{table}
+
+    Supports the subset supabase-py uses: select with column projection,
+    filters, order/limit/offset, insert (single or bulk, optional upsert),
+    update and delete, all returning representation.
+    """
+    app = FastAPI(title="Fake Supabase")
+    _install_faults(app, faults or FaultConfig(), lambda status: {
+        "code": str(status), "message": f"Injected failure ({status})", "details": None, "hint": None
+    })
+    tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    lock = threading.Lock()
+
+    def select_rows(table: str, request: Request) -> List[Dict[str, Any]]:
+        params = request.query_params
+        rows = list(tables.get(table, {}).values())
+        for column, expression in params.multi_items():
+            if column not in _RESERVED_PARAMS:
+                rows = [row for row in rows if _matches(row, column, expression)]
+
+        order = params.get("order")
+        if order:
+            for clause in reversed(order.split(",")):
+                column, _, direction = clause.partition(".")
+                rows.sort(key=lambda r: _as_text(r.get(column)), reverse=direction.startswith("desc"))
+
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        return rows[offset:offset + int(limit)] if limit else rows[offset:]
+
+    def project(rows: List[Dict[str, Any]], request: Request) -> List[Dict[str, Any]]:
+        select = request.query_params.get("select", "*")
+        if select == "*" or not select:
+            return rows
+        columns = [c.strip() for c in select.split(",")]
+        return [{c: row.get(c) for c in columns} for row in rows]
+
+    def respond(rows: List[Dict[str, Any]], request: Request, status_code: int = 200) -> Response:
+        body = project(rows, request)
+        headers = {"Content-Range": f"0-{max(len(body) - 1, 0)}/{len(body)}"}
+        if request.headers.get("accept") == "application/vnd.pgrst.object+json":
+            if len(body) != 1:
+                return JSONResponse(
+                    {"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned"},
+                    status_code=406
+                )
+            return JSONResponse(body[0], status_code=status_code, headers=headers)
+        return JSONResponse(body, status_code=status_code, headers=headers)
+
+    @app.get("/rest/v1/{table}")
+    async def select(table: str, request: Request):
+        with lock:
+            rows = select_rows(table, request)
+        return respond(rows, request)
+
+    @app.post("/rest/v1/{table}")
+    async def insert(table: str, request: Request):
+        payload = await request.json()
+        records = payload if isinstance(payload, list) else [payload]
+        upsert = "merge-duplicates" in request.headers.get("prefer", "")
+        now = _now_iso()
+        inserted = []
+        with lock:
+            rows = tables.setdefault(table, {})
+            for record in records:
+                row = {"created_at": now, "updated_at": now, **record}
+                row.setdefault("id", str(uuid.uuid4()))
+                row_id = str(row["id"])
+                if row_id in rows:
+                    if not upsert:
+                        return JSONResponse({
+                            "code": "23505",
+                            "message": f'duplicate key value violates unique constraint "{table}_pkey"',
+                            "details": f"Key (id)=({row_id}) already exists.",
+                            "hint": None
+                        }, status_code=409)
+                    row = {**rows[row_id], **record}
+                rows[row_id] = row
+                inserted.append(row)
+        return respond(inserted, request, status_code=201)
+
+    @app.patch("/rest/v1/{table}")
+    async def update(table: str, request: Request):
+        changes = await request.json()
+        with lock:
+            rows = select_rows(table, request)
+            for row in rows:
+                row.update({"updated_at": _now_iso(), **changes})
+        return respond(rows, request)
+
+    @app.delete("/rest/v1/{table}")
+    async def delete(table: str, request: Request):
+        with lock:
+            rows = select_rows(table, request)
+            for row in rows:
+                tables[table].pop(str(row["id"]), None)
+        return respond(rows, request)
+
+    return app
@@ -0,0 +1,131 @@
+"""
+Closed-loop load driver and latency report
+N virtual users pick weighted operations from a mix until the deadline;
+results are aggregated per endpoint into throughput and latency percentiles
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from loadtest.scenarios import LABELS, Operation, TenantContext
+
+
+@dataclass
+class EndpointStats:
+    """Latencies (seconds) and outcome counts for one endpoint"""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class LoadResult:
+    """Per-endpoint statistics for one run"""
+    mix: str
+    concurrency: int
+    duration: float
+    endpoints: Dict[str, EndpointStats]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        rows = {}
+        for label, stats in sorted(self.endpoints.items()):
+            latencies = sorted(stats.latencies)
+            rows[label] = {
+                "requests": stats.count,
+                "errors": stats.errors,
+                "rps": round(stats.count / self.duration, 2) if self.duration else 0.0,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+                "statuses": dict(stats.statuses)
+            }
+        return rows
+
+    def to_json(self, upstream_calls: Optional[Dict[str, Dict[str, int]]] = None) -> str:
+        total = sum(s.count for s in self.endpoints.values())
+        return json.dumps({
+            "mix": self.mix,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 2),
+            "total_requests": total,
+            "total_rps": round(total / self.duration, 2) if self.duration else 0.0,
+            "endpoints": self.summary(),
+            "upstream_calls": upstream_calls or {}
+        }, indent=2)
+
+    def format_table(self) -> str:
+        header = f"{'endpoint':<48} {'reqs':>7} {'errs':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+        lines = [header, "-" * len(header)]
+        total_requests = total_errors = 0
+        for label, row in self.summary().items():
+            total_requests += row["requests"]
+            total_errors += row["errors"]
+            lines.append(
+                f"{label:<48} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8.2f} "
+                f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms"
+            )
+        lines.append("-" * len(header))
+        total_rps = total_requests / self.duration if self.duration else 0.0
+        lines.append(
+            f"{'TOTAL':<48} {total_requests:>7} {total_errors:>6} {total_rps:>8.2f}   "
+            f"({self.mix} mix, {self.concurrency} users, {self.duration:.1f}s)"
+        )
+        return "\n".join(lines)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    ctx: TenantContext,
+    mix_name: str,
+    mix: List[Tuple[Operation, int]],
+    concurrency: int,
+    duration: float,
+    think_time: float = 0.0
+) -> LoadResult:
+    """Drive `concurrency` virtual users through the mix for `duration` seconds"""
+    operations = [op for op, _ in mix]
+    weights = [weight for _, weight in mix]
+    endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user():
+        while time.perf_counter() < deadline:
+            operation = ctx.rng.choices(operations, weights)[0]
+            stats = endpoints[LABELS[operation]]
+            started = time.perf_counter()
+            try:
+                response = await operation(client, ctx)
+                status = str(response.status_code)
+                failed = response.status_code >= 400
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                failed = True
+            stats.latencies.append(time.perf_counter() - started)
+            stats.statuses[status] += 1
+            if failed:
+                stats.errors += 1
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    return LoadResult(mix_name, concurrency, time.perf_counter() - started, dict(endpoints))
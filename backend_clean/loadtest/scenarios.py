@@ -0,0 +1,180 @@
+"""
+Traffic mixes for the load-test driver
+Each operation issues one API call against a seeded tenant and returns the
+response; a mix is a weighted list of operations
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+SEARCH_QUERIES = [
+    "project timeline and milestones",
+    "budget estimate for the integration",
+    "who owns the launch deliverable",
+    "risks raised in the last review",
+    "next steps and action items",
+    "contract scope and requirements"
+]
+
+AI_PROMPTS = [
+    "Summarise where the project stands and what is blocking the launch",
+    "Draft a follow up covering the agreed next steps and owners",
+    "Outline a proposal for the integration phase with a rough estimate",
+    "List the open action items and who is responsible for each"
+]
+
+
+@dataclass
+class TenantContext:
+    """State shared by all virtual users: auth header, seeded client, started meetings"""
+    headers: Dict[str, str]
+    client_id: str
+    meeting_ids: List[str] = field(default_factory=list)
+    bot_ids: List[str] = field(default_factory=list)
+    rng: random.Random = field(default_factory=random.Random)
+
+
+Operation = Callable[[httpx.AsyncClient, TenantContext], Awaitable[httpx.Response]]
+
+
+def document_text(rng: random.Random, paragraphs: int = 20) -> str:
+    """Plain-text knowledge-base document built from the search vocabulary"""
+    vocabulary = " ".join(SEARCH_QUERIES + AI_PROMPTS).lower().split()
+    return "\n\n".join(
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(60, 120)))
+        for _ in range(paragraphs)
+    )
+
+
+async def health(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.get("/health")
+
+
+async def list_clients(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.get("/clients/", headers=ctx.headers)
+
+
+async def knowledge_stats(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.get(f"/files/knowledge-stats/{ctx.client_id}", headers=ctx.headers)
+
+
+async def search(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.post("/files/search", headers=ctx.headers, json={
+        "query": ctx.rng.choice(SEARCH_QUERIES),
+        "client_id": ctx.client_id,
+        "n_results": 5
+    })
+
+
+async def upload(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    content = document_text(ctx.rng).encode()
+    return await client.post(
+        "/files/upload",
+        headers=ctx.headers,
+        data={"client_id": ctx.client_id},
+        files={"file": (f"notes-{ctx.rng.randint(0, 10**6)}.txt", content, "text/plain")}
+    )
+
+
+async def generate(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.post("/ai/generate", headers=ctx.headers, json={
+        "prompt": ctx.rng.choice(AI_PROMPTS),
+        "content_type": ctx.rng.choice(["summary", "proposal", "action_items"]),
+        "client_id": ctx.client_id
+    })
+
+
+async def generate_email(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.post("/ai/email", headers=ctx.headers, json={
+        "prompt": ctx.rng.choice(AI_PROMPTS),
+        "client_id": ctx.client_id,
+        "recipient_name": "Jordan",
+        "sender_name": "Demo User"
+    })
+
+
+async def generate_summary(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.post("/ai/summary", headers=ctx.headers, json={
+        "prompt": ctx.rng.choice(AI_PROMPTS),
+        "client_id": ctx.client_id
+    })
+
+
+async def start_recording(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    response = await client.post("/meeting-intelligence/start-recording", headers=ctx.headers, json={
+        "meeting_url": f"https://meet.google.com/lt-{ctx.rng.randint(0, 10**6):06d}",
+        "meeting_title": "Load test sync",
+        "client_id": ctx.client_id,
+        "attendees": ["alex@example.com", "priya@example.com"]
+    })
+    if response.status_code == 200:
+        ctx.meeting_ids.append(response.json()["meeting_id"])
+    return response
+
+
+async def create_bot(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    response = await client.post("/bots/create-bot", headers=ctx.headers, json={
+        "meeting_url": f"https://meet.google.com/lt-{ctx.rng.randint(0, 10**6):06d}",
+        "bot_name": "Load Test Bot"
+    })
+    if response.status_code == 200:
+        ctx.bot_ids.append(response.json()["bot_id"])
+    return response
+
+
+async def meeting_status(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    if not ctx.meeting_ids:
+        return await start_recording(client, ctx)
+    meeting_id = ctx.rng.choice(ctx.meeting_ids)
+    return await client.get(f"/meeting-intelligence/status/{meeting_id}", headers=ctx.headers)
+
+
+async def bot_status(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    if not ctx.bot_ids:
+        return await create_bot(client, ctx)
+    bot_id = ctx.rng.choice(ctx.bot_ids)
+    return await client.get(f"/bots/bot/{bot_id}/status", headers=ctx.headers)
+
+
+async def list_bots(client: httpx.AsyncClient, ctx: TenantContext) -> httpx.Response:
+    return await client.get("/bots/", headers=ctx.headers)
+
+
+# Endpoint label reported for each operation (path templates, not raw URLs)
+LABELS: Dict[Operation, str] = {
+    health: "GET /health",
+    list_clients: "GET /clients/",
+    knowledge_stats: "GET /files/knowledge-stats/{client_id}",
+    search: "POST /files/search",
+    upload: "POST /files/upload",
+    generate: "POST /ai/generate",
+    generate_email: "POST /ai/email",
+    generate_summary: "POST /ai/summary",
+    start_recording: "POST /meeting-intelligence/start-recording",
+    create_bot: "POST /bots/create-bot",
+    meeting_status: "GET /meeting-intelligence/status/{meeting_id}",
+    bot_status: "GET /bots/bot/{bot_id}/status",
+    list_bots: "GET /bots/"
+}
+
+MIXES: Dict[str, List[Tuple[Operation, int]]] = {
+    "read": [
+        (health, 10), (list_clients, 20), (search, 50), (knowledge_stats, 10), (list_bots, 10)
+    ],
+    "ingest": [
+        (upload, 60), (search, 40)
+    ],
+    "generate": [
+        (search, 30), (generate, 40), (generate_summary, 15), (generate_email, 15)
+    ],
+    "meetings": [
+        (start_recording, 15), (create_bot, 10), (meeting_status, 35), (bot_status, 30), (list_bots, 10)
+    ],
+    "mixed": [
+        (health, 5), (list_clients, 10), (search, 30), (upload, 5), (generate, 15),
+        (generate_email, 5), (start_recording, 5), (meeting_status, 15), (bot_status, 10)
+    ]
+}
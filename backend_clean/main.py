@@ -5,25 +5,35 @@ Main FastAPI application entry point
 
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.utils.config import get_settings
 from app.core.database import init_database
-from app.core.auth import initialize_demo_users
-from app.api import auth, clients, files, ai, calendar, bots, debug, meeting_intelligence
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger(__name__)
+from app.core.auth import initialize_demo_users, is_admin_request
+from app.core.metrics import render_metrics
+from app.core.llm_gateway import llm_gateway
+from app.core.generation_cache import generation_cache
+from app.core.bot_poller import bot_poller
+from app.core.meeting_intelligence import meeting_intelligence as meeting_service
+from app.core.meeting_store import meeting_store
+from app.core.meeting_queue import meeting_queue
+from app.core.live_transcripts import live_transcripts
+from app.core.recall_service import recall_service
+from app.core.transcript_fetcher import transcript_fetcher
+from app.core.tracing import tracer, new_request_id, set_request_id, SPAN_KIND_SERVER
+from app.core.profiler import start_request_profile, request_profiles
+from app.utils.log_config import configure_logging
+from app.api import auth, clients, files, ai, calendar, bots, debug, meeting_intelligence, webhooks
 
 # Get settings
 settings = get_settings()
 
+# Configure logging
+configure_logging(settings)
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,11 +50,24 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Demo users initialized")
     else:
         logger.error("❌ Database initialization failed")
+
+    # Resume meetings that were recording or processing when we last stopped
+    await meeting_service.recover()
+    if settings.meeting_workers_in_api:
+        meeting_queue.start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down application")
+    await meeting_queue.stop()
+    await live_transcripts.stop()
+    await bot_poller.stop()
+    await recall_service.aclose()
+    await transcript_fetcher.aclose()
+    await llm_gateway.aclose()
+    generation_cache.close()
+    meeting_store.close()
 
 
 # Create FastAPI application
@@ -65,6 +88,47 @@ app.add_middleware(
 )
 
 
+# ============================================================================
+# REQUEST TRACING
+# ============================================================================
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Bind a request ID and open a server span around every request
+
+    Admins can add an `X-Profile: 1` header to sample this request; the profile
+    ID comes back in `X-Profile-Id` (see /debug/profile/requests).
+    """
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    set_request_id(request_id)
+
+    profiler = None
+    if "x-profile" in request.headers and is_admin_request(request.headers.get("x-admin-token")):
+        profiler = start_request_profile()
+
+    try:
+        with tracer.start_span(
+            f"{request.method} {request.url.path}",
+            kind=SPAN_KIND_SERVER,
+            attributes={"http.method": request.method, "http.target": request.url.path},
+            traceparent=request.headers.get("traceparent")
+        ) as span:
+            response = await call_next(request)
+            span.set_attribute("http.status_code", response.status_code)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+    if profiler is not None:
+        response.headers["X-Profile-Id"] = request_profiles.add(
+            profiler, path=request.url.path, request_id=request_id
+        )
+    response.headers["X-Request-ID"] = request_id
+    response.headers["traceparent"] = span.traceparent
+    return response
+
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
@@ -80,6 +144,15 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -125,6 +198,9 @@ app.include_router(bots.router, prefix="/bots", tags=["Bots"])
 # Meeting Intelligence routes
 app.include_router(meeting_intelligence.router, prefix="/meeting-intelligence", tags=["Meeting Intelligence"])
 
+# Webhook receivers (signature-authenticated)
+app.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
+
 # Debug routes (development only)
 app.include_router(debug.router, prefix="/debug", tags=["Debug"])
 
@@ -0,0 +1,30 @@
+"""
+Shared test setup
+Settings are read when app modules are imported, so the environment is
+filled in here first: placeholders for the required credentials and a
+temporary directory for every on-disk store
+"""
+
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="lemur-tests-")
+
+for name in (
+    "JWT_SECRET_KEY", "SUPABASE_ANON_KEY", "OPENAI_API_KEY", "RECALL_API_KEY", "GOOGLE_CLIENT_ID",
+    "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI", "GOOGLE_REDIRECT_URI_CALENDAR", "GOOGLE_OAUTH_BASE_URL",
+    "SMTP_SERVER", "SMTP_USERNAME", "SMTP_PASSWORD", "FROM_NAME"
+):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("RECALL_CALENDAR_AUTH_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SMTP_PORT", "587")
+os.environ.setdefault("FROM_EMAIL", "tests@example.com")
+os.environ.update({
+    "MEETING_STORE_BACKEND": "sqlite",
+    "MEETING_STORE_PATH": os.path.join(_data_dir, "meetings.db"),
+    "GENERATION_CACHE_PATH": os.path.join(_data_dir, "generation_cache.db"),
+    "CHROMA_DB_PATH": os.path.join(_data_dir, "chroma_db"),
+    "UPLOAD_DIR": os.path.join(_data_dir, "uploads"),
+    "TRACING_EXPORTER": "none"
+})
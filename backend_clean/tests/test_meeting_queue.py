@@ -0,0 +1,190 @@
+"""
+Tests for the post-meeting processing queue: priority order, retry backoff
+and dead-lettering
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import app.core.meeting_queue as meeting_queue_module
+from app.core.meeting_queue import MeetingQueue, PRIORITY_MANUAL, PRIORITY_NORMAL, PRIORITY_VIP
+from app.core.meeting_store import (
+    MeetingStore, STAGE_DEAD_LETTER, STAGE_PROCESSED, STAGE_QUEUED, STAGE_RECORDING
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MeetingStore(str(tmp_path / "meetings.db"))
+    monkeypatch.setattr(meeting_queue_module, "meeting_store", store)
+    yield store
+    store.close()
+
+
+def make_queue(max_attempts: int = 3) -> MeetingQueue:
+    return MeetingQueue(
+        workers=1, max_attempts=max_attempts, retry_base_delay=10, retry_max_delay=60,
+        poll_interval=0.05, lease_seconds=60
+    )
+
+
+async def record(store: MeetingStore, *meeting_ids: str):
+    for meeting_id in meeting_ids:
+        await store.save({
+            "meeting_id": meeting_id, "bot_id": f"bot-{meeting_id}", "client_id": "client-1",
+            "stage": STAGE_RECORDING, "started_at": datetime.now()
+        })
+
+
+def test_claims_follow_priority_then_queue_order(store):
+    async def run():
+        queue = make_queue()
+        await record(store, "normal-1", "vip", "manual", "normal-2")
+        await queue.enqueue("normal-1", [STAGE_RECORDING], priority=PRIORITY_NORMAL)
+        await queue.enqueue("vip", [STAGE_RECORDING], priority=PRIORITY_VIP)
+        await queue.enqueue("manual", [STAGE_RECORDING], priority=PRIORITY_MANUAL)
+        await queue.enqueue("normal-2", [STAGE_RECORDING], priority=PRIORITY_NORMAL)
+        claimed = []
+        while (meeting := await store.claim_next("worker", 60)) is not None:
+            claimed.append(meeting["meeting_id"])
+        return claimed
+
+    assert asyncio.run(run()) == ["manual", "vip", "normal-1", "normal-2"]
+
+
+def test_enqueue_only_from_expected_stages(store):
+    async def run():
+        queue = make_queue()
+        await record(store, "m1")
+        assert await queue.enqueue("m1", [STAGE_RECORDING]) is not None
+        return await queue.enqueue("m1", [STAGE_RECORDING])
+
+    assert asyncio.run(run()) is None
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    queue = make_queue()
+    for attempts, expected in ((1, 10), (2, 20), (3, 40), (4, 60), (10, 60)):
+        assert expected * 0.8 <= queue.retry_delay(attempts) <= expected * 1.2
+
+
+def test_failed_attempt_is_requeued_after_backoff(store):
+    async def run():
+        queue = make_queue()
+
+        async def handler(meeting):
+            return False
+        queue.set_handler(handler)
+        await record(store, "m1")
+        await queue.enqueue("m1", [STAGE_RECORDING])
+        before = datetime.now()
+        assert await queue.process(await store.claim_next(queue.owner, 60)) is False
+        meeting = await store.get("m1")
+        not_yet_due = await store.claim_next(queue.owner, 60)
+        return before, meeting, not_yet_due
+
+    before, meeting, not_yet_due = asyncio.run(run())
+    assert meeting["stage"] == STAGE_QUEUED
+    assert meeting["attempts"] == 1
+    assert meeting["lease_owner"] is None
+    assert meeting["error"] == "Meeting could not be processed"
+    assert 8 <= (meeting["available_at"] - before).total_seconds() <= 13
+    assert not_yet_due is None
+
+
+def test_meeting_is_dead_lettered_after_max_attempts(store):
+    async def run():
+        queue = make_queue(max_attempts=2)
+
+        async def handler(meeting):
+            raise RuntimeError(f"boom {meeting['attempts']}")
+        queue.set_handler(handler)
+        await record(store, "m1")
+        await queue.enqueue("m1", [STAGE_RECORDING])
+        for _ in range(2):
+            await store.update("m1", available_at=datetime.now())  # skip the backoff
+            await queue.process(await store.claim_next(queue.owner, 60))
+        return await store.get("m1")
+
+    meeting = asyncio.run(run())
+    assert meeting["stage"] == STAGE_DEAD_LETTER
+    assert meeting["attempts"] == 2
+    assert meeting["error"] == "boom 2"
+
+
+def test_successful_attempt_is_recorded_once(store):
+    async def run():
+        queue = make_queue()
+        handled = []
+
+        async def handler(meeting):
+            handled.append(meeting["meeting_id"])
+            return True
+        queue.set_handler(handler)
+        await record(store, "m1")
+        await queue.enqueue("m1", [STAGE_RECORDING])
+        queue.start()
+        for _ in range(100):
+            if (await store.get("m1"))["stage"] == STAGE_PROCESSED:
+                break
+            await asyncio.sleep(0.02)
+        await queue.stop()
+        return handled, await store.get("m1")
+
+    handled, meeting = asyncio.run(run())
+    assert handled == ["m1"]
+    assert meeting["stage"] == STAGE_PROCESSED
+    assert meeting["processed"] is True
+
+
+def test_meeting_whose_generations_fail_is_retried_then_dead_lettered(store, monkeypatch):
+    import app.core.meeting_intelligence as intelligence
+    from app.core.transcript import TranscriptSegment
+
+    service = intelligence.meeting_intelligence
+    generations = []
+
+    async def get_download_urls(bot_id):
+        return {"success": True, "transcript_url": "https://recall.test/transcript"}
+
+    async def fetch(url):
+        return [TranscriptSegment(speaker="Ada", start=0.0, end=4.2, text="Let's ship it on Friday")]
+
+    async def get_client_context(*args):
+        return []
+
+    async def generate(transcript, context_results, meeting_data, bypass_cache=False):
+        generations.append(meeting_data["meeting_id"])
+        return {
+            "summary": {"success": False, "error": "rate limited"},
+            "action_items": {"success": False, "error": "rate limited"}
+        }
+
+    monkeypatch.setattr(intelligence.recall_service, "get_download_urls", get_download_urls)
+    monkeypatch.setattr(intelligence.recall_service, "invalidate", lambda bot_id: None)
+    monkeypatch.setattr(intelligence.transcript_fetcher, "fetch", fetch)
+    monkeypatch.setattr(intelligence.settings, "index_meeting_transcripts", False)
+    monkeypatch.setattr(service, "_get_client_context", get_client_context)
+    monkeypatch.setattr(service, "_generate_meeting_ai_content", generate)
+
+    async def run():
+        queue = make_queue(max_attempts=2)
+        queue.set_handler(service._process_completed_meeting)
+        await store.save({
+            "meeting_id": "m1", "bot_id": "bot-m1", "client_id": "client-1", "user_id": "user-1",
+            "meeting_title": "Launch review", "stage": STAGE_RECORDING, "started_at": datetime.now()
+        })
+        await queue.enqueue("m1", [STAGE_RECORDING])
+        stages = []
+        for _ in range(2):
+            await store.update("m1", available_at=datetime.now())  # skip the backoff
+            assert await queue.process(await store.claim_next(queue.owner, 60)) is False
+            stages.append((await store.get("m1"))["stage"])
+        return stages, await store.get("m1")
+
+    stages, meeting = asyncio.run(run())
+    assert stages == [STAGE_QUEUED, STAGE_DEAD_LETTER]
+    assert meeting["error"] == "Meeting could not be processed"
+    assert generations == ["m1", "m1"]
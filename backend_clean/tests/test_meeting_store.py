@@ -0,0 +1,85 @@
+"""
+Tests for meeting leases in the SQLite meeting store
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.meeting_store import MeetingStore, STAGE_PROCESSED, STAGE_PROCESSING, STAGE_QUEUED, STAGE_RECORDING
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MeetingStore(str(tmp_path / "meetings.db"))
+    yield store
+    store.close()
+
+
+async def queue_meeting(store: MeetingStore, meeting_id: str = "m1"):
+    await store.save({"meeting_id": meeting_id, "bot_id": f"bot-{meeting_id}", "stage": STAGE_RECORDING})
+    now = datetime.now()
+    await store.transition(meeting_id, [STAGE_RECORDING], STAGE_QUEUED, priority=20, queued_at=now, available_at=now)
+
+
+def test_claim_leases_the_meeting_to_one_owner(store):
+    async def run():
+        await queue_meeting(store)
+        first = await store.claim_next("worker-a", 60)
+        second = await store.claim_next("worker-b", 60)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["meeting_id"] == "m1"
+    assert first["stage"] == STAGE_PROCESSING
+    assert first["lease_owner"] == "worker-a"
+    assert first["attempts"] == 1
+    assert second is None
+
+
+def test_expired_lease_is_reclaimed(store):
+    async def run():
+        await queue_meeting(store)
+        await store.claim_next("worker-a", 0.05)
+        await asyncio.sleep(0.1)  # worker-a stopped renewing
+        reclaimed = await store.claim_next("worker-b", 60)
+        renewed_by_old_owner = await store.renew_lease("m1", "worker-a", 60)
+        recorded_by_old_owner = await store.transition(
+            "m1", [STAGE_PROCESSING], STAGE_PROCESSED, lease_owner="worker-a"
+        )
+        return reclaimed, renewed_by_old_owner, recorded_by_old_owner
+
+    reclaimed, renewed_by_old_owner, recorded_by_old_owner = asyncio.run(run())
+    assert reclaimed["lease_owner"] == "worker-b"
+    assert reclaimed["attempts"] == 2
+    assert renewed_by_old_owner is False
+    assert recorded_by_old_owner is None
+
+
+def test_renew_lease_only_for_its_owner(store):
+    async def run():
+        await queue_meeting(store)
+        claimed = await store.claim_next("worker-a", 60)
+        by_other = await store.renew_lease("m1", "worker-b", 60)
+        by_owner = await store.renew_lease("m1", "worker-a", 120)
+        return claimed, by_other, by_owner, await store.get("m1")
+
+    claimed, by_other, by_owner, meeting = asyncio.run(run())
+    assert by_other is False
+    assert by_owner is True
+    assert meeting["lease_owner"] == "worker-a"
+    assert meeting["lease_until"] > claimed["lease_until"]
+
+
+def test_renew_lease_fails_once_the_meeting_left_processing(store):
+    async def run():
+        await queue_meeting(store)
+        await store.claim_next("worker-a", 60)
+        await store.transition("m1", [STAGE_PROCESSING], STAGE_PROCESSED, lease_owner="worker-a")
+        return await store.renew_lease("m1", "worker-a", 60), await store.get("m1")
+
+    renewed, meeting = asyncio.run(run())
+    assert renewed is False
+    assert meeting["stage"] == STAGE_PROCESSED
+    assert meeting["lease_owner"] is None
@@ -0,0 +1,84 @@
+"""
+Tests for Recall webhook signature verification and the webhook routes
+"""
+
+import base64
+import hashlib
+import hmac
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.recall_webhooks import WebhookVerificationError, verify_webhook
+
+SECRET = "whsec_" + base64.b64encode(b"lemur-test-secret").decode()
+BODY = b'{"event": "bot.status_change", "data": {"bot": {"id": "bot-1"}, "status": {"code": "done"}}}'
+
+
+def sign(body: bytes, timestamp: int, message_id: str = "msg_1", secret: str = SECRET) -> dict:
+    key = base64.b64decode(secret[len("whsec_"):])
+    signed = f"{message_id}.{timestamp}.".encode("utf-8") + body
+    signature = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    return {"svix-id": message_id, "svix-timestamp": str(timestamp), "svix-signature": f"v1,{signature}"}
+
+
+def test_valid_signature_returns_message_id():
+    headers = sign(BODY, int(time.time()))
+    assert verify_webhook(SECRET, headers, BODY) == "msg_1"
+
+
+def test_standard_webhook_headers_and_rotated_signatures():
+    headers = sign(BODY, int(time.time()))
+    signature = headers["svix-signature"]
+    headers = {
+        "webhook-id": headers["svix-id"],
+        "webhook-timestamp": headers["svix-timestamp"],
+        "webhook-signature": f"v1,{base64.b64encode(b'old').decode()} {signature}"
+    }
+    assert verify_webhook(SECRET, headers, BODY) == "msg_1"
+
+
+def test_tampered_body_is_rejected():
+    headers = sign(BODY, int(time.time()))
+    with pytest.raises(WebhookVerificationError):
+        verify_webhook(SECRET, headers, BODY.replace(b"done", b"fatal"))
+
+
+def test_timestamp_outside_tolerance_is_rejected():
+    sent_at = int(time.time()) - 301
+    with pytest.raises(WebhookVerificationError, match="tolerance"):
+        verify_webhook(SECRET, sign(BODY, sent_at), BODY, tolerance_seconds=300)
+
+
+def test_missing_headers_are_rejected():
+    with pytest.raises(WebhookVerificationError, match="Missing"):
+        verify_webhook(SECRET, {}, BODY)
+
+
+def test_invalid_base64_secret_is_a_verification_error():
+    headers = sign(BODY, int(time.time()))
+    with pytest.raises(WebhookVerificationError, match="base64"):
+        verify_webhook("whsec_not*base64!", headers, BODY)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import app.api.webhooks as webhooks
+
+    monkeypatch.setattr(webhooks.settings, "recall_webhook_secret", SECRET)
+    monkeypatch.setattr(webhooks.settings, "recall_realtime_url", "https://lemur.test/webhooks/recall/transcript")
+    monkeypatch.setattr(webhooks.settings, "recall_realtime_token", "realtime-token")
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"42", b"null"])
+def test_json_that_is_not_an_object_is_a_bad_request(client, body):
+    response = client.post("/webhooks/recall", content=body, headers=sign(body, int(time.time())))
+    assert response.status_code == 400
+
+    response = client.post("/webhooks/recall/transcript", params={"token": "realtime-token"}, content=body)
+    assert response.status_code == 400
@@ -0,0 +1,46 @@
+"""
+Tests for joining an upstream trace from a W3C traceparent header
+"""
+
+from app.core.tracing import InMemorySpanExporter, SlowTraceCollector, tracer
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+UPSTREAM_SPAN_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{UPSTREAM_SPAN_ID}-01"
+
+
+def test_root_span_records_the_upstream_parent():
+    exporter = tracer.add_exporter(InMemorySpanExporter())
+    try:
+        with tracer.start_span("GET /meetings", traceparent=TRACEPARENT) as root:
+            with tracer.start_span("meeting_store.list") as child:
+                pass
+    finally:
+        tracer.remove_exporter(exporter)
+
+    assert (root.trace_id, root.parent_id, root.remote_parent) == (TRACE_ID, UPSTREAM_SPAN_ID, True)
+    assert root.is_local_root
+    assert (child.trace_id, child.parent_id, child.remote_parent) == (TRACE_ID, root.span_id, False)
+    assert not child.is_local_root
+
+
+def test_invalid_traceparent_starts_a_new_trace():
+    with tracer.start_span("GET /meetings", traceparent="00-not-a-trace-01") as root:
+        pass
+    assert root.parent_id is None
+    assert root.trace_id != TRACE_ID
+
+
+def test_slow_trace_is_kept_under_an_upstream_parent():
+    collector = tracer.add_exporter(SlowTraceCollector(threshold_ms=0))
+    try:
+        with tracer.start_span("GET /meetings", traceparent=TRACEPARENT):
+            with tracer.start_span("meeting_store.list"):
+                pass
+    finally:
+        tracer.remove_exporter(collector)
+
+    [trace] = collector.get_slow_traces()
+    assert trace["trace_id"] == TRACE_ID
+    assert trace["root"] == "GET /meetings"
+    assert [span["name"] for span in trace["spans"]] == ["GET /meetings", "meeting_store.list"]
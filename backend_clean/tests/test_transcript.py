@@ -0,0 +1,80 @@
+"""
+Tests for the streaming transcript parser: fed at any chunk boundaries it
+must give the same turns as parse_transcript on the whole download
+"""
+
+import json
+import random
+
+import pytest
+
+from app.core.transcript import TranscriptStreamParser, parse_transcript
+
+ENTRIES = [
+    {
+        "participant": {"id": i % 3, "name": f"Speaker {'ABC'[i % 3]}"},
+        "words": [
+            {"text": word, "start_timestamp": {"relative": i * 5.0 + j}, "end_timestamp": {"relative": i * 5.0 + j + 0.4}}
+            for j, word in enumerate(["héllo,", '"quoted"', "] bracket", "{brace}", "done"])
+        ]
+    }
+    for i in range(25)
+]
+ENTRIES.insert(3, {"participant": {"id": 9, "name": "Silent"}, "words": []})  # no text: skipped
+
+DOWNLOADS = {
+    "json_list": json.dumps(ENTRIES),
+    "indented_list": "\n  [\n  " + json.dumps(ENTRIES, indent=2)[1:],
+    "wrapped_object": json.dumps({"transcript": ENTRIES}),
+    "empty_list": " [ ] ",
+    "timestamped_plain_text": "[00:01] Alice: hello there\n[00:05] Bob: hi Alice\n[01:10] Alice: let's start\n",
+    "plain_text": "Alice: hello there\nBob: hi Alice\n",
+    "list_of_non_json": "[{not json, just text that goes on for quite a while " + "x" * 100 + "}]\nAlice: hi\n",
+}
+
+
+def parse_streamed(text: str, boundaries) -> list:
+    parser = TranscriptStreamParser()
+    segments, position = [], 0
+    for boundary in boundaries:
+        segments += parser.feed(text[position:boundary])
+        position = boundary
+    segments += parser.feed(text[position:])
+    return segments + parser.close()
+
+
+@pytest.mark.parametrize("name", DOWNLOADS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_fixed_chunks_match_parse_transcript(name, chunk_size):
+    text = DOWNLOADS[name]
+    boundaries = range(chunk_size, len(text), chunk_size)
+    assert parse_streamed(text, boundaries) == parse_transcript(text)
+
+
+@pytest.mark.parametrize("name", DOWNLOADS)
+def test_random_chunks_match_parse_transcript(name):
+    text = DOWNLOADS[name]
+    rng = random.Random(name)
+    for _ in range(20):
+        boundaries = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(1, 40))))
+        assert parse_streamed(text, boundaries) == parse_transcript(text)
+
+
+def test_turns_are_returned_as_they_complete():
+    text = json.dumps(ENTRIES[:2])
+    first_entry_end = len(json.dumps(ENTRIES[:1])) - 1
+    parser = TranscriptStreamParser()
+    assert len(parser.feed(text[:first_entry_end])) == 1
+    assert len(parser.feed(text[first_entry_end:])) == 1
+    assert parser.close() == []
+
+
+def test_timestamped_plain_text_is_not_taken_for_json():
+    segments = parse_streamed(DOWNLOADS["timestamped_plain_text"], [1, 2])
+    assert [(s.speaker, s.start) for s in segments] == [("Alice", 1.0), ("Bob", 5.0), ("Alice", 70.0)]
+
+
+def test_truncated_json_list_raises():
+    text = json.dumps(ENTRIES)[:-40]
+    with pytest.raises(ValueError):
+        parse_streamed(text, range(100, len(text), 100))